@@ -0,0 +1,97 @@
+"""benchmark CPU time against bytes saved of compressing pages of posts
+
+$ python -m benchmarks.compression
+"""
+import gzip
+import os
+import time
+from typing import Callable
+
+os.environ.setdefault("DB__SQLALCHEMY_URL", "sqlite:///:memory:")
+os.environ.setdefault("DB__ECHO", "False")
+os.environ.setdefault("AUTH__JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("AUTH__JWT_ALGORITHM", "HS256")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+from src.api import compression
+from src.api.common import Link, Pagination
+from src.api.v1.posts.read_posts import ReadPostsResponse
+
+NUM_OF_REPEATS = 200
+BASE_URL = "http://localhost:8000/"
+
+
+def _get_body(num_of_posts: int) -> bytes:
+    """a page of posts as rendered by `read_posts`"""
+    response = ReadPostsResponse(
+        pagination=Pagination(offset=0, limit=num_of_posts, total=1000),
+        data=[
+            ReadPostsResponse.Data(
+                id=i,
+                title=f"테스트 제목 {i}",
+                content=f"테스트 내용 {i} " * 40,
+                created_at=1650000000 + i,
+                updated_at=1650000000 + i,
+                user=ReadPostsResponse.Data.User(
+                    id=f"user{i % 7}", name=f"user{i % 7}"
+                ),
+                num_of=ReadPostsResponse.Data.NumOf(
+                    likes=i % 13, dislikes=i % 3, comments=i % 5
+                ),
+                links=[
+                    Link(rel="self", href=f"{BASE_URL}v1/posts/{i}"),
+                    Link(rel="comments", href=f"{BASE_URL}v1/comments?post_id={i}"),
+                    Link(
+                        rel="feedbacks",
+                        href=f"{BASE_URL}v1/feedbacks/posts?post_id={i}",
+                    ),
+                ],
+            )
+            for i in range(num_of_posts)
+        ],
+        links=[Link(rel="self", href=f"{BASE_URL}v1/posts")],
+    )
+    return ORJSONResponse(jsonable_encoder(response, by_alias=True)).body
+
+
+def _run(name: str, body: bytes, compress: Callable[[bytes], bytes]) -> None:
+    started_at = time.process_time()
+    for _ in range(NUM_OF_REPEATS):
+        compressed = compress(body)
+    elapsed = time.process_time() - started_at
+    print(
+        f"{name:<24}{len(body):>10}{len(compressed):>10}"
+        f"{1 - len(compressed) / len(body):>10.1%}"
+        f"{elapsed / NUM_OF_REPEATS * 1e6:>12.0f}"
+    )
+
+
+def main() -> None:
+    print(f"{'':<24}{'bytes':>10}{'encoded':>10}{'saved':>10}{'cpu us':>12}")
+    for num_of_posts in (10, 100):
+        body = _get_body(num_of_posts)
+        for level in (1, 6, 9):
+            _run(
+                f"{num_of_posts} posts gzip {level}",
+                body,
+                lambda body: gzip.compress(body, compresslevel=level, mtime=0),
+            )
+        for quality in (1, 4, 11):
+            _run(
+                f"{num_of_posts} posts br {quality}",
+                body,
+                lambda body: compression.brotli.compress(body, quality=quality),
+            )
+        cache = compression.CompressedBodyCache(maxsize=1)
+        cache.compress(body, "gzip")
+        _run(
+            f"{num_of_posts} posts cached",
+            body,
+            lambda body: cache.compress(body, "gzip"),
+        )
+
+
+if __name__ == "__main__":
+    main()
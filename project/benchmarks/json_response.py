@@ -0,0 +1,78 @@
+"""benchmark rendering a page of 100 posts by the stdlib json and by orjson
+
+$ python -m benchmarks.json_response
+"""
+import os
+import time
+from typing import Type
+
+os.environ.setdefault("DB__SQLALCHEMY_URL", "sqlite:///:memory:")
+os.environ.setdefault("DB__ECHO", "False")
+os.environ.setdefault("AUTH__JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("AUTH__JWT_ALGORITHM", "HS256")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.api.common import Link, Pagination
+from src.api.v1.posts.read_posts import ReadPostsResponse
+
+NUM_OF_POSTS = 100
+NUM_OF_RESPONSES = 1000
+BASE_URL = "http://localhost:8000/"
+
+
+def _get_response() -> ReadPostsResponse:
+    """a page of posts as built by `read_posts`"""
+    return ReadPostsResponse(
+        pagination=Pagination(offset=0, limit=NUM_OF_POSTS, total=NUM_OF_POSTS),
+        data=[
+            ReadPostsResponse.Data(
+                id=i,
+                title=f"테스트 제목 {i}",
+                content="테스트 내용" * 20,
+                created_at=1650000000,
+                updated_at=1650000000,
+                user=ReadPostsResponse.Data.User(id="heumsi", name="heumsi"),
+                num_of=ReadPostsResponse.Data.NumOf(likes=i, dislikes=0, comments=i),
+                links=[
+                    Link(rel="self", href=f"{BASE_URL}v1/posts/{i}"),
+                    Link(rel="comments", href=f"{BASE_URL}v1/comments?post_id={i}"),
+                    Link(
+                        rel="feedbacks",
+                        href=f"{BASE_URL}v1/feedbacks/posts?post_id={i}",
+                    ),
+                ],
+            )
+            for i in range(NUM_OF_POSTS)
+        ],
+        links=[Link(rel="self", href=f"{BASE_URL}v1/posts")],
+    )
+
+
+def _run(response_class: Type[JSONResponse]) -> bytes:
+    # FastAPI encodes the response model by its camelCase aliases,
+    # then renders it by the response class
+    content = jsonable_encoder(_get_response(), by_alias=True)
+    num_of_bytes = 0
+    started_at = time.process_time()
+    for _ in range(NUM_OF_RESPONSES):
+        body = response_class(content).body
+        num_of_bytes += len(body)
+    elapsed = time.process_time() - started_at
+    print(
+        f"{response_class.__name__:<20}"
+        f"{elapsed / NUM_OF_RESPONSES * 1e6:>12.0f}"
+        f"{num_of_bytes / elapsed / 1e6:>12.1f}"
+    )
+    return body
+
+
+def main() -> None:
+    print(f"{'':<20}{'cpu us/res':>12}{'MB/s':>12}")
+    body = _run(JSONResponse)
+    assert _run(ORJSONResponse) == body
+
+
+if __name__ == "__main__":
+    main()
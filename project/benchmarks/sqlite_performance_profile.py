@@ -0,0 +1,111 @@
+"""benchmark read/write throughput of file sqlite with and without the performance profile
+
+$ python -m benchmarks.sqlite_performance_profile
+"""
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+os.environ.setdefault("DB__SQLALCHEMY_URL", "sqlite:///:memory:")
+os.environ.setdefault("DB__ECHO", "False")
+os.environ.setdefault("AUTH__JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("AUTH__JWT_ALGORITHM", "HS256")
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from src import config, migrations
+from src.api import app  # noqa: F401 for registering all models
+from src.database import create_engine_from_config
+from src.models.post import Post
+from src.models.user import User
+
+NUM_OF_WRITES = 2000
+NUM_OF_READS_PER_THREAD = 2000
+NUM_OF_READER_THREADS = 8
+MIXED_SECONDS = 3.0
+
+
+def _write(engine: Engine, num_of_writes: int) -> None:
+    for i in range(num_of_writes):
+        with Session(engine) as session:
+            session.add(Post(title=f"title {i}", content="content", user_id="user"))
+            session.commit()
+
+
+def _read(engine: Engine, num_of_reads: int, max_id: int) -> int:
+    with Session(engine) as session:
+        for i in range(num_of_reads):
+            session.get(Post, i % max_id + 1)
+            session.expunge_all()
+    return num_of_reads
+
+
+def _run(profile: bool) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine_from_config(
+            config.DB(
+                url=f"sqlite:///{directory}/benchmark.db",
+                echo=False,
+                sqlite_performance_profile=profile,
+                pool_size=NUM_OF_READER_THREADS + 1,
+            )
+        )
+        migrations.upgrade(engine)
+        with Session(engine) as session:
+            session.add(User(id="user", name="user", password="password"))
+            session.commit()
+
+        started_at = time.perf_counter()
+        _write(engine, NUM_OF_WRITES)
+        writes_per_second = NUM_OF_WRITES / (time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(NUM_OF_READER_THREADS) as executor:
+            for _ in range(NUM_OF_READER_THREADS):
+                executor.submit(_read, engine, NUM_OF_READS_PER_THREAD, NUM_OF_WRITES)
+        reads_per_second = (NUM_OF_READER_THREADS * NUM_OF_READS_PER_THREAD) / (
+            time.perf_counter() - started_at
+        )
+
+        # readers and a writer at once, where rollback journal blocks readers
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0}
+
+        def read_until_stopped() -> None:
+            while not stop.is_set():
+                counts["reads"] += _read(engine, 100, NUM_OF_WRITES)
+
+        def write_until_stopped() -> None:
+            while not stop.is_set():
+                _write(engine, 10)
+                counts["writes"] += 10
+
+        with ThreadPoolExecutor(NUM_OF_READER_THREADS + 1) as executor:
+            executor.submit(write_until_stopped)
+            for _ in range(NUM_OF_READER_THREADS):
+                executor.submit(read_until_stopped)
+            time.sleep(MIXED_SECONDS)
+            stop.set()
+        engine.dispose()
+    return {
+        "writes/s": writes_per_second,
+        "reads/s": reads_per_second,
+        "mixed reads/s": counts["reads"] / MIXED_SECONDS,
+        "mixed writes/s": counts["writes"] / MIXED_SECONDS,
+    }
+
+
+def main() -> None:
+    results = {"without profile": _run(False), "with profile": _run(True)}
+    metrics = list(results["without profile"].keys())
+    print(f"{'':<16}" + "".join(f"{metric:>16}" for metric in metrics))
+    for name, result in results.items():
+        print(f"{name:<16}" + "".join(f"{result[metric]:>16.0f}" for metric in metrics))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""benchmark CPU time of the list queries with rebuilt and prebuilt statements
+
+$ python -m benchmarks.statement_cache
+"""
+import os
+import time
+import warnings
+from typing import Callable, List
+
+os.environ.setdefault("DB__SQLALCHEMY_URL", "sqlite:///:memory:")
+os.environ.setdefault("DB__ECHO", "False")
+os.environ.setdefault("AUTH__JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("AUTH__JWT_ALGORITHM", "HS256")
+
+import sqlalchemy
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, func, select
+
+from src import config, migrations, statements
+from src.api import app  # noqa: F401 for registering all models
+from src.database import StatementCacheStatistics, create_engine_from_config
+from src.models.comment import Comment
+from src.models.feedbacks.post_feedback import PostFeedback
+from src.models.post import Post
+from src.models.user import User
+
+NUM_OF_POSTS = 100
+NUM_OF_REQUESTS = 2000
+LIMIT = 10
+
+
+def _read_posts_with_rebuilt_statements(session: Session, offset: int) -> List[Post]:
+    """the list query as built on every request before the statement library"""
+    session.exec(select([func.count(Post.id)])).one()
+    statement = (
+        select(Post)
+        .order_by(Post.id)
+        .offset(offset)
+        .limit(LIMIT)
+        .options(
+            selectinload(Post.user),
+            selectinload(Post.comments),
+            selectinload(Post.feedbacks),
+        )
+    )
+    return session.exec(statement).all()
+
+
+# the same queries prebuilt as in `src.statements`
+count_posts = sqlalchemy.select(func.count(Post.id))
+select_posts = statements.PaginatedStatements(
+    sqlalchemy.select(Post).options(
+        selectinload(Post.user),
+        selectinload(Post.comments),
+        selectinload(Post.feedbacks),
+    ),
+    Post.id,
+)
+
+
+def _read_posts_with_prebuilt_statements(session: Session, offset: int) -> List[Post]:
+    session.scalar(count_posts)
+    return session.scalars(
+        select_posts.by_offset, {"offset": offset, "limit": LIMIT}
+    ).all()
+
+
+def _run(read_posts: Callable[[Session, int], List[Post]]) -> None:
+    engine = create_engine_from_config(config.DB(url="sqlite:///:memory:", echo=False))
+    migrations.upgrade(engine)
+    statistics = StatementCacheStatistics(engine)
+    with Session(engine) as session:
+        session.add(User(id="user", name="user", password="password"))
+        for i in range(NUM_OF_POSTS):
+            post = Post(title=f"title {i}", content="content", user_id="user")
+            post.comments = [Comment(content="content", user_id="user")]
+            post.feedbacks = [PostFeedback(like=True, user_id="user")]
+            session.add(post)
+        session.commit()
+
+    with Session(engine) as session:
+        started_at = time.process_time()
+        for i in range(NUM_OF_REQUESTS):
+            read_posts(session, i * LIMIT % NUM_OF_POSTS)
+            session.expunge_all()
+        elapsed = time.process_time() - started_at
+    engine.dispose()
+    cache = statistics.to_dict()
+    print(
+        f"{read_posts.__name__:<40}"
+        f"{elapsed / NUM_OF_REQUESTS * 1e6:>12.0f}"
+        f"{cache['hits']:>10}{cache['misses']:>10}{cache['uncached']:>10}"
+    )
+
+
+def main() -> None:
+    # sqlmodel warns that its select does not support the compiled cache
+    warnings.simplefilter("ignore")
+    print(f"{'':<40}{'cpu us/req':>12}{'hits':>10}{'misses':>10}{'uncached':>10}")
+    _run(_read_posts_with_rebuilt_statements)
+    _run(_read_posts_with_prebuilt_statements)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""benchmark decoding a bearer token per request, with and without the token cache
+
+$ python -m benchmarks.token_cache
+"""
+import os
+import time
+
+os.environ.setdefault("DB__SQLALCHEMY_URL", "sqlite:///:memory:")
+os.environ.setdefault("DB__ECHO", "False")
+os.environ.setdefault("AUTH__JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("AUTH__JWT_ALGORITHM", "HS256")
+
+from jose import jwt
+
+from src import config
+from src.api.v1.auth.utils import TokenPayload, decode_token, token_cache
+from src.models.user import User
+
+NUM_OF_REQUESTS = 10000
+
+
+def _get_token() -> str:
+    """a token as signed by `signin`"""
+    token_payload = TokenPayload(
+        user=User(id="heumsi", name="heumsi", password="$2b$12$" + "x" * 53)
+    )
+    return jwt.encode(
+        token_payload.dict(),
+        key=config.auth.jwt_secret_key,
+        algorithm=config.auth.jwt_algorithm,
+    )
+
+
+def _run(name: str, token: str, cached: bool) -> float:
+    token_cache.clear()
+    started_at = time.process_time()
+    for _ in range(NUM_OF_REQUESTS):
+        if not cached:
+            token_cache.clear()
+        decode_token(token)
+    elapsed = time.process_time() - started_at
+    print(f"{name:<20}{elapsed / NUM_OF_REQUESTS * 1e6:>12.1f}")
+    return elapsed
+
+
+def main() -> None:
+    token = _get_token()
+    print(f"{'':<20}{'cpu us/req':>12}")
+    uncached = _run("decode", token, cached=False)
+    cached = _run("cached", token, cached=True)
+    print(f"{'saving':<20}{(uncached - cached) / NUM_OF_REQUESTS * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
 from fastapi import FastAPI
 
-from src.api import v1
-from src.database import create_db_and_tables
+from src import engagement_counts  # noqa: F401 for its flush event
+from src import row_versions  # noqa: F401 for its flush event
+from src import config, migrations
+from src.api import middlewares, v1
+from src.database import engine
 
 app = FastAPI()
+app.middleware("http")(middlewares.route_sessions_to_primary_after_write)
+app.middleware("http")(middlewares.instrument_queries)
+app.middleware("http")(middlewares.compress_responses)
 app.mount("/v1", v1.app)
 
 
 @app.on_event("startup")
 def handle_startup_event():
-    create_db_and_tables()
+    if config.db.auto_migrate:
+        migrations.upgrade(engine)
+    else:
+        migrations.check_schema_version(engine)
@@ -1,8 +1,28 @@
-from typing import List
+import base64
+import functools
+import hashlib
+import json
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlencode
 
-from fastapi import Request
+from fastapi import HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from humps import camelize
 from pydantic import BaseModel
+from starlette.datastructures import URL
+
+from src import config
 
 
 def to_camel(string):
@@ -15,11 +35,144 @@ class SchemaModel(BaseModel):
         allow_population_by_field_name = True
 
 
+SchemaModelT = TypeVar("SchemaModelT", bound=SchemaModel)
+
+
+class TrustedResponse(ORJSONResponse):
+    """response of a model built by `construct` from trusted values, e.g. rows
+
+    It is rendered as is by the camelCase aliases, without the validation
+    against `response_model` by FastAPI.
+    Only the fields given on construction are rendered.
+    """
+
+    def render(self, content: SchemaModel) -> bytes:
+        return super().render(content.dict(by_alias=True, exclude_unset=True))
+
+
+def respond(
+    response: SchemaModel,
+    fields: Optional[FrozenSet[str]] = None,
+    etag: Optional[str] = None,
+) -> Response:
+    """render `response` of a handler, with its `etag` if any
+
+    It is rendered as is in the trusted output mode. Otherwise it is validated
+    first as FastAPI would against `response_model`, unless it has sparse `fields`
+    which lack the others required by the model.
+    """
+    if not config.api.trusted_output and fields is None:
+        response = response.validate(response.dict(by_alias=True, exclude_unset=True))
+    return TrustedResponse(response, headers={"ETag": etag} if etag else None)
+
+
+def get_etag(*parts: Any) -> str:
+    """get a strong ETag of a representation by its url and the versions it renders"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def get_normalized_url(request: Request) -> str:
+    """get the url of `request` with its base url, and its query params in order
+
+    A list renders its links from it too, so the pages of the urls which differ
+    only by the order of their query params are the same, as their ETags are.
+    """
+    query = urlencode(sorted(request.query_params.multi_items()))
+    url = f"{request.base_url}{request.url.path.lstrip('/')}"
+    return f"{url}?{query}" if query else url
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """whether the client already has the representation of `etag` by If-None-Match"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    etags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in etags or etag in etags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+class SparseFields:
+    """`?fields=`, comma separated fields of the items of a response, e.g. `id,title`
+
+    Resolves to the names of the fields, or None for all of them.
+    """
+
+    def __init__(self, model: Type[SchemaModel]) -> None:
+        self.names = {}
+        for name, field in model.__fields__.items():
+            self.names[name] = self.names[field.alias] = name
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(default=None, description="응답할 항목의 필드 (콤마로 구분)"),
+    ) -> Optional[FrozenSet[str]]:
+        if fields is None:
+            return None
+        aliases = [alias.strip() for alias in fields.split(",") if alias.strip()]
+        invalid_aliases = [alias for alias in aliases if alias not in self.names]
+        if invalid_aliases:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid fields: {', '.join(invalid_aliases)}",
+            )
+        return frozenset(self.names[alias] for alias in aliases)
+
+
+def construct_fields(
+    model: Type[SchemaModelT],
+    fields: Optional[FrozenSet[str]],
+    **get_values: Optional[Callable[[], Any]],
+) -> SchemaModelT:
+    """construct `model` of the `fields` only, or all if None
+
+    Each value is got by its getter only if its field is included,
+    so the columns of the other fields are never loaded.
+    Fields of None getters are left out.
+    """
+    return model.construct(
+        **{
+            name: get_value()
+            for name, get_value in get_values.items()
+            if get_value is not None and (fields is None or name in fields)
+        }
+    )
+
+
 class Link(SchemaModel):
     rel: str
     href: str
 
 
+class LinkTemplates:
+    """links of an item, by templates of their hrefs relative to the base url
+
+    The templates are joined with the base url once per host, and the links are
+    emitted as plain dicts of the shape of `Link`, e.g.
+    `LinkTemplates({"self": "v1/posts/{id}"}).get_links(request.base_url, id=1)`.
+    """
+
+    def __init__(self, templates: Dict[str, str]) -> None:
+        self.templates = templates
+
+    @functools.lru_cache(maxsize=16)
+    def _get_templates(self, base_url: str) -> Tuple[Tuple[str, str], ...]:
+        base_url = base_url.replace("{", "{{").replace("}", "}}")
+        return tuple(
+            (rel, f"{base_url}{template}") for rel, template in self.templates.items()
+        )
+
+    def get_links(self, base_url: Any, **params: Any) -> List[Dict[str, str]]:
+        return [
+            {"rel": rel, "href": template.format_map(params)}
+            for rel, template in self._get_templates(str(base_url))
+        ]
+
+
 class Pagination(SchemaModel):
     offset: int
     limit: int
@@ -31,22 +184,132 @@ def get_links_for_pagination(
 ) -> List[Link]:
     next_offset = offset + limit
     prev_offset = offset - limit
-    request_url_without_query_params = str(
-        request.url.remove_query_params(keys=["limit", "offset"])
+    request_url = URL(get_normalized_url(request))
+    request_url_without_pagination = request_url.remove_query_params(
+        keys=["limit", "offset"]
     )
-    links = [Link(rel="self", href=str(request.url))]
+    links = [Link.construct(rel="self", href=str(request_url))]
     if next_offset < total:
         links.append(
-            Link(
+            Link.construct(
                 rel="next",
-                href=f"{request_url_without_query_params}?offset={next_offset}&limit={limit}",
+                href=str(
+                    request_url_without_pagination.include_query_params(
+                        offset=next_offset, limit=limit
+                    )
+                ),
             )
         )
     if offset > 0:
         links.append(
-            Link(
+            Link.construct(
+                rel="prev",
+                href=str(
+                    request_url_without_pagination.include_query_params(
+                        offset=prev_offset, limit=limit
+                    )
+                ),
+            )
+        )
+    return links
+
+
+class CursorPagination(SchemaModel):
+    limit: int
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def encode_cursor(key: Union[int, str]) -> str:
+    """encode the key of a row to an opaque cursor"""
+    encoded = base64.urlsafe_b64encode(json.dumps({"id": key}).encode())
+    return encoded.decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Union[int, str]:
+    """decode an opaque cursor to the key of a row"""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(cursor + padding))["id"]
+    except (ValueError, TypeError, KeyError):
+        key = None
+    if not isinstance(key, (int, str)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return key
+
+
+class CursorParams:
+    """cursor of keyset pagination, which is used instead of offset when given
+
+    `?after=` and `?before=` with an empty cursor start from the first and the last page.
+    """
+
+    def __init__(
+        self,
+        after: Optional[str] = Query(default=None, description="이 커서 다음 페이지"),
+        before: Optional[str] = Query(default=None, description="이 커서 이전 페이지"),
+    ) -> None:
+        if after is not None and before is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only one of after and before is allowed",
+            )
+        self.after = after
+        self.before = before
+        self.after_key = decode_cursor(after) if after else None
+        self.before_key = decode_cursor(before) if before else None
+        self.from_last = before == ""
+
+    @property
+    def is_given(self) -> bool:
+        return self.after is not None or self.before is not None
+
+
+def get_cursor_pagination(
+    cursor_params: CursorParams, keys: List[Any], limit: int, has_more: bool
+) -> CursorPagination:
+    """get pagination of the rows of `keys`, fetched by `cursor_params`"""
+    if cursor_params.before is not None:
+        has_next, has_prev = cursor_params.before_key is not None, has_more
+    else:
+        has_next, has_prev = has_more, cursor_params.after_key is not None
+    return CursorPagination.construct(
+        limit=limit,
+        next_cursor=encode_cursor(keys[-1]) if keys and has_next else None,
+        prev_cursor=encode_cursor(keys[0]) if keys and has_prev else None,
+    )
+
+
+def get_links_for_cursor_pagination(
+    pagination: CursorPagination, request: Request
+) -> List[Link]:
+    request_url = URL(get_normalized_url(request))
+    request_url_without_pagination = request_url.remove_query_params(
+        keys=["offset", "after", "before"]
+    )
+    links = [Link.construct(rel="self", href=str(request_url))]
+    if pagination.next_cursor:
+        links.append(
+            Link.construct(
+                rel="next",
+                href=str(
+                    request_url_without_pagination.include_query_params(
+                        after=pagination.next_cursor, limit=pagination.limit
+                    )
+                ),
+            )
+        )
+    if pagination.prev_cursor:
+        links.append(
+            Link.construct(
                 rel="prev",
-                href=f"{request_url_without_query_params}?offset={prev_offset}&limit={limit}",
+                href=str(
+                    request_url_without_pagination.include_query_params(
+                        before=pagination.prev_cursor, limit=pagination.limit
+                    )
+                ),
             )
         )
     return links
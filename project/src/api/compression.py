@@ -0,0 +1,105 @@
+"""compression of response bodies by brotli or gzip, negotiated by Accept-Encoding
+
+brotli is preferred to gzip when both are accepted.
+Compressed bodies of GET responses are kept in an LRU cache keyed by their ETag,
+or by a digest of the body without one, so a payload is compressed once.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import brotli
+
+from src import config
+
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "text/")
+
+
+def get_encodings() -> List[str]:
+    """get the supported encodings, in order of preference"""
+    return ["br", "gzip"]
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """get the preferred encoding of `accept_encoding`, e.g. `gzip;q=0.8, br`"""
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        encoding, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[encoding.strip().lower()] = quality
+    candidates = [
+        (qualities.get(encoding, qualities.get("*", 0.0)), -preference, encoding)
+        for preference, encoding in enumerate(get_encodings())
+    ]
+    quality, _, encoding = max(candidates)
+    return encoding if quality > 0 else None
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+
+def weaken_etag(etag: str) -> str:
+    """get the weak ETag of a compressed body from the ETag of its identity body"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=config.compression.brotli_quality)
+    # without mtime, the same body is always compressed to the same bytes
+    return gzip.compress(body, compresslevel=config.compression.gzip_level, mtime=0)
+
+
+class CompressedBodyCache:
+    """LRU cache of compressed bodies, keyed by their ETags and encodings"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._bodies: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compress(self, body: bytes, encoding: str, etag: Optional[str] = None) -> bytes:
+        """get `body` compressed by `encoding`, from the cache if it was already"""
+        if etag is None:
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        key = (etag, encoding)
+        with self._lock:
+            compressed = self._bodies.get(key)
+            if compressed is not None:
+                self._bodies.move_to_end(key)
+                self.hits += 1
+                return compressed
+            self.misses += 1
+        compressed = compress(body, encoding)
+        with self._lock:
+            self._bodies[key] = compressed
+            while len(self._bodies) > self.maxsize:
+                self._bodies.popitem(last=False)
+        return compressed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._bodies),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+compressed_body_cache = CompressedBodyCache(config.compression.cache_size)
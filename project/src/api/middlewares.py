@@ -0,0 +1,127 @@
+import logging
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from src import config
+from src.api import compression
+from src.database import RoutingState, has_replicas, set_routing_state
+from src.instrumentation import (
+    QueryBudgetExceeded,
+    QueryStatistics,
+    set_query_statistics,
+)
+
+logger = logging.getLogger(__name__)
+
+PIN_TO_PRIMARY_COOKIE = "pin_to_primary"
+
+
+async def route_sessions_to_primary_after_write(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """read own writes by reading from the primary right after writing
+
+    Sessions of a request are pinned to the primary once it writes,
+    and the following requests of the client are pinned for
+    `config.db.replica_pin_seconds` so replication lag doesn't hide its writes.
+    Without replicas there is no lag, so they are not pinned.
+    """
+    state = RoutingState(pinned=PIN_TO_PRIMARY_COOKIE in request.cookies)
+    set_routing_state(state)
+    response = await call_next(request)
+    if state.has_written and has_replicas() and config.db.replica_pin_seconds > 0:
+        response.set_cookie(
+            PIN_TO_PRIMARY_COOKIE, "1", max_age=config.db.replica_pin_seconds
+        )
+    return response
+
+
+async def instrument_queries(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """report the statements executed by a request in its headers and logs
+
+    Statements repeated with the same shape are flagged as N+1 query patterns.
+    A request over the `QueryBudget` of its endpoint is logged, or raises
+    `QueryBudgetExceeded` when `config.instrumentation.strict_query_budget` is set.
+    """
+    statistics = QueryStatistics()
+    set_query_statistics(statistics)
+    response = await call_next(request)
+    n_plus_one = statistics.get_n_plus_one()
+    response.headers["X-Query-Count"] = str(statistics.count)
+    response.headers["X-Query-Rows"] = str(statistics.rows)
+    response.headers["X-Query-N-Plus-One"] = str(len(n_plus_one))
+    response.headers["Server-Timing"] = f"db;dur={statistics.duration * 1000:.3f}"
+    logger.info(
+        "%s %s executed %d statements in %.3fms with %d rows",
+        request.method,
+        request.url.path,
+        statistics.count,
+        statistics.duration * 1000,
+        statistics.rows,
+    )
+    for statement, count in n_plus_one.items():
+        logger.warning(
+            "%s %s executed a statement %d times, which looks like N+1 queries: %s",
+            request.method,
+            request.url.path,
+            count,
+            statement,
+        )
+    if statistics.is_over_budget():
+        message = (
+            f"{request.method} {request.url.path} executed {statistics.count} "
+            f"statements over its budget of {statistics.budget}"
+        )
+        if config.instrumentation.strict_query_budget:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+    return response
+
+
+async def compress_responses(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """compress response bodies by brotli or gzip as negotiated by Accept-Encoding
+
+    Bodies under `config.compression.minimum_size` are sent as is.
+    Compressed bodies of successful GET responses are cached by their ETags,
+    see `compression.CompressedBodyCache`. Their ETags are weakened, since a strong
+    ETag tells the same bytes, and those of the identity body differ.
+    Compressible responses vary by Accept-Encoding, even when sent as is.
+    """
+    response = await call_next(request)
+    if (
+        "content-encoding" in response.headers
+        or not compression.is_compressible(response.headers.get("content-type", ""))
+        or not isinstance(response, StreamingResponse)
+    ):
+        return response
+    encoding = compression.negotiate(request.headers.get("accept-encoding", ""))
+    if encoding is None:
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    if len(body) < config.compression.minimum_size:
+        uncompressed_response = Response(body, status_code=response.status_code)
+        uncompressed_response.raw_headers = response.raw_headers
+        uncompressed_response.headers.add_vary_header("Accept-Encoding")
+        return uncompressed_response
+    if request.method == "GET" and response.status_code == 200:
+        compressed_body = compression.compressed_body_cache.compress(
+            body, encoding, response.headers.get("etag")
+        )
+    else:
+        compressed_body = compression.compress(body, encoding)
+    compressed_response = Response(compressed_body, status_code=response.status_code)
+    compressed_response.raw_headers = response.raw_headers
+    compressed_response.headers["Content-Encoding"] = encoding
+    etag = response.headers.get("etag")
+    if etag is not None:
+        compressed_response.headers["ETag"] = compression.weaken_etag(etag)
+    compressed_response.headers["Content-Length"] = str(len(compressed_body))
+    compressed_response.headers.add_vary_header("Accept-Encoding")
+    return compressed_response
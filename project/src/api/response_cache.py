@@ -0,0 +1,401 @@
+"""read-through caches of rendered responses of single posts and comments, and of lists
+
+Rendered bodies are kept with their ETags in the cache backend, up to
+`RESPONSE_CACHE__MAXSIZE` rows per cache, keyed by the id of the row and the
+normalized url of the request. Only the requests with the query params which a
+cache varies by are cached, and at most `MAX_URLS_PER_ROW` urls of a row, so
+arbitrary query strings do not grow its entry. They expire after `RESPONSE_CACHE__TTL_SECONDS`, which bounds
+staleness from writes of other processes on the in-memory backend, and are
+invalidated after the commit of the rows queued by the flush events of the session:
+
+- a write to a post invalidates it, and a write to its comments or feedbacks too,
+  since they change its counts
+- a write to a comment invalidates it, and a write to its feedbacks too
+- a change of the name of a user clears the caches, since it is in all of them
+
+The backend I/O of the invalidations runs off the event loop,
+see `run_off_event_loop`, before the response of the write.
+
+They are bypassed by requests pinned to the primary, which read their own writes,
+see `is_cacheable`. Rows read from a replica, which may lag behind the primary,
+are not cached for `DB__REPLICA_PIN_SECONDS` after an invalidation of them.
+
+Pages of the lists are cached by their ETags, which change with the versions of
+their collections instead, see `ListResponseCache`.
+"""
+import functools
+import threading
+import time
+from typing import AbstractSet, Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import orjson
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import attributes
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from src import config
+from src.api.common import get_normalized_url, is_not_modified, not_modified
+from src.cache_backends import CacheBackend, cache_backend
+from src.database import (
+    AnySession,
+    is_pinned_to_primary,
+    run_in_session,
+    run_off_event_loop,
+)
+from src.models import comment, post, user
+from src.models.feedbacks import comment_feedback, post_feedback
+
+MAX_URLS_PER_ROW = 8
+
+
+class ResponseCache:
+    """cache of rendered bodies and their ETags in a namespace of a cache backend
+
+    The bodies of all the urls of a row are kept in one entry of its id,
+    so that they are invalidated at once. The least recently set urls beyond
+    `MAX_URLS_PER_ROW` are dropped from it.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        backend: CacheBackend,
+        maxsize: int,
+        ttl_seconds: float,
+        query_params: AbstractSet[str] = frozenset(),
+        replica_lag_seconds: float = 0,
+    ) -> None:
+        self.namespace = namespace
+        self.backend = backend
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        # query params which the rendered bodies vary by
+        self.query_params = query_params
+        self.replica_lag_seconds = replica_lag_seconds
+        self._lock = threading.Lock()
+        # bumped by invalidations, to tell the bodies rendered before them
+        self.generation = 0
+        # times of the invalidations within the replica lag, by id and of all ids
+        self._invalidated_at: Dict[str, float] = {}
+        self._cleared_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_url(self, request: Request) -> Optional[str]:
+        """get the url which caches `request`, unless it has other query params"""
+        if not request.query_params.keys() <= self.query_params:
+            return None
+        return get_normalized_url(request)
+
+    def get(self, id_: Any, url: str) -> Optional[Tuple[bytes, str]]:
+        """get the body and the ETag of `url` of the row of `id_`, if cached"""
+        value = self.backend.get(self.namespace, str(id_))
+        entry = orjson.loads(value).get(url) if value is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, body = entry
+        return body.encode(), etag
+
+    def set(
+        self,
+        id_: Any,
+        url: str,
+        body: bytes,
+        etag: str,
+        generation: int,
+        from_replica: bool = False,
+    ) -> None:
+        """cache the body of `url` rendered in `generation`, unless invalidated since
+
+        A body rendered from a replica is not cached either within the replica lag
+        after an invalidation of the row, since the replica may not have its write.
+        Only the invalidations of this process are told, and those of the others
+        are bounded by the TTL.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            if from_replica and self._is_invalidated_within_replica_lag(id_):
+                return
+            value = self.backend.get(self.namespace, str(id_))
+            entries = orjson.loads(value) if value is not None else {}
+            entries.pop(url, None)
+            entries[url] = [etag, body.decode()]
+            for dropped_url in list(entries)[:-MAX_URLS_PER_ROW]:
+                del entries[dropped_url]
+            self.backend.set(
+                self.namespace,
+                str(id_),
+                orjson.dumps(entries),
+                self.ttl_seconds,
+                self.maxsize,
+            )
+
+    def _is_invalidated_within_replica_lag(self, id_: Any) -> bool:
+        since = time.monotonic() - self.replica_lag_seconds
+        invalidated_at = self._invalidated_at.get(str(id_), float("-inf"))
+        return max(invalidated_at, self._cleared_at) > since
+
+    def invalidate(self, ids: List[Any]) -> None:
+        """drop the bodies of all the urls of the rows of `ids`"""
+        with self._lock:
+            self.generation += 1
+            if self.replica_lag_seconds > 0:
+                now = time.monotonic()
+                self._invalidated_at = {
+                    key: invalidated_at
+                    for key, invalidated_at in self._invalidated_at.items()
+                    if invalidated_at > now - self.replica_lag_seconds
+                }
+                self._invalidated_at.update((str(id_), now) for id_ in ids)
+            if ids:
+                self.backend.delete(self.namespace, [str(id_) for id_ in ids])
+                self.invalidations += len(ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._invalidated_at.clear()
+            self._cleared_at = time.monotonic()
+            self.backend.clear(self.namespace)
+
+    def reset(self) -> None:
+        """clear the cache and its statistics"""
+        self.clear()
+        self.hits = self.misses = self.invalidations = 0
+        self.backend.evictions[self.namespace] = 0
+        self.backend.expirations[self.namespace] = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "size": self.backend.get_size(self.namespace),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.backend.evictions[self.namespace],
+            "expirations": self.backend.expirations[self.namespace],
+            "invalidations": self.invalidations,
+        }
+
+
+class ListResponseCache:
+    """cache of rendered list pages by their ETags in a namespace of a cache backend
+
+    An ETag of a page is a digest of its normalized url, with its base url,
+    and of the versions of the collections it renders, which are read in the
+    same transaction as its rows. A write bumps the versions, so the pages
+    rendered before it are no longer reached, without enumerating them,
+    and are evicted by `maxsize` or the TTL.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        backend: CacheBackend,
+        maxsize: int,
+        ttl_seconds: float,
+    ) -> None:
+        self.namespace = namespace
+        self.backend = backend
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag: str) -> Optional[bytes]:
+        body = self.backend.get(self.namespace, etag)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def set(self, etag: str, body: bytes) -> None:
+        self.backend.set(self.namespace, etag, body, self.ttl_seconds, self.maxsize)
+
+    def clear(self) -> None:
+        self.backend.clear(self.namespace)
+
+    def reset(self) -> None:
+        """clear the cache and its statistics"""
+        self.clear()
+        self.hits = self.misses = 0
+        self.backend.evictions[self.namespace] = 0
+        self.backend.expirations[self.namespace] = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "size": self.backend.get_size(self.namespace),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.backend.evictions[self.namespace],
+            "expirations": self.backend.expirations[self.namespace],
+            "invalidations": 0,
+        }
+
+
+def is_cacheable() -> bool:
+    """whether the responses of the current request may be got from and cached
+
+    A pinned request must not get a body cached before its write, e.g. by another
+    process from a replica.
+    """
+    return not is_pinned_to_primary()
+
+
+def get_response(
+    cache: ResponseCache, id_: Any, request: Request
+) -> Optional[Response]:
+    """get the cached response of `request` for the row of `id_`, if enabled
+
+    It blocks on the I/O of a shared backend, so it is run on the threadpool.
+
+    It is `304 Not Modified` if its ETag matches `If-None-Match`.
+    """
+    url = cache.get_url(request)
+    if not config.response_cache.enabled or url is None:
+        return None
+    cached = cache.get(id_, url)
+    if cached is None:
+        return None
+    body, etag = cached
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def set_response(
+    cache: ResponseCache,
+    id_: Any,
+    request: Request,
+    response: Response,
+    generation: int,
+    from_replica: bool = False,
+) -> None:
+    """cache a successful `response` of `request` for the row of `id_`, if enabled
+
+    It is not cached if the cache was invalidated since `generation`,
+    when the rows were read, since they may be stale, nor if it was read
+    `from_replica` right after the row was invalidated.
+    """
+    url = cache.get_url(request)
+    etag = response.headers.get("etag")
+    if config.response_cache.enabled and response.status_code == 200 and etag and url:
+        cache.set(id_, url, response.body, etag, generation, from_replica)
+
+
+def get_list_response(etag: str) -> Optional[Response]:
+    """get the cached page of `etag`, if enabled"""
+    if not config.response_cache.enabled:
+        return None
+    body = list_cache.get(etag)
+    if body is None:
+        return None
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def set_list_response(response: Response) -> None:
+    """cache a successful page `response` by its ETag, if enabled"""
+    etag = response.headers.get("etag")
+    if config.response_cache.enabled and response.status_code == 200 and etag:
+        list_cache.set(etag, response.body)
+
+
+async def read_through_list_cache(
+    session: AnySession,
+    request: Request,
+    get_etag_: Callable[[Session], str],
+    render: Callable[[Session, str], Response],
+) -> Response:
+    """respond with the page of the ETag got by `get_etag_`, cached or rendered
+
+    The ETag and the page are read in the same transaction of `session`,
+    and the I/O of the cache runs on the threadpool between them.
+    """
+    etag = await run_in_session(session, get_etag_)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    cached_response = await run_in_threadpool(get_list_response, etag)
+    if cached_response is not None:
+        return cached_response
+    response = await run_in_session(session, render, etag)
+    await run_in_threadpool(set_list_response, response)
+    return response
+
+
+post_cache = ResponseCache(
+    "response:post",
+    cache_backend,
+    config.response_cache.maxsize,
+    config.response_cache.ttl_seconds,
+    query_params={"expand", "expand_limit"},
+    replica_lag_seconds=config.db.replica_pin_seconds,
+)
+comment_cache = ResponseCache(
+    "response:comment",
+    cache_backend,
+    config.response_cache.maxsize,
+    config.response_cache.ttl_seconds,
+    replica_lag_seconds=config.db.replica_pin_seconds,
+)
+list_cache = ListResponseCache(
+    "response:list",
+    cache_backend,
+    config.response_cache.list_maxsize,
+    config.response_cache.list_ttl_seconds,
+)
+response_caches: Dict[str, Union[ResponseCache, ListResponseCache]] = {
+    "post": post_cache,
+    "comment": comment_cache,
+    "list": list_cache,
+}
+
+# caches and columns of the ids of the rows invalidated by a write to each model
+_INVALIDATED_ROWS = {
+    post.Post: [("post", "id")],
+    comment.Comment: [("comment", "id"), ("post", "post_id")],
+    post_feedback.PostFeedback: [("post", "post_id")],
+    comment_feedback.CommentFeedback: [("comment", "comment_id")],
+}
+
+
+def _invalidate(invalidated: Dict[str, Set[Any]]) -> None:
+    if "user" in invalidated:
+        for cache in response_caches.values():
+            cache.clear()
+        return
+    post_cache.invalidate(list(invalidated.get("post", [])))
+    comment_cache.invalidate(list(invalidated.get("comment", [])))
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_rows(session: Session, *args: Any) -> None:
+    invalidated = session.info.setdefault("invalidated_responses", {})
+    for row in [*session.dirty, *session.deleted]:
+        if isinstance(row, user.User) and (
+            row in session.deleted or attributes.get_history(row, "name").has_changes()
+        ):
+            invalidated["user"] = set()
+    for row in [*session.new, *session.dirty, *session.deleted]:
+        for name, column in _INVALIDATED_ROWS.get(type(row), []):
+            invalidated.setdefault(name, set()).add(getattr(row, column))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_rows(session: Session) -> None:
+    invalidated = session.info.pop("invalidated_responses", None)
+    if invalidated:
+        run_off_event_loop(session, functools.partial(_invalidate, invalidated))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_rows(session: Session) -> None:
+    session.info.pop("invalidated_responses", None)
@@ -1,12 +1,13 @@
 from fastapi import FastAPI, status
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
-from src.api.v1 import auth, comments, feedbacks, posts, users
+from src.api.v1 import auth, comments, feedbacks, metrics, posts, users
 
 app = FastAPI(
     title="Project REST API Docs",
     description="프로젝트 REST API 문서입니다.",
     version="v1",
+    default_response_class=ORJSONResponse,
 )
 
 app.include_router(auth.router)
@@ -14,6 +15,7 @@ app.include_router(users.router)
 app.include_router(posts.router)
 app.include_router(comments.router)
 app.include_router(feedbacks.router)
+app.include_router(metrics.router)
 
 
 @app.get(
@@ -24,5 +26,5 @@ app.include_router(feedbacks.router)
     description="API 서버가 잘 작동하는지 확인합니다.",
     response_description="API 서버가 잘 작동하고 있습니다.",
 )
-def healthcheck() -> str:
+async def healthcheck() -> str:
     return "I'm Alive!"
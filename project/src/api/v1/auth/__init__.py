@@ -1,6 +1,7 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
 from src.api.v1.auth import signin, signup
+from src.instrumentation import QueryBudget
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -9,6 +10,7 @@ router.add_api_route(
     path="/signup",
     endpoint=signup.handle,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(QueryBudget(4))],
     summary="새로운 유저로 가입합니다.",
 )
 
@@ -17,6 +19,7 @@ router.add_api_route(
     path="/signin",
     endpoint=signin.handle,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(1))],
     summary="로그인 합니다.",
     response_model=signin.SigninResponse,
 )
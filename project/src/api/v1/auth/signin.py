@@ -3,10 +3,11 @@ from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt
 from pydantic.main import BaseModel
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
 from src import config
 from src.api.v1.auth.utils import TokenPayload, pwd_context
-from src.database import engine
+from src.database import AnySession, get_session, run_in_session
 from src.models.user import User
 
 
@@ -18,19 +19,29 @@ class SigninResponse(BaseModel):
         alias_generator = None
 
 
-def handle(form_data: OAuth2PasswordRequestForm = Depends()) -> SigninResponse:
-    with Session(engine) as session:
-        user = session.get(User, form_data.username)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User does not exist",
-            )
-        if not pwd_context.verify(form_data.password, user.password):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Password is incorrect",
-            )
+def _get_user(session: Session, user_id: str) -> User:
+    user = session.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User does not exist",
+        )
+    return user
+
+
+async def handle(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    session: AnySession = Depends(get_session),
+) -> SigninResponse:
+    user = await run_in_session(session, _get_user, form_data.username)
+    # bcrypt is cpu bound, so keep it off the event loop
+    if not await run_in_threadpool(
+        pwd_context.verify, form_data.password, user.password
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Password is incorrect",
+        )
     token_payload = TokenPayload(user=user)
     jwt_token = jwt.encode(
         token_payload.dict(),
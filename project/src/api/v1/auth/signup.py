@@ -1,9 +1,10 @@
-from fastapi import HTTPException, status
+from fastapi import Depends, HTTPException, status
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.api.common import SchemaModel
 from src.api.v1.auth.utils import get_hashed_password
-from src.database import engine
+from src.database import AnySession, get_session, run_in_session
 from src.models import user
 
 
@@ -13,19 +14,25 @@ class SignupRequest(SchemaModel):
     password: str = user.password_field
 
 
-def handle(request: SignupRequest) -> None:
-    with Session(engine) as session:
-        existing_user = session.get(user.User, request.id)
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="User already exist",
-            )
-        request.password = get_hashed_password(request.password)
-        new_user = user.User(
-            id=request.id,
-            name=request.name,
-            password=request.password,
+def _handle(session: Session, request: SignupRequest) -> None:
+    existing_user = session.get(user.User, request.id)
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User already exist",
         )
-        session.add(new_user)
-        session.commit()
+    new_user = user.User(
+        id=request.id,
+        name=request.name,
+        password=request.password,
+    )
+    session.add(new_user)
+    session.commit()
+
+
+async def handle(
+    request: SignupRequest, session: AnySession = Depends(get_session)
+) -> None:
+    # bcrypt is cpu bound, so keep it off the event loop
+    request.password = await run_in_threadpool(get_hashed_password, request.password)
+    await run_in_session(session, _handle, request)
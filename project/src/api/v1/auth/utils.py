@@ -1,16 +1,31 @@
-from typing import List
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from jose.constants import ALGORITHMS
 from passlib.context import CryptContext
 from pydantic import ValidationError
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
 from src import config
 from src.api.common import SchemaModel
-from src.database import engine
+from src.cache_backends import CacheBackend, cache_backend
+from src.database import (
+    AnySession,
+    get_session,
+    run_in_session,
+    run_off_event_loop,
+)
 from src.models.user import Role, User
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -22,24 +37,202 @@ class TokenPayload(SchemaModel):
     user: User
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+class TokenCache:
+    """LRU cache of verified token payloads by the digests of their tokens
+
+    A payload expires at the `exp` claim of its token if any, and after a TTL
+    at the latest, so a token is verified again once in a while.
+    Invalid tokens are not cached. A TTL of 0 turns it off.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._payloads: "OrderedDict[bytes, Tuple[float, TokenPayload]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[TokenPayload]:
+        key = self._get_key(token)
+        with self._lock:
+            entry = self._payloads.get(key)
+            if entry is None:
+                return None
+            expires_at, token_payload = entry
+            if expires_at <= time.time():
+                del self._payloads[key]
+                return None
+            self._payloads.move_to_end(key)
+            return token_payload
+
+    def set(
+        self, token: str, token_payload: TokenPayload, claims: Dict[str, Any]
+    ) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        key = self._get_key(token)
+        with self._lock:
+            self._payloads[key] = (expires_at, token_payload)
+            self._payloads.move_to_end(key)
+            while len(self._payloads) > self.maxsize:
+                self._payloads.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._payloads.clear()
+
+    @staticmethod
+    def _get_key(token: str) -> bytes:
+        # the digest keeps the tokens themselves out of memory
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+token_cache = TokenCache(
+    config.auth.token_cache_maxsize, config.auth.token_cache_ttl_seconds
+)
+
+
+def decode_token(token: str) -> TokenPayload:
+    """get the payload of `token` verified by its signature, from the cache if it was
+
+    Raises `HTTPException` of 401 if it is not valid.
+    """
+    token_payload = token_cache.get(token)
+    if token_payload is not None:
+        return token_payload
     try:
-        token_payload = jwt.decode(
+        claims = jwt.decode(
             token, config.auth.jwt_secret_key, algorithms=config.auth.jwt_algorithm
         )
-        token_payload = TokenPayload(**token_payload)
+        token_payload = TokenPayload(**claims)
     except (JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token is not valid",
         )
-    with Session(engine) as session:
-        user = session.get(User, token_payload.user.id)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User does not exist",
+    token_cache.set(token, token_payload, claims)
+    return token_payload
+
+
+UNCACHED_COLUMNS = {"password"}
+
+
+class UserCache:
+    """cache of the columns of authenticated users by id in a cache backend
+
+    The password hash is not cached, so it does not leave the database for a
+    shared backend; a cached user loads it from the database if it is read.
+    Only existing users are cached, and a user is invalidated by the commit
+    of a flush which deleted it or changed any of its columns (e.g. its role),
+    off the event loop. The TTL bounds staleness from writes
+    of other processes on the in-memory backend. A TTL of 0 turns it off.
+    """
+
+    namespace = "user"
+
+    def __init__(self, backend: CacheBackend, maxsize: int, ttl_seconds: float) -> None:
+        self.backend = backend
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # bumped by invalidations, to tell the users loaded before them
+        self.generation = 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(self.namespace, user_id)
+        return orjson.loads(value) if value is not None else None
+
+    def set(self, user: User, generation: int) -> None:
+        """cache the columns of `user` loaded in `generation`, unless invalidated since"""
+        if self.ttl_seconds <= 0:
+            return
+        values = {
+            column.key: getattr(user, column.key)
+            for column in inspect(User).column_attrs
+            if column.key not in UNCACHED_COLUMNS
+        }
+        with self._lock:
+            if generation != self.generation:
+                return
+            self.backend.set(
+                self.namespace,
+                user.id,
+                orjson.dumps(values),
+                self.ttl_seconds,
+                self.maxsize,
             )
+
+    def invalidate(self, user_ids: List[str]) -> None:
+        with self._lock:
+            self.generation += 1
+            self.backend.delete(self.namespace, user_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.backend.clear(self.namespace)
+
+
+user_cache = UserCache(
+    cache_backend, config.auth.user_cache_maxsize, config.auth.user_cache_ttl_seconds
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_users(session: Session, *args: Any) -> None:
+    user_ids = [
+        row.id
+        for row in [*session.dirty, *session.deleted]
+        if isinstance(row, User)
+        and (
+            row in session.deleted
+            or session.is_modified(row, include_collections=False)
+        )
+    ]
+    if user_ids:
+        session.info.setdefault("invalidated_users", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    user_ids = session.info.pop("invalidated_users", None)
+    if user_ids:
+        run_off_event_loop(
+            session, functools.partial(user_cache.invalidate, list(user_ids))
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop("invalidated_users", None)
+
+
+def _get_user(session: Session, user_id: str) -> User:
+    user = session.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User does not exist",
+        )
+    return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), session: AnySession = Depends(get_session)
+) -> User:
+    token_payload = decode_token(token)
+    values = await run_in_threadpool(user_cache.get, token_payload.user.id)
+    if values is not None:
+        # a new instance per session, added as if it were loaded, without a query
+        user = User(**values)
+        make_transient_to_detached(user)
+        session.add(user)
+        return user
+    generation = user_cache.generation
+    user = await run_in_session(session, _get_user, token_payload.user.id)
+    await run_in_threadpool(user_cache.set, user, generation)
     return user
 
 
@@ -47,7 +240,7 @@ class GetAuthorizedUser:
     def __init__(self, allowed_roles: List[Role]) -> None:
         self._allowed_roles = allowed_roles
 
-    def __call__(self, user: User = Depends(get_current_user)) -> User:
+    async def __call__(self, user: User = Depends(get_current_user)) -> User:
         if Role(user.role) not in self._allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
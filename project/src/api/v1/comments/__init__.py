@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
 from src.api.v1.comments import (
     create_comment,
@@ -7,6 +7,7 @@ from src.api.v1.comments import (
     read_comments,
     update_comment,
 )
+from src.instrumentation import QueryBudget
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
@@ -15,6 +16,7 @@ router.add_api_route(
     path="/",
     endpoint=create_comment.handle,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(QueryBudget(7))],
     summary="댓글을 추가합니다.",
 )
 
@@ -23,6 +25,7 @@ router.add_api_route(
     path="/{comment_id}",
     endpoint=read_comment.handle,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(2))],
     summary="댓글을 조회합니다.",
     response_model=read_comment.ReadCommentResponse,
 )
@@ -32,6 +35,7 @@ router.add_api_route(
     path="/",
     endpoint=read_comments.handle,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(4))],
     summary="댓글 목록을 조회합니다.",
     response_model=read_comments.ReadCommentsResponse,
 )
@@ -41,6 +45,7 @@ router.add_api_route(
     path="/{comment_id}",
     endpoint=update_comment.handle,
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(QueryBudget(5))],
     summary="댓글 전체를 수정합니다.",
 )
 
@@ -49,5 +54,6 @@ router.add_api_route(
     path="/{comment_id}",
     endpoint=delete_comment.handle,
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(QueryBudget(6))],
     summary="댓글을 삭제합니다.",
 )
@@ -3,7 +3,7 @@ from sqlmodel import Session
 
 from src.api.common import SchemaModel
 from src.api.v1.auth.utils import GetAuthorizedUser
-from src.database import engine
+from src.database import AnySession, get_session, run_in_session
 from src.models import comment, post, user
 
 
@@ -12,28 +12,37 @@ class CreateCommentReqeust(SchemaModel):
     content: str = comment.content_field
 
 
-def handle(
+def _handle(
+    session: Session,
+    request: CreateCommentReqeust,
+    current_user: user.User,
+    response: Response,
+) -> None:
+    existing_post = session.get(post.Post, request.post_id)
+    if not existing_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+        )
+    new_comment = comment.Comment(
+        content=request.content,
+        user_id=current_user.id,
+        post_id=request.post_id,
+        user=current_user,
+        post=existing_post,
+    )
+    session.add(new_comment)
+    session.commit()
+    session.refresh(new_comment)
+    response.headers["Location"] = f"/v1/comments/{new_comment.id}"
+
+
+async def handle(
     *,
     request: CreateCommentReqeust,
     current_user: user.User = Depends(
         GetAuthorizedUser(allowed_roles=[user.Role.ADMIN, user.Role.COMMON])
     ),
     response: Response,
+    session: AnySession = Depends(get_session),
 ) -> None:
-    with Session(engine) as session:
-        existing_post = session.get(post.Post, request.post_id)
-        if not existing_post:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
-            )
-        new_comment = comment.Comment(
-            content=request.content,
-            user_id=current_user.id,
-            post_id=request.post_id,
-            user=current_user,
-            post=existing_post,
-        )
-        session.add(new_comment)
-        session.commit()
-        session.refresh(new_comment)
-        response.headers["Location"] = f"/v1/comments/{new_comment.id}"
+    await run_in_session(session, _handle, request, current_user, response)
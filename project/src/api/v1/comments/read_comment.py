@@ -1,10 +1,28 @@
-from typing import List
+from typing import Any, List, Tuple
 
-from fastapi import HTTPException, Request, status
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import joinedload
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
-from src.api.common import Link, SchemaModel
-from src.database import engine
+from src import statements
+from src.api.common import (
+    Link,
+    SchemaModel,
+    get_etag,
+    get_normalized_url,
+    is_not_modified,
+    not_modified,
+    respond,
+)
+from src.api.response_cache import (
+    comment_cache,
+    get_response,
+    is_cacheable,
+    set_response,
+)
+from src.api.v1.links import comment_links
+from src.database import AnySession, get_session, is_bound_to_replica, run_in_session
 from src.models import comment, post, user
 from src.models.comment import Comment
 
@@ -29,8 +47,16 @@ class ReadCommentResponse(SchemaModel):
             class Config:
                 title = "ReadCommentResponse.Data.User"
 
+        class NumOf(SchemaModel):
+            likes: int
+            dislikes: int
+
+            class Config:
+                title = "ReadCommentResponse.Data.NumOf"
+
         post: Post
         user: User
+        num_of: NumOf
 
         links: List[Link]
 
@@ -41,37 +67,84 @@ class ReadCommentResponse(SchemaModel):
     links: List[Link]
 
 
-def handle(comment_id: int, request: Request) -> ReadCommentResponse:
-    with Session(engine) as session:
-        comment_to_read = session.get(Comment, comment_id)
-        if not comment_to_read:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Comment not found",
-            )
-        return ReadCommentResponse(
-            data=ReadCommentResponse.Data(
-                id=comment_to_read.id,
-                content=comment_to_read.content,
-                created_at=comment_to_read.created_at,
-                updated_at=comment_to_read.updated_at,
-                post=ReadCommentResponse.Data.Post(
-                    id=comment_to_read.post_id,
-                ),
-                user=ReadCommentResponse.Data.User(
-                    id=comment_to_read.user.id,
-                    name=comment_to_read.user.name,
-                ),
-                links=[
-                    Link(
-                        rel="self",
-                        href=f"{request.base_url}v1/comments/{comment_to_read.id}",
-                    ),
-                    Link(
-                        rel="post",
-                        href=f"{request.base_url}v1/posts/{comment_to_read.post_id}",
-                    ),
-                ],
-            ),
-            links=[Link(rel="self", href=str(request.url))],
+def _get_version(comment_: Any, user_version: int) -> Tuple[Any, ...]:
+    """get the version of a comment, or of a row of `statements.select_comment_version`
+
+    The counts are included, since they are updated without bumping `version`,
+    and so is the version of the author, whose name is rendered too.
+    """
+    return (
+        comment_.version,
+        comment_.like_count,
+        comment_.dislike_count,
+        user_version,
+    )
+
+
+def _handle(session: Session, comment_id: int, request: Request) -> Response:
+    url = get_normalized_url(request)
+    if "if-none-match" in request.headers:
+        version = session.execute(
+            statements.select_comment_version, {"id": comment_id}
+        ).first()
+        if version is not None:
+            etag = get_etag(url, _get_version(version, version.user_version))
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+    comment_to_read = session.get(
+        Comment, comment_id, options=[joinedload(Comment.user)]
+    )
+    if not comment_to_read:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comment not found",
         )
+    response = ReadCommentResponse.construct(
+        data=ReadCommentResponse.Data.construct(
+            id=comment_to_read.id,
+            content=comment_to_read.content,
+            created_at=comment_to_read.created_at,
+            updated_at=comment_to_read.updated_at,
+            post=ReadCommentResponse.Data.Post.construct(
+                id=comment_to_read.post_id,
+            ),
+            user=ReadCommentResponse.Data.User.construct(
+                id=comment_to_read.user.id,
+                name=comment_to_read.user.name,
+            ),
+            num_of=ReadCommentResponse.Data.NumOf.construct(
+                likes=comment_to_read.like_count,
+                dislikes=comment_to_read.dislike_count,
+            ),
+            links=comment_links.get_links(
+                request.base_url, id=comment_to_read.id, post_id=comment_to_read.post_id
+            ),
+        ),
+        links=[Link.construct(rel="self", href=url)],
+    )
+    etag = get_etag(url, _get_version(comment_to_read, comment_to_read.user.version))
+    return respond(response, etag=etag)
+
+
+async def handle(
+    comment_id: int, request: Request, session: AnySession = Depends(get_session)
+) -> Response:
+    if not is_cacheable():
+        return await run_in_session(session, _handle, comment_id, request)
+    cached_response = await run_in_threadpool(
+        get_response, comment_cache, comment_id, request
+    )
+    if cached_response is not None:
+        return cached_response
+    generation = comment_cache.generation
+    response = await run_in_session(session, _handle, comment_id, request)
+    await run_in_threadpool(
+        set_response,
+        comment_cache,
+        comment_id,
+        request,
+        response,
+        generation,
+        is_bound_to_replica(session),
+    )
+    return response
@@ -1,83 +1,194 @@
-from typing import List, Optional
+import functools
+from typing import FrozenSet, List, Optional, Tuple, Union
 
-from fastapi import Query, Request
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, func, select
+from fastapi import Depends, Query, Request, Response
+from sqlmodel import Session
 
-from src.api.common import Link, Pagination, SchemaModel, get_links_for_pagination
+from src import collection_versions, row_counts, statements
+from src.api.common import (
+    CursorPagination,
+    CursorParams,
+    Link,
+    Pagination,
+    SchemaModel,
+    SparseFields,
+    construct_fields,
+    get_cursor_pagination,
+    get_etag,
+    get_links_for_cursor_pagination,
+    get_links_for_pagination,
+    get_normalized_url,
+    respond,
+)
+from src.api.response_cache import read_through_list_cache
 from src.api.v1.comments.read_comment import ReadCommentResponse
-from src.database import engine
+from src.api.v1.links import comment_links
+from src.database import AnySession, get_session
 from src.models import comment
 
 
 class ReadCommentsResponse(SchemaModel):
-    pagination: Pagination
+    pagination: Union[Pagination, CursorPagination]
     data: List[ReadCommentResponse.Data]
     links: List[Link]
 
 
 def _get_total(session: Session, post_id: Optional[int] = None) -> int:
     """get total count of rows for pagination"""
-    statement = select([func.count(comment.Comment.id)])
     if post_id:
-        statement = statement.where(comment.Comment.post_id == post_id)
-    return session.exec(statement).one()  # type: ignore
+        return row_counts.get_count(session, row_counts.comments, post_id)
+    return row_counts.get_count(session, row_counts.comments)
 
 
 def _get_comments(
-    session: Session, offset: int, limit: int, post_id: Optional[int] = None
+    session: Session,
+    fields: Optional[FrozenSet[str]],
+    offset: int,
+    limit: int,
+    post_id: Optional[int] = None,
 ) -> List[comment.Comment]:
     """get all rows"""
-    statement = (
-        select(comment.Comment)
-        .order_by(comment.Comment.id)
-        .offset(offset)
-        .limit(limit)
-        .options(selectinload(comment.Comment.user))
-    )
     if post_id:
-        statement = statement.where(comment.Comment.post_id == post_id)
-    results = session.exec(statement)
+        results = session.scalars(
+            statements.select_comments_of_post.narrow(fields).by_offset,
+            {"offset": offset, "limit": limit, "post_id": post_id},
+        )
+    else:
+        results = session.scalars(
+            statements.select_comments.narrow(fields).by_offset,
+            {"offset": offset, "limit": limit},
+        )
     return results.all()
 
 
-def handle(
+def _get_comments_by_cursor(
+    session: Session,
+    fields: Optional[FrozenSet[str]],
+    limit: int,
+    cursor_params: CursorParams,
+    post_id: Optional[int] = None,
+) -> Tuple[List[comment.Comment], bool]:
+    """get rows next to the cursor, and whether more rows are beyond them"""
+    if post_id:
+        return statements.select_comments_of_post.narrow(fields).get_rows_by_keyset(
+            session,
+            limit,
+            cursor_params.after_key,
+            cursor_params.before_key,
+            cursor_params.from_last,
+            post_id=post_id,
+        )
+    return statements.select_comments.narrow(fields).get_rows_by_keyset(
+        session,
+        limit,
+        cursor_params.after_key,
+        cursor_params.before_key,
+        cursor_params.from_last,
+    )
+
+
+def get_data(
+    comment_to_read: comment.Comment, fields: Optional[FrozenSet[str]], request: Request
+) -> ReadCommentResponse.Data:
+    """get the item of `comment_to_read` of the `fields`"""
+    return construct_fields(
+        ReadCommentResponse.Data,
+        fields,
+        id=lambda: comment_to_read.id,
+        content=lambda: comment_to_read.content,
+        created_at=lambda: comment_to_read.created_at,
+        updated_at=lambda: comment_to_read.updated_at,
+        post=lambda: ReadCommentResponse.Data.Post.construct(
+            id=comment_to_read.post_id,
+        ),
+        user=lambda: ReadCommentResponse.Data.User.construct(
+            id=comment_to_read.user.id,
+            name=comment_to_read.user.name,
+        ),
+        num_of=lambda: ReadCommentResponse.Data.NumOf.construct(
+            likes=comment_to_read.like_count,
+            dislikes=comment_to_read.dislike_count,
+        ),
+        links=lambda: comment_links.get_links(
+            request.base_url,
+            id=comment_to_read.id,
+            post_id=comment_to_read.post_id,
+        ),
+    )
+
+
+def _get_etag(session: Session, post_id: Optional[int], request: Request) -> str:
+    if post_id:
+        # the counts of the comments are changed by their feedbacks
+        keys = [
+            collection_versions.of_parent(collection_versions.COMMENT, post_id),
+            collection_versions.COMMENT_FEEDBACK,
+        ]
+    else:
+        keys = [collection_versions.COMMENT]
+    # the names of the users are rendered too
+    versions = collection_versions.get_versions(
+        session, [*keys, collection_versions.USER]
+    )
+    return get_etag(get_normalized_url(request), versions)
+
+
+def _handle(
+    session: Session,
+    etag: str,
+    fields: Optional[FrozenSet[str]],
+    post_id: Optional[int],
+    offset: int,
+    limit: int,
+    cursor_params: CursorParams,
+    request: Request,
+) -> Response:
+    pagination: Union[Pagination, CursorPagination]
+    if cursor_params.is_given:
+        comments_to_read, has_more = _get_comments_by_cursor(
+            session, fields, limit, cursor_params, post_id
+        )
+        pagination = get_cursor_pagination(
+            cursor_params, [row.id for row in comments_to_read], limit, has_more
+        )
+        links = get_links_for_cursor_pagination(pagination, request)
+    else:
+        total = _get_total(session, post_id)
+        comments_to_read = _get_comments(session, fields, offset, limit, post_id)
+        pagination = Pagination.construct(offset=offset, limit=limit, total=total)
+        links = get_links_for_pagination(offset, limit, total, request)
+    response = ReadCommentsResponse.construct(
+        pagination=pagination,
+        data=[
+            get_data(comment_to_read, fields, request)
+            for comment_to_read in comments_to_read
+        ],
+        links=links,
+    )
+    return respond(response, fields, etag)
+
+
+async def handle(
     *,
     post_id: Optional[int] = None,
     offset: int = 0,
-    limit: int = Query(default=100, lte=100),
+    limit: int = Query(default=100, gt=0, le=100),
+    cursor_params: CursorParams = Depends(),
+    fields: Optional[FrozenSet[str]] = Depends(SparseFields(ReadCommentResponse.Data)),
     request: Request,
-) -> ReadCommentsResponse:
-    with Session(engine) as session:
-        total = _get_total(session, post_id)
-        comments_to_read = _get_comments(session, offset, limit, post_id)
-        return ReadCommentsResponse(
-            pagination=Pagination(offset=offset, limit=limit, total=total),
-            data=[
-                ReadCommentResponse.Data(
-                    id=comment_to_read.id,
-                    content=comment_to_read.content,
-                    created_at=comment_to_read.created_at,
-                    updated_at=comment_to_read.updated_at,
-                    post=ReadCommentResponse.Data.Post(
-                        id=comment_to_read.post_id,
-                    ),
-                    user=ReadCommentResponse.Data.User(
-                        id=comment_to_read.user.id,
-                        name=comment_to_read.user.name,
-                    ),
-                    links=[
-                        Link(
-                            rel="self",
-                            href=f"{request.base_url}v1/comments/{comment_to_read.id}",
-                        ),
-                        Link(
-                            rel="post",
-                            href=f"{request.base_url}v1/posts/{comment_to_read.post_id}",
-                        ),
-                    ],
-                )
-                for comment_to_read in comments_to_read
-            ],
-            links=get_links_for_pagination(offset, limit, total, request),
-        )
+    session: AnySession = Depends(get_session),
+) -> Response:
+    return await read_through_list_cache(
+        session,
+        request,
+        functools.partial(_get_etag, post_id=post_id, request=request),
+        functools.partial(
+            _handle,
+            fields=fields,
+            post_id=post_id,
+            offset=offset,
+            limit=limit,
+            cursor_params=cursor_params,
+            request=request,
+        ),
+    )
@@ -5,7 +5,7 @@ from sqlmodel import Session, select
 
 from src.api.common import SchemaModel
 from src.api.v1.auth.utils import GetAuthorizedUser
-from src.database import engine
+from src.database import AnySession, get_session, run_in_session
 from src.models import comment, user
 from src.models.feedbacks import comment_feedback
 from src.models.utils import get_current_unix_timestamp
@@ -51,82 +51,94 @@ class UpdateCommentFeedbackResponse(BaseResponse):
             title = "UpdateCommentFeedbackResponse.Data"
 
 
-def handle(
+def _handle(
+    session: Session,
     comment_id: int,
     like_or_dislike: Literal["like", "dislike"],
     response: Response,
-    current_user: user.User = Depends(
-        GetAuthorizedUser(allowed_roles=[user.Role.ADMIN, user.Role.COMMON])
-    ),
+    current_user: user.User,
 ) -> Union[CreateCommentFeedbackResponse, UpdateCommentFeedbackResponse]:
-    with Session(engine) as session:
-        existing_comment = session.get(comment.Comment, comment_id)
-        if not existing_comment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Comment not found",
-            )
-
-        statement = select(comment_feedback.CommentFeedback).where(
-            comment_feedback.CommentFeedback.comment_id == existing_comment.id,
-            comment_feedback.CommentFeedback.user_id == current_user.id,
+    existing_comment = session.get(comment.Comment, comment_id)
+    if not existing_comment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comment not found",
         )
-        results = session.exec(statement)
-        existing_comment_feedback = results.first()
-
-        if existing_comment_feedback:
-            if like_or_dislike == "like":
-                existing_comment_feedback.like = True
-            else:
-                existing_comment_feedback.like = False
-            existing_comment_feedback.updated_at = get_current_unix_timestamp()
-            session.add(existing_comment_feedback)
-            session.commit()
-            session.refresh(existing_comment_feedback)
-
-            response.status_code = status.HTTP_200_OK
-            return UpdateCommentFeedbackResponse(
-                data=UpdateCommentFeedbackResponse.Data(
-                    id=existing_comment_feedback.id,
-                    like=existing_comment_feedback.like,
-                    created_at=existing_comment_feedback.created_at,
-                    updated_at=existing_comment_feedback.updated_at,
-                    comment=UpdateCommentFeedbackResponse.Data.Comment(
-                        id=existing_comment_feedback.comment_id,
-                    ),
-                    user=UpdateCommentFeedbackResponse.Data.User(
-                        id=existing_comment_feedback.user_id,
-                    ),
-                )
-            )
+
+    statement = select(comment_feedback.CommentFeedback).where(
+        comment_feedback.CommentFeedback.comment_id == existing_comment.id,
+        comment_feedback.CommentFeedback.user_id == current_user.id,
+    )
+    results = session.exec(statement)
+    existing_comment_feedback = results.first()
+
+    if existing_comment_feedback:
+        if like_or_dislike == "like":
+            existing_comment_feedback.like = True
         else:
-            if like_or_dislike == "like":
-                like = True
-            else:
-                like = False
-            new_comment_feedback = comment_feedback.CommentFeedback(
-                comment_id=existing_comment.id,
-                user_id=current_user.id,
-                like=like,
-                comment=existing_comment,
-                user=current_user,
+            existing_comment_feedback.like = False
+        existing_comment_feedback.updated_at = get_current_unix_timestamp()
+        session.add(existing_comment_feedback)
+        session.commit()
+        session.refresh(existing_comment_feedback)
+
+        response.status_code = status.HTTP_200_OK
+        return UpdateCommentFeedbackResponse(
+            data=UpdateCommentFeedbackResponse.Data(
+                id=existing_comment_feedback.id,
+                like=existing_comment_feedback.like,
+                created_at=existing_comment_feedback.created_at,
+                updated_at=existing_comment_feedback.updated_at,
+                comment=UpdateCommentFeedbackResponse.Data.Comment(
+                    id=existing_comment_feedback.comment_id,
+                ),
+                user=UpdateCommentFeedbackResponse.Data.User(
+                    id=existing_comment_feedback.user_id,
+                ),
             )
-            session.add(new_comment_feedback)
-            session.commit()
-            session.refresh(new_comment_feedback)
-
-            response.status_code = status.HTTP_201_CREATED
-            return CreateCommentFeedbackResponse(
-                data=CreateCommentFeedbackResponse.Data(
-                    id=new_comment_feedback.id,
-                    like=new_comment_feedback.like,
-                    created_at=new_comment_feedback.created_at,
-                    updated_at=new_comment_feedback.updated_at,
-                    comment=UpdateCommentFeedbackResponse.Data.Comment(
-                        id=new_comment_feedback.comment_id,
-                    ),
-                    user=UpdateCommentFeedbackResponse.Data.User(
-                        id=new_comment_feedback.user_id,
-                    ),
-                )
+        )
+    else:
+        if like_or_dislike == "like":
+            like = True
+        else:
+            like = False
+        new_comment_feedback = comment_feedback.CommentFeedback(
+            comment_id=existing_comment.id,
+            user_id=current_user.id,
+            like=like,
+            comment=existing_comment,
+            user=current_user,
+        )
+        session.add(new_comment_feedback)
+        session.commit()
+        session.refresh(new_comment_feedback)
+
+        response.status_code = status.HTTP_201_CREATED
+        return CreateCommentFeedbackResponse(
+            data=CreateCommentFeedbackResponse.Data(
+                id=new_comment_feedback.id,
+                like=new_comment_feedback.like,
+                created_at=new_comment_feedback.created_at,
+                updated_at=new_comment_feedback.updated_at,
+                comment=UpdateCommentFeedbackResponse.Data.Comment(
+                    id=new_comment_feedback.comment_id,
+                ),
+                user=UpdateCommentFeedbackResponse.Data.User(
+                    id=new_comment_feedback.user_id,
+                ),
             )
+        )
+
+
+async def handle(
+    comment_id: int,
+    like_or_dislike: Literal["like", "dislike"],
+    response: Response,
+    current_user: user.User = Depends(
+        GetAuthorizedUser(allowed_roles=[user.Role.ADMIN, user.Role.COMMON])
+    ),
+    session: AnySession = Depends(get_session),
+) -> Union[CreateCommentFeedbackResponse, UpdateCommentFeedbackResponse]:
+    return await run_in_session(
+        session, _handle, comment_id, like_or_dislike, response, current_user
+    )
@@ -2,35 +2,37 @@ from fastapi import Depends, HTTPException, status
 from sqlmodel import Session, select
 
 from src.api.v1.auth.utils import GetAuthorizedUser
-from src.database import engine
+from src.database import AnySession, get_session, run_in_session
 from src.models.feedbacks.comment_feedback import CommentFeedback
 from src.models.user import Role, User
 
 
-def handle(
+def _handle(session: Session, comment_feedback_id: int, current_user: User) -> None:
+    statement = select(CommentFeedback).where(CommentFeedback.id == comment_feedback_id)
+    results = session.exec(statement)
+    comment_feedback = results.first()
+    if not comment_feedback:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CommentFeedback not found",
+        )
+    if (
+        Role(current_user.role) != Role.ADMIN
+        and comment_feedback.user_id != current_user.id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User does not authorized",
+        )
+    session.delete(comment_feedback)
+    session.commit()
+
+
+async def handle(
     comment_feedback_id: int,
     current_user: User = Depends(
         GetAuthorizedUser(allowed_roles=[Role.ADMIN, Role.COMMON])
     ),
+    session: AnySession = Depends(get_session),
 ) -> None:
-    with Session(engine) as session:
-        statement = select(CommentFeedback).where(
-            CommentFeedback.id == comment_feedback_id
-        )
-        results = session.exec(statement)
-        comment_feedback = results.first()
-        if not comment_feedback:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="CommentFeedback not found",
-            )
-        if (
-            Role(current_user.role) != Role.ADMIN
-            and comment_feedback.user_id != current_user.id
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User does not authorized",
-            )
-        session.delete(comment_feedback)
-        session.commit()
+    await run_in_session(session, _handle, comment_feedback_id, current_user)
@@ -1,11 +1,28 @@
-from typing import List, Optional
-
-from fastapi import Query, Request
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, func, select
-
-from src.api.common import Link, Pagination, SchemaModel, get_links_for_pagination
-from src.database import engine
+import functools
+from typing import FrozenSet, List, Optional, Tuple, Union
+
+from fastapi import Depends, Query, Request, Response
+from sqlmodel import Session
+
+from src import collection_versions, row_counts, statements
+from src.api.common import (
+    CursorPagination,
+    CursorParams,
+    Link,
+    Pagination,
+    SchemaModel,
+    SparseFields,
+    construct_fields,
+    get_cursor_pagination,
+    get_etag,
+    get_links_for_cursor_pagination,
+    get_links_for_pagination,
+    get_normalized_url,
+    respond,
+)
+from src.api.response_cache import read_through_list_cache
+from src.api.v1.links import comment_feedback_links
+from src.database import AnySession, get_session
 from src.models import comment, user
 from src.models.feedbacks import comment_feedback
 
@@ -37,77 +54,163 @@ class GetCommentFeedbacksResponse(SchemaModel):
         class Config:
             title = "GetCommentFeedbacksResponse.Data"
 
-    pagination: Pagination
+    pagination: Union[Pagination, CursorPagination]
     data: List[Data]
     links: List[Link]
 
 
 def _get_total(session: Session, comment_id: Optional[int] = None) -> int:
     """get total count of rows for pagination"""
-    statement = select([func.count(comment_feedback.CommentFeedback.id)])
-    if comment_id:
-        statement = statement.where(
-            comment_feedback.CommentFeedback.comment_id == comment_id
-        )
-    return session.exec(statement).one()  # type: ignore
+    return row_counts.get_count(
+        session, row_counts.comment_feedbacks, comment_id or None
+    )
 
 
 def _get_comment_feedbacks(
-    session: Session, offset: int, limit: int, comment_id: Optional[int] = None
+    session: Session,
+    fields: Optional[FrozenSet[str]],
+    offset: int,
+    limit: int,
+    comment_id: Optional[int] = None,
 ) -> List[comment_feedback.CommentFeedback]:
     """get all rows"""
-    statement = (
-        select(comment_feedback.CommentFeedback)
-        .order_by(comment_feedback.CommentFeedback.id)
-        .offset(offset)
-        .limit(limit)
-        .options(
-            selectinload(comment_feedback.CommentFeedback.user),
-        )
-    )
     if comment_id:
-        statement = statement.where(
-            comment_feedback.CommentFeedback.comment_id == comment_id
+        results = session.scalars(
+            statements.select_comment_feedbacks_of_comment.narrow(fields).by_offset,
+            {"offset": offset, "limit": limit, "comment_id": comment_id},
+        )
+    else:
+        results = session.scalars(
+            statements.select_comment_feedbacks.narrow(fields).by_offset,
+            {"offset": offset, "limit": limit},
         )
-    results = session.exec(statement)
     return results.all()
 
 
-def handle(
-    *,
+def _get_comment_feedbacks_by_cursor(
+    session: Session,
+    fields: Optional[FrozenSet[str]],
+    limit: int,
+    cursor_params: CursorParams,
     comment_id: Optional[int] = None,
-    offset: int = 0,
-    limit: int = Query(default=100, lte=100),
+) -> Tuple[List[comment_feedback.CommentFeedback], bool]:
+    """get rows next to the cursor, and whether more rows are beyond them"""
+    if comment_id:
+        return statements.select_comment_feedbacks_of_comment.narrow(
+            fields
+        ).get_rows_by_keyset(
+            session,
+            limit,
+            cursor_params.after_key,
+            cursor_params.before_key,
+            cursor_params.from_last,
+            comment_id=comment_id,
+        )
+    return statements.select_comment_feedbacks.narrow(fields).get_rows_by_keyset(
+        session,
+        limit,
+        cursor_params.after_key,
+        cursor_params.before_key,
+        cursor_params.from_last,
+    )
+
+
+def _get_etag(session: Session, comment_id: Optional[int], request: Request) -> str:
+    if comment_id:
+        keys = [
+            collection_versions.of_parent(
+                collection_versions.COMMENT_FEEDBACK, comment_id
+            )
+        ]
+    else:
+        keys = [collection_versions.COMMENT_FEEDBACK]
+    # the names of the users are rendered too
+    versions = collection_versions.get_versions(
+        session, [*keys, collection_versions.USER]
+    )
+    return get_etag(get_normalized_url(request), versions)
+
+
+def _handle(
+    session: Session,
+    etag: str,
+    fields: Optional[FrozenSet[str]],
+    comment_id: Optional[int],
+    offset: int,
+    limit: int,
+    cursor_params: CursorParams,
     request: Request,
-) -> GetCommentFeedbacksResponse:
-    with Session(engine) as session:
+) -> Response:
+    pagination: Union[Pagination, CursorPagination]
+    if cursor_params.is_given:
+        comment_feedbacks_to_read, has_more = _get_comment_feedbacks_by_cursor(
+            session, fields, limit, cursor_params, comment_id
+        )
+        pagination = get_cursor_pagination(
+            cursor_params,
+            [row.id for row in comment_feedbacks_to_read],
+            limit,
+            has_more,
+        )
+        links = get_links_for_cursor_pagination(pagination, request)
+    else:
         total = _get_total(session, comment_id)
         comment_feedbacks_to_read = _get_comment_feedbacks(
-            session, offset, limit, comment_id
-        )
-        return GetCommentFeedbacksResponse(
-            pagination=Pagination(offset=offset, limit=limit, total=total),
-            data=[
-                GetCommentFeedbacksResponse.Data(
-                    id=comment_feedback_to_read.id,
-                    like=comment_feedback_to_read.like,
-                    created_at=comment_feedback_to_read.created_at,
-                    updated_at=comment_feedback_to_read.updated_at,
-                    comment=GetCommentFeedbacksResponse.Data.Comment(
-                        id=comment_feedback_to_read.comment_id,
-                    ),
-                    user=GetCommentFeedbacksResponse.Data.User(
-                        id=comment_feedback_to_read.user_id,
-                        name=comment_feedback_to_read.user.name,
-                    ),
-                    links=[
-                        Link(
-                            rel="comment",
-                            href=f"{request.base_url}v1/comments/{comment_feedback_to_read.comment_id}",
-                        )
-                    ],
-                )
-                for comment_feedback_to_read in comment_feedbacks_to_read
-            ],
-            links=get_links_for_pagination(offset, limit, total, request),
+            session, fields, offset, limit, comment_id
         )
+        pagination = Pagination.construct(offset=offset, limit=limit, total=total)
+        links = get_links_for_pagination(offset, limit, total, request)
+    response = GetCommentFeedbacksResponse.construct(
+        pagination=pagination,
+        data=[
+            construct_fields(
+                GetCommentFeedbacksResponse.Data,
+                fields,
+                id=lambda: comment_feedback_to_read.id,
+                like=lambda: comment_feedback_to_read.like,
+                created_at=lambda: comment_feedback_to_read.created_at,
+                updated_at=lambda: comment_feedback_to_read.updated_at,
+                comment=lambda: GetCommentFeedbacksResponse.Data.Comment.construct(
+                    id=comment_feedback_to_read.comment_id,
+                ),
+                user=lambda: GetCommentFeedbacksResponse.Data.User.construct(
+                    id=comment_feedback_to_read.user_id,
+                    name=comment_feedback_to_read.user.name,
+                ),
+                links=lambda: comment_feedback_links.get_links(
+                    request.base_url, comment_id=comment_feedback_to_read.comment_id
+                ),
+            )
+            for comment_feedback_to_read in comment_feedbacks_to_read
+        ],
+        links=links,
+    )
+    return respond(response, fields, etag)
+
+
+async def handle(
+    *,
+    comment_id: Optional[int] = None,
+    offset: int = 0,
+    limit: int = Query(default=100, gt=0, le=100),
+    cursor_params: CursorParams = Depends(),
+    fields: Optional[FrozenSet[str]] = Depends(
+        SparseFields(GetCommentFeedbacksResponse.Data)
+    ),
+    request: Request,
+    session: AnySession = Depends(get_session),
+) -> Response:
+    return await read_through_list_cache(
+        session,
+        request,
+        functools.partial(_get_etag, comment_id=comment_id, request=request),
+        functools.partial(
+            _handle,
+            fields=fields,
+            comment_id=comment_id,
+            offset=offset,
+            limit=limit,
+            cursor_params=cursor_params,
+            request=request,
+        ),
+    )
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
 from src.api.v1.feedbacks.posts import (
     create_or_update_post_feedback,
     delete_post_feedback,
     get_post_feedbacks,
 )
+from src.instrumentation import QueryBudget
 
 router = APIRouter(prefix="/posts")
 
@@ -12,6 +13,7 @@ router.add_api_route(
     methods=["POST"],
     path="/{post_id}/{like_or_dislike}",
     endpoint=create_or_update_post_feedback.handle,
+    dependencies=[Depends(QueryBudget(8))],
     summary="게시글에 대한 피드백을 추가하거나 기존에 존재하는 경우 업데이트 합니다.",
     responses={
         status.HTTP_200_OK: {
@@ -28,6 +30,7 @@ router.add_api_route(
     methods=["GET"],
     path="/",
     endpoint=get_post_feedbacks.handle,
+    dependencies=[Depends(QueryBudget(4))],
     summary="게시글에 대한 피드백 목록을 조회합니다.",
     response_model=get_post_feedbacks.GetPostFeedbacksResponse,
 )
@@ -38,5 +41,6 @@ router.add_api_route(
     path="/{post_feedback_id}",
     endpoint=delete_post_feedback.handle,
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(QueryBudget(6))],
     summary="게시글에 대한 피드백을 삭제합니다.",
 )
@@ -5,7 +5,7 @@ from sqlmodel import Session, select
 
 from src.api.common import SchemaModel
 from src.api.v1.auth.utils import GetAuthorizedUser
-from src.database import engine
+from src.database import AnySession, get_session, run_in_session
 from src.models import post, user
 from src.models.feedbacks import post_feedback
 from src.models.utils import get_current_unix_timestamp
@@ -51,81 +51,91 @@ class UpdatePostFeedbackResponse(BaseResponse):
             title = "UpdatePostFeedbackResponse.Data"
 
 
-def handle(
+def _handle(
+    session: Session,
     post_id: int,
     like_or_dislike: Literal["like", "dislike"],
     response: Response,
-    current_user: user.User = Depends(
-        GetAuthorizedUser(allowed_roles=[user.Role.ADMIN, user.Role.COMMON])
-    ),
+    current_user: user.User,
 ) -> Union[CreatePostFeedbackResponse, UpdatePostFeedbackResponse]:
-    with Session(engine) as session:
-        existing_post = session.get(post.Post, post_id)
-        if not existing_post:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
-            )
-
-        statement = select(post_feedback.PostFeedback).where(
-            post_feedback.PostFeedback.post_id == existing_post.id,
-            post_feedback.PostFeedback.user_id == current_user.id,
+    existing_post = session.get(post.Post, post_id)
+    if not existing_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
-        results = session.exec(statement)
-        existing_post_feedback = results.first()
-
-        if existing_post_feedback:
-            if like_or_dislike == "like":
-                existing_post_feedback.like = True
-            else:
-                existing_post_feedback.like = False
-            existing_post_feedback.updated_at = get_current_unix_timestamp()
-            session.add(existing_post_feedback)
-            session.commit()
-            session.refresh(existing_post_feedback)
-
-            response.status_code = status.HTTP_200_OK
-            return UpdatePostFeedbackResponse(
-                data=UpdatePostFeedbackResponse.Data(
-                    id=existing_post_feedback.id,
-                    like=existing_post_feedback.like,
-                    created_at=existing_post_feedback.created_at,
-                    updated_at=existing_post_feedback.updated_at,
-                    post=UpdatePostFeedbackResponse.Data.Post(
-                        id=existing_post_feedback.post_id
-                    ),
-                    user=UpdatePostFeedbackResponse.Data.User(
-                        id=existing_post_feedback.user_id,
-                    ),
-                )
-            )
+
+    statement = select(post_feedback.PostFeedback).where(
+        post_feedback.PostFeedback.post_id == existing_post.id,
+        post_feedback.PostFeedback.user_id == current_user.id,
+    )
+    results = session.exec(statement)
+    existing_post_feedback = results.first()
+
+    if existing_post_feedback:
+        if like_or_dislike == "like":
+            existing_post_feedback.like = True
         else:
-            if like_or_dislike == "like":
-                like = True
-            else:
-                like = False
-            new_post_feedback = post_feedback.PostFeedback(
-                post_id=existing_post.id,
-                user_id=current_user.id,
-                like=like,
-                post=existing_post,
-                user=current_user,
+            existing_post_feedback.like = False
+        existing_post_feedback.updated_at = get_current_unix_timestamp()
+        session.add(existing_post_feedback)
+        session.commit()
+        session.refresh(existing_post_feedback)
+
+        response.status_code = status.HTTP_200_OK
+        return UpdatePostFeedbackResponse(
+            data=UpdatePostFeedbackResponse.Data(
+                id=existing_post_feedback.id,
+                like=existing_post_feedback.like,
+                created_at=existing_post_feedback.created_at,
+                updated_at=existing_post_feedback.updated_at,
+                post=UpdatePostFeedbackResponse.Data.Post(
+                    id=existing_post_feedback.post_id
+                ),
+                user=UpdatePostFeedbackResponse.Data.User(
+                    id=existing_post_feedback.user_id,
+                ),
             )
-            session.add(new_post_feedback)
-            session.commit()
-            session.refresh(new_post_feedback)
-
-            response.status_code = status.HTTP_201_CREATED
-            return CreatePostFeedbackResponse(
-                data=CreatePostFeedbackResponse.Data(
-                    id=new_post_feedback.id,
-                    like=new_post_feedback.like,
-                    created_at=new_post_feedback.created_at,
-                    updated_at=new_post_feedback.updated_at,
-                    post=UpdatePostFeedbackResponse.Data.Post(
-                        id=new_post_feedback.post_id
-                    ),
-                    user=UpdatePostFeedbackResponse.Data.User(
-                        id=new_post_feedback.user_id,
-                    ),
-                )
+        )
+    else:
+        if like_or_dislike == "like":
+            like = True
+        else:
+            like = False
+        new_post_feedback = post_feedback.PostFeedback(
+            post_id=existing_post.id,
+            user_id=current_user.id,
+            like=like,
+            post=existing_post,
+            user=current_user,
+        )
+        session.add(new_post_feedback)
+        session.commit()
+        session.refresh(new_post_feedback)
+
+        response.status_code = status.HTTP_201_CREATED
+        return CreatePostFeedbackResponse(
+            data=CreatePostFeedbackResponse.Data(
+                id=new_post_feedback.id,
+                like=new_post_feedback.like,
+                created_at=new_post_feedback.created_at,
+                updated_at=new_post_feedback.updated_at,
+                post=UpdatePostFeedbackResponse.Data.Post(id=new_post_feedback.post_id),
+                user=UpdatePostFeedbackResponse.Data.User(
+                    id=new_post_feedback.user_id,
+                ),
             )
+        )
+
+
+async def handle(
+    post_id: int,
+    like_or_dislike: Literal["like", "dislike"],
+    response: Response,
+    current_user: user.User = Depends(
+        GetAuthorizedUser(allowed_roles=[user.Role.ADMIN, user.Role.COMMON])
+    ),
+    session: AnySession = Depends(get_session),
+) -> Union[CreatePostFeedbackResponse, UpdatePostFeedbackResponse]:
+    return await run_in_session(
+        session, _handle, post_id, like_or_dislike, response, current_user
+    )
@@ -1,11 +1,28 @@
-from typing import List, Optional
-
-from fastapi import Query, Request
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, func, select
-
-from src.api.common import Link, Pagination, SchemaModel, get_links_for_pagination
-from src.database import engine
+import functools
+from typing import FrozenSet, List, Optional, Tuple, Union
+
+from fastapi import Depends, Query, Request, Response
+from sqlmodel import Session
+
+from src import collection_versions, row_counts, statements
+from src.api.common import (
+    CursorPagination,
+    CursorParams,
+    Link,
+    Pagination,
+    SchemaModel,
+    SparseFields,
+    construct_fields,
+    get_cursor_pagination,
+    get_etag,
+    get_links_for_cursor_pagination,
+    get_links_for_pagination,
+    get_normalized_url,
+    respond,
+)
+from src.api.response_cache import read_through_list_cache
+from src.api.v1.links import post_feedback_links
+from src.database import AnySession, get_session
 from src.models import post, user
 from src.models.feedbacks import post_feedback
 
@@ -37,71 +54,167 @@ class GetPostFeedbacksResponse(SchemaModel):
         class Config:
             title = "GetPostFeedbacksResponse.Data"
 
-    pagination: Pagination
+    pagination: Union[Pagination, CursorPagination]
     data: List[Data]
     links: List[Link]
 
 
 def _get_total(session: Session, post_id: Optional[int] = None) -> int:
     """get total count of rows for pagination"""
-    statement = select([func.count(post_feedback.PostFeedback.id)])
     if post_id:
-        statement = statement.where(post_feedback.PostFeedback.post_id == post_id)
-    return session.exec(statement).one()  # type: ignore
+        return row_counts.get_count(session, row_counts.post_feedbacks, post_id)
+    return row_counts.get_count(session, row_counts.post_feedbacks)
 
 
 def _get_post_feedbacks(
-    session: Session, offset: int, limit: int, post_id: Optional[int] = None
+    session: Session,
+    fields: Optional[FrozenSet[str]],
+    offset: int,
+    limit: int,
+    post_id: Optional[int] = None,
 ) -> List[post_feedback.PostFeedback]:
     """get all rows"""
-    statement = (
-        select(post_feedback.PostFeedback)
-        .order_by(post_feedback.PostFeedback.id)
-        .offset(offset)
-        .limit(limit)
-        .options(
-            selectinload(post_feedback.PostFeedback.user),
+    if post_id:
+        results = session.scalars(
+            statements.select_post_feedbacks_of_post.narrow(fields).by_offset,
+            {"offset": offset, "limit": limit, "post_id": post_id},
         )
+    else:
+        results = session.scalars(
+            statements.select_post_feedbacks.narrow(fields).by_offset,
+            {"offset": offset, "limit": limit},
+        )
+    return results.all()
+
+
+def _get_post_feedbacks_by_cursor(
+    session: Session,
+    fields: Optional[FrozenSet[str]],
+    limit: int,
+    cursor_params: CursorParams,
+    post_id: Optional[int] = None,
+) -> Tuple[List[post_feedback.PostFeedback], bool]:
+    """get rows next to the cursor, and whether more rows are beyond them"""
+    if post_id:
+        return statements.select_post_feedbacks_of_post.narrow(
+            fields
+        ).get_rows_by_keyset(
+            session,
+            limit,
+            cursor_params.after_key,
+            cursor_params.before_key,
+            cursor_params.from_last,
+            post_id=post_id,
+        )
+    return statements.select_post_feedbacks.narrow(fields).get_rows_by_keyset(
+        session,
+        limit,
+        cursor_params.after_key,
+        cursor_params.before_key,
+        cursor_params.from_last,
+    )
+
+
+def get_data(
+    post_feedback_to_read: post_feedback.PostFeedback,
+    fields: Optional[FrozenSet[str]],
+    request: Request,
+) -> GetPostFeedbacksResponse.Data:
+    """get the item of `post_feedback_to_read` of the `fields`"""
+    return construct_fields(
+        GetPostFeedbacksResponse.Data,
+        fields,
+        id=lambda: post_feedback_to_read.id,
+        like=lambda: post_feedback_to_read.like,
+        created_at=lambda: post_feedback_to_read.created_at,
+        updated_at=lambda: post_feedback_to_read.updated_at,
+        post=lambda: GetPostFeedbacksResponse.Data.Post.construct(
+            id=post_feedback_to_read.post_id
+        ),
+        user=lambda: GetPostFeedbacksResponse.Data.User.construct(
+            id=post_feedback_to_read.user_id,
+            name=post_feedback_to_read.user.name,
+        ),
+        links=lambda: post_feedback_links.get_links(
+            request.base_url, post_id=post_feedback_to_read.post_id
+        ),
     )
+
+
+def _get_etag(session: Session, post_id: Optional[int], request: Request) -> str:
     if post_id:
-        statement = statement.where(post_feedback.PostFeedback.post_id == post_id)
-    results = session.exec(statement)
-    return results.all()
+        keys = [
+            collection_versions.of_parent(collection_versions.POST_FEEDBACK, post_id)
+        ]
+    else:
+        keys = [collection_versions.POST_FEEDBACK]
+    # the names of the users are rendered too
+    versions = collection_versions.get_versions(
+        session, [*keys, collection_versions.USER]
+    )
+    return get_etag(get_normalized_url(request), versions)
 
 
-def handle(
+def _handle(
+    session: Session,
+    etag: str,
+    fields: Optional[FrozenSet[str]],
+    post_id: Optional[int],
+    offset: int,
+    limit: int,
+    cursor_params: CursorParams,
+    request: Request,
+) -> Response:
+    pagination: Union[Pagination, CursorPagination]
+    if cursor_params.is_given:
+        post_feedbacks_to_read, has_more = _get_post_feedbacks_by_cursor(
+            session, fields, limit, cursor_params, post_id
+        )
+        pagination = get_cursor_pagination(
+            cursor_params, [row.id for row in post_feedbacks_to_read], limit, has_more
+        )
+        links = get_links_for_cursor_pagination(pagination, request)
+    else:
+        total = _get_total(session, post_id)
+        post_feedbacks_to_read = _get_post_feedbacks(
+            session, fields, offset, limit, post_id
+        )
+        pagination = Pagination.construct(offset=offset, limit=limit, total=total)
+        links = get_links_for_pagination(offset, limit, total, request)
+    response = GetPostFeedbacksResponse.construct(
+        pagination=pagination,
+        data=[
+            get_data(post_feedback_to_read, fields, request)
+            for post_feedback_to_read in post_feedbacks_to_read
+        ],
+        links=links,
+    )
+    return respond(response, fields, etag)
+
+
+async def handle(
     *,
     post_id: Optional[int] = None,
     offset: int = 0,
-    limit: int = Query(default=100, lte=100),
+    limit: int = Query(default=100, gt=0, le=100),
+    cursor_params: CursorParams = Depends(),
+    fields: Optional[FrozenSet[str]] = Depends(
+        SparseFields(GetPostFeedbacksResponse.Data)
+    ),
     request: Request,
-) -> GetPostFeedbacksResponse:
-    with Session(engine) as session:
-        total = _get_total(session, post_id)
-        post_feedbacks_to_read = _get_post_feedbacks(session, offset, limit, post_id)
-        return GetPostFeedbacksResponse(
-            pagination=Pagination(offset=offset, limit=limit, total=total),
-            data=[
-                GetPostFeedbacksResponse.Data(
-                    id=post_feedback_to_read.id,
-                    like=post_feedback_to_read.like,
-                    created_at=post_feedback_to_read.created_at,
-                    updated_at=post_feedback_to_read.updated_at,
-                    post=GetPostFeedbacksResponse.Data.Post(
-                        id=post_feedback_to_read.post_id
-                    ),
-                    user=GetPostFeedbacksResponse.Data.User(
-                        id=post_feedback_to_read.user_id,
-                        name=post_feedback_to_read.user.name,
-                    ),
-                    links=[
-                        Link(
-                            rel="post",
-                            href=f"{request.base_url}v1/posts/{post_feedback_to_read.post_id}",
-                        )
-                    ],
-                )
-                for post_feedback_to_read in post_feedbacks_to_read
-            ],
-            links=get_links_for_pagination(offset, limit, total, request),
-        )
+    session: AnySession = Depends(get_session),
+) -> Response:
+    return await read_through_list_cache(
+        session,
+        request,
+        functools.partial(_get_etag, post_id=post_id, request=request),
+        functools.partial(
+            _handle,
+            fields=fields,
+            post_id=post_id,
+            offset=offset,
+            limit=limit,
+            cursor_params=cursor_params,
+            request=request,
+        ),
+    )
@@ -0,0 +1,14 @@
+from src.api.common import LinkTemplates
+
+post_links = LinkTemplates(
+    {
+        "self": "v1/posts/{id}",
+        "comments": "v1/comments?post_id={id}",
+        "feedbacks": "v1/feedbacks/posts?post_id={id}",
+    }
+)
+comment_links = LinkTemplates(
+    {"self": "v1/comments/{id}", "post": "v1/posts/{post_id}"}
+)
+post_feedback_links = LinkTemplates({"post": "v1/posts/{post_id}"})
+comment_feedback_links = LinkTemplates({"comment": "v1/comments/{comment_id}"})
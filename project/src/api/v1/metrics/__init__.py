@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, status
+
+from src.api.v1.auth.utils import GetAuthorizedUser
+from src.api.v1.metrics import (
+    read_pool_metrics,
+    read_response_cache_metrics,
+    read_statement_cache_metrics,
+)
+from src.instrumentation import QueryBudget
+from src.models.user import Role
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(GetAuthorizedUser(allowed_roles=[Role.ADMIN]))],
+)
+
+router.add_api_route(
+    methods=["GET"],
+    path="/pool",
+    endpoint=read_pool_metrics.handle,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(1))],
+    summary="DB 커넥션 풀 통계를 조회합니다.",
+    response_model=read_pool_metrics.ReadPoolMetricsResponse,
+)
+
+router.add_api_route(
+    methods=["GET"],
+    path="/statement-cache",
+    endpoint=read_statement_cache_metrics.handle,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(1))],
+    summary="컴파일된 SQL 문 캐시 통계를 조회합니다.",
+    response_model=read_statement_cache_metrics.ReadStatementCacheMetricsResponse,
+)
+
+router.add_api_route(
+    methods=["GET"],
+    path="/response-cache",
+    endpoint=read_response_cache_metrics.handle,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(1))],
+    summary="게시물, 댓글 응답 캐시 통계를 조회합니다.",
+    response_model=read_response_cache_metrics.ReadResponseCacheMetricsResponse,
+)
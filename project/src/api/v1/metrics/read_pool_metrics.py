@@ -0,0 +1,33 @@
+from typing import List
+
+from fastapi import Request
+
+from src.api.common import Link, SchemaModel
+from src.database import pool_statistics
+
+
+class ReadPoolMetricsResponse(SchemaModel):
+    class Data(SchemaModel):
+        name: str
+        pool_class: str
+        status: str
+        connects: int
+        checkouts: int
+        checked_out: int
+        peak_checked_out: int
+
+        class Config:
+            title = "ReadPoolMetricsResponse.Data"
+
+    data: List[Data]
+    links: List[Link]
+
+
+async def handle(request: Request) -> ReadPoolMetricsResponse:
+    return ReadPoolMetricsResponse(
+        data=[
+            ReadPoolMetricsResponse.Data(name=name, **statistics.to_dict())
+            for name, statistics in pool_statistics.items()
+        ],
+        links=[Link(rel="self", href=str(request.url))],
+    )
@@ -0,0 +1,35 @@
+from typing import List
+
+from fastapi import Request
+
+from src.api.common import Link, SchemaModel
+from src.api.response_cache import response_caches
+
+
+class ReadResponseCacheMetricsResponse(SchemaModel):
+    class Data(SchemaModel):
+        name: str
+        backend: str
+        size: int
+        maxsize: int
+        hits: int
+        misses: int
+        evictions: int
+        expirations: int
+        invalidations: int
+
+        class Config:
+            title = "ReadResponseCacheMetricsResponse.Data"
+
+    data: List[Data]
+    links: List[Link]
+
+
+def handle(request: Request) -> ReadResponseCacheMetricsResponse:
+    return ReadResponseCacheMetricsResponse(
+        data=[
+            ReadResponseCacheMetricsResponse.Data(name=name, **cache.to_dict())
+            for name, cache in response_caches.items()
+        ],
+        links=[Link(rel="self", href=str(request.url))],
+    )
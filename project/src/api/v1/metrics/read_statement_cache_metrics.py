@@ -0,0 +1,31 @@
+from typing import List
+
+from fastapi import Request
+
+from src.api.common import Link, SchemaModel
+from src.database import statement_cache_statistics
+
+
+class ReadStatementCacheMetricsResponse(SchemaModel):
+    class Data(SchemaModel):
+        name: str
+        size: int
+        hits: int
+        misses: int
+        uncached: int
+
+        class Config:
+            title = "ReadStatementCacheMetricsResponse.Data"
+
+    data: List[Data]
+    links: List[Link]
+
+
+async def handle(request: Request) -> ReadStatementCacheMetricsResponse:
+    return ReadStatementCacheMetricsResponse(
+        data=[
+            ReadStatementCacheMetricsResponse.Data(name=name, **statistics.to_dict())
+            for name, statistics in statement_cache_statistics.items()
+        ],
+        links=[Link(rel="self", href=str(request.url))],
+    )
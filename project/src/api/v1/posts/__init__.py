@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
 from src.api.v1.posts import (
     create_post,
@@ -8,6 +8,7 @@ from src.api.v1.posts import (
     read_posts,
     update_post,
 )
+from src.instrumentation import QueryBudget
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
@@ -16,6 +17,7 @@ router.add_api_route(
     path="/",
     endpoint=create_post.handle,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(QueryBudget(5))],
     summary="게시글을 추가합니다.",
 )
 router.add_api_route(
@@ -23,22 +25,27 @@ router.add_api_route(
     path="/",
     endpoint=read_posts.handle,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(6))],
     summary="게시글 목록을 조회합니다.",
     response_model=read_posts.ReadPostsResponse,
+    response_model_exclude_unset=True,
 )
 router.add_api_route(
     methods=["GET"],
     path="/{post_id}",
     endpoint=read_post.handle,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(5))],
     summary="게시글을 조회합니다.",
     response_model=read_post.ReadPostResponse,
+    response_model_exclude_unset=True,
 )
 router.add_api_route(
     methods=["PUT"],
     path="/{post_id}",
     endpoint=update_post.handle,
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(QueryBudget(5))],
     summary="게시글 전체를 수정합니다.",
 )
 router.add_api_route(
@@ -46,6 +53,7 @@ router.add_api_route(
     path="/{post_id}",
     endpoint=patch_post.handle,
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(QueryBudget(5))],
     summary="게시글 일부를 수정합니다.",
 )
 router.add_api_route(
@@ -53,5 +61,6 @@ router.add_api_route(
     path="/{post_id}",
     endpoint=delete_post.handle,
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(QueryBudget(7))],
     summary="게시글을 삭제합니다.",
 )
@@ -3,7 +3,7 @@ from sqlmodel import Session
 
 from src.api.common import SchemaModel
 from src.api.v1.auth.utils import GetAuthorizedUser
-from src.database import engine
+from src.database import AnySession, get_session, run_in_session
 from src.models import post, user
 
 
@@ -12,22 +12,31 @@ class CreatePostReqeust(SchemaModel):
     content: str = post.content_field
 
 
-def handle(
+def _handle(
+    session: Session,
+    request: CreatePostReqeust,
+    current_user: user.User,
+    response: Response,
+) -> None:
+    new_post = post.Post(
+        title=request.title,
+        content=request.content,
+        user_id=current_user.id,
+        user=current_user,
+    )
+    session.add(new_post)
+    session.commit()
+    session.refresh(new_post)
+    response.headers["Location"] = f"/v1/posts/{new_post.id}"
+
+
+async def handle(
     *,
     request: CreatePostReqeust,
     current_user: user.User = Depends(
         GetAuthorizedUser(allowed_roles=[user.Role.ADMIN, user.Role.COMMON])
     ),
     response: Response,
+    session: AnySession = Depends(get_session),
 ) -> None:
-    with Session(engine) as session:
-        new_post = post.Post(
-            title=request.title,
-            content=request.content,
-            user_id=current_user.id,
-            user=current_user,
-        )
-        session.add(new_post)
-        session.commit()
-        session.refresh(new_post)
-        response.headers["Location"] = f"/v1/posts/{new_post.id}"
+    await run_in_session(session, _handle, request, current_user, response)
@@ -0,0 +1,135 @@
+"""`?expand=comments,feedbacks` of posts, embedding their first related items
+
+The related items of all the posts of a page are fetched by one statement
+per relation, with cursors to their following pages.
+"""
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query, Request, status
+from sqlalchemy.sql import Select
+from sqlmodel import Session
+
+from src import collection_versions, statements
+from src.api.common import CursorPagination, Link, SchemaModel, encode_cursor
+from src.api.v1.comments import read_comments
+from src.api.v1.comments.read_comment import ReadCommentResponse
+from src.api.v1.feedbacks.posts import get_post_feedbacks
+
+# relations, by the collections they render
+RELATIONS = {
+    "comments": collection_versions.COMMENT,
+    "feedbacks": collection_versions.POST_FEEDBACK,
+}
+
+
+class ExpandParams:
+    """relations of posts to embed, and the number of their first items to embed"""
+
+    def __init__(
+        self,
+        expand: Optional[str] = Query(
+            default=None, description="함께 응답할 관계 (comments, feedbacks)"
+        ),
+        expand_limit: int = Query(
+            default=5, gt=0, le=100, description="함께 응답할 관계의 항목 수"
+        ),
+    ) -> None:
+        relations = [relation.strip() for relation in (expand or "").split(",")]
+        relations = [relation for relation in relations if relation]
+        invalid_relations = [
+            relation for relation in relations if relation not in RELATIONS
+        ]
+        if invalid_relations:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid expand: {', '.join(invalid_relations)}",
+            )
+        self.relations: FrozenSet[str] = frozenset(relations)
+        self.collection_keys = [RELATIONS[relation] for relation in sorted(relations)]
+        self.limit = expand_limit
+
+
+class EmbeddedComments(SchemaModel):
+    data: List[ReadCommentResponse.Data]
+    pagination: CursorPagination
+    links: List[Link]
+
+
+class EmbeddedFeedbacks(SchemaModel):
+    data: List[get_post_feedbacks.GetPostFeedbacksResponse.Data]
+    pagination: CursorPagination
+    links: List[Link]
+
+
+class Embedded(SchemaModel):
+    comments: Optional[EmbeddedComments]
+    feedbacks: Optional[EmbeddedFeedbacks]
+
+
+def _get_rows_by_post_id(
+    session: Session, statement: Select, post_ids: List[Any], limit: int
+) -> Dict[Any, List[Any]]:
+    """get the first `limit` rows of each post, and one more if any beyond them"""
+    rows_by_post_id: Dict[Any, List[Any]] = {post_id: [] for post_id in post_ids}
+    rows = session.scalars(statement, {"parent_ids": post_ids, "limit": limit + 1})
+    for row in rows.unique():
+        rows_by_post_id[row.post_id].append(row)
+    return rows_by_post_id
+
+
+def get_embedded(
+    session: Session,
+    post_ids: List[Any],
+    expand_params: ExpandParams,
+    request: Request,
+) -> Dict[Any, Embedded]:
+    """get the first related items of each post, by one statement per relation"""
+    values: Dict[Any, Dict[str, Any]] = {post_id: {} for post_id in post_ids}
+    limit = expand_params.limit
+    relations: List[Tuple[str, Select, Callable[..., Any], Type[SchemaModel], str]]
+    relations = [
+        (
+            "comments",
+            statements.select_first_comments_of_posts,
+            read_comments.get_data,
+            EmbeddedComments,
+            "v1/comments",
+        ),
+        (
+            "feedbacks",
+            statements.select_first_post_feedbacks_of_posts,
+            get_post_feedbacks.get_data,
+            EmbeddedFeedbacks,
+            "v1/feedbacks/posts",
+        ),
+    ]
+    for relation, statement, get_data, model, path in relations:
+        if relation not in expand_params.relations or not post_ids:
+            continue
+        rows_by_post_id = _get_rows_by_post_id(session, statement, post_ids, limit)
+        for post_id, rows in rows_by_post_id.items():
+            href = f"{request.base_url}{path}?post_id={post_id}"
+            pagination = CursorPagination.construct(
+                limit=limit,
+                next_cursor=encode_cursor(rows[limit - 1].id)
+                if len(rows) > limit
+                else None,
+                prev_cursor=None,
+            )
+            links = [{"rel": "self", "href": f"{href}&limit={limit}"}]
+            if pagination.next_cursor:
+                links.append(
+                    {
+                        "rel": "next",
+                        "href": f"{href}&after={pagination.next_cursor}&limit={limit}",
+                    }
+                )
+            values[post_id][relation] = model.construct(
+                data=[get_data(row, None, request) for row in rows[:limit]],
+                pagination=pagination,
+                links=links,
+            )
+    return {
+        post_id: Embedded.construct(**values_of_post)
+        for post_id, values_of_post in values.items()
+    }
@@ -1,10 +1,23 @@
-from typing import List
+from typing import Any, List, Optional, Tuple
 
-from fastapi import HTTPException, Request, status
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import joinedload
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
-from src.api.common import Link, SchemaModel
-from src.database import engine
+from src import collection_versions, statements
+from src.api.common import (
+    Link,
+    SchemaModel,
+    get_etag,
+    get_normalized_url,
+    is_not_modified,
+    not_modified,
+    respond,
+)
+from src.api.response_cache import get_response, is_cacheable, post_cache, set_response
+from src.api.v1.posts.expand import Embedded, ExpandParams, get_embedded
+from src.database import AnySession, get_session, is_bound_to_replica, run_in_session
 from src.models import post, user
 from src.models.post import Post
 
@@ -24,7 +37,17 @@ class ReadPostResponse(SchemaModel):
             class Config:
                 title = "ReadPostResponse.Data.User"
 
+        class NumOf(SchemaModel):
+            likes: int
+            dislikes: int
+            comments: int
+
+            class Config:
+                title = "ReadPostResponse.Data.NumOf"
+
         user: User
+        num_of: NumOf
+        embedded: Optional[Embedded]
 
         class Config:
             title = "ReadPostResponse.Data"
@@ -33,37 +56,105 @@ class ReadPostResponse(SchemaModel):
     links: List[Link]
 
 
-def handle(post_id: int, request: Request) -> ReadPostResponse:
-    with Session(engine) as session:
-        post_to_read = session.get(Post, post_id)
-        if not post_to_read:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
-            )
-        return ReadPostResponse(
-            data=ReadPostResponse.Data(
-                id=post_to_read.id,
-                title=post_to_read.title,
-                content=post_to_read.content,
-                created_at=post_to_read.created_at,
-                updated_at=post_to_read.updated_at,
-                user=ReadPostResponse.Data.User(
-                    id=post_to_read.user.id,
-                    name=post_to_read.user.name,
-                ),
-            ),
-            links=[
-                Link(
-                    rel="self",
-                    href=str(request.url),
-                ),
-                Link(
-                    rel="comments",
-                    href=f"{request.base_url}v1/comments?post_id={post_id}",
-                ),
-                Link(
-                    rel="feedbacks",
-                    href=f"{request.base_url}v1/feedbacks/posts?post_id={post_id}",
-                ),
-            ],
+def _get_version(post_: Any, user_version: int) -> Tuple[Any, ...]:
+    """get the version of a post, or of a row of `statements.select_post_version`
+
+    The counts are included, since they are updated without bumping `version`,
+    and so is the version of the author, whose name is rendered too.
+    """
+    return (
+        post_.version,
+        post_.like_count,
+        post_.dislike_count,
+        post_.comment_count,
+        user_version,
+    )
+
+
+def _handle(
+    session: Session, post_id: int, expand_params: ExpandParams, request: Request
+) -> Response:
+    versions = collection_versions.get_versions(session, expand_params.collection_keys)
+    url = get_normalized_url(request)
+    if "if-none-match" in request.headers:
+        version = session.execute(
+            statements.select_post_version, {"id": post_id}
+        ).first()
+        if version is not None:
+            etag = get_etag(url, _get_version(version, version.user_version), versions)
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+    post_to_read = session.get(Post, post_id, options=[joinedload(Post.user)])
+    if not post_to_read:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
+    data = ReadPostResponse.Data.construct(
+        id=post_to_read.id,
+        title=post_to_read.title,
+        content=post_to_read.content,
+        created_at=post_to_read.created_at,
+        updated_at=post_to_read.updated_at,
+        user=ReadPostResponse.Data.User.construct(
+            id=post_to_read.user.id,
+            name=post_to_read.user.name,
+        ),
+        num_of=ReadPostResponse.Data.NumOf.construct(
+            likes=post_to_read.like_count,
+            dislikes=post_to_read.dislike_count,
+            comments=post_to_read.comment_count,
+        ),
+    )
+    if expand_params.relations:
+        data.embedded = get_embedded(session, [post_id], expand_params, request)[
+            post_id
+        ]
+    etag = get_etag(
+        url, _get_version(post_to_read, post_to_read.user.version), versions
+    )
+    response = ReadPostResponse.construct(
+        data=data,
+        links=[
+            Link.construct(
+                rel="self",
+                href=url,
+            ),
+            Link.construct(
+                rel="comments",
+                href=f"{request.base_url}v1/comments?post_id={post_id}",
+            ),
+            Link.construct(
+                rel="feedbacks",
+                href=f"{request.base_url}v1/feedbacks/posts?post_id={post_id}",
+            ),
+        ],
+    )
+    return respond(response, etag=etag)
+
+
+async def handle(
+    post_id: int,
+    request: Request,
+    expand_params: ExpandParams = Depends(),
+    session: AnySession = Depends(get_session),
+) -> Response:
+    # the embedded rows are not invalidated by the writes to them
+    if expand_params.relations or not is_cacheable():
+        return await run_in_session(session, _handle, post_id, expand_params, request)
+    cached_response = await run_in_threadpool(
+        get_response, post_cache, post_id, request
+    )
+    if cached_response is not None:
+        return cached_response
+    generation = post_cache.generation
+    response = await run_in_session(session, _handle, post_id, expand_params, request)
+    await run_in_threadpool(
+        set_response,
+        post_cache,
+        post_id,
+        request,
+        response,
+        generation,
+        is_bound_to_replica(session),
+    )
+    return response
@@ -1,11 +1,29 @@
-from typing import List
-
-from fastapi import Query, Request
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, func, select
-
-from src.api.common import Link, Pagination, SchemaModel, get_links_for_pagination
-from src.database import engine
+import functools
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from fastapi import Depends, Query, Request, Response
+from sqlmodel import Session
+
+from src import collection_versions, row_counts, statements
+from src.api.common import (
+    CursorPagination,
+    CursorParams,
+    Link,
+    Pagination,
+    SchemaModel,
+    SparseFields,
+    construct_fields,
+    get_cursor_pagination,
+    get_etag,
+    get_links_for_cursor_pagination,
+    get_links_for_pagination,
+    get_normalized_url,
+    respond,
+)
+from src.api.response_cache import read_through_list_cache
+from src.api.v1.links import post_links
+from src.api.v1.posts.expand import Embedded, ExpandParams, get_embedded
+from src.database import AnySession, get_session
 from src.models import post, user
 
 
@@ -35,93 +53,143 @@ class ReadPostsResponse(SchemaModel):
 
         user: User
         num_of: NumOf
+        embedded: Optional[Embedded]
 
         class Config:
             title = "ReadPostsResponse.Data"
 
-    pagination: Pagination
+    pagination: Union[Pagination, CursorPagination]
     data: List[Data]
     links: List[Link]
 
 
 def _get_total(session: Session) -> int:
     """get total count of rows for pagination"""
-    statement = select([func.count(post.Post.id)])
-    return session.exec(statement).one()  # type: ignore
+    return row_counts.get_count(session, row_counts.posts)
 
 
-def _get_posts(session: Session, offset: int, limit: int) -> List[post.Post]:
+def _get_posts(
+    session: Session, fields: Optional[FrozenSet[str]], offset: int, limit: int
+) -> List[post.Post]:
     """get all rows"""
-    statement = (
-        select(post.Post)
-        .order_by(post.Post.id)
-        .offset(offset)
-        .limit(limit)
-        .options(
-            selectinload(post.Post.user),
-            selectinload(post.Post.comments),
-            selectinload(post.Post.feedbacks),
-        )
+    results = session.scalars(
+        statements.select_posts.narrow(fields).by_offset,
+        {"offset": offset, "limit": limit},
     )
-    results = session.exec(statement)
     return results.all()
 
 
-def handle(
-    *,
-    offset: int = 0,
-    limit: int = Query(default=100, lte=100),
+def _get_posts_by_cursor(
+    session: Session,
+    fields: Optional[FrozenSet[str]],
+    limit: int,
+    cursor_params: CursorParams,
+) -> Tuple[List[post.Post], bool]:
+    """get rows next to the cursor, and whether more rows are beyond them"""
+    return statements.select_posts.narrow(fields).get_rows_by_keyset(
+        session,
+        limit,
+        cursor_params.after_key,
+        cursor_params.before_key,
+        cursor_params.from_last,
+    )
+
+
+def _get_etag(session: Session, expand_params: ExpandParams, request: Request) -> str:
+    # the names of the users are rendered too
+    versions = collection_versions.get_versions(
+        session,
+        [
+            collection_versions.POST,
+            collection_versions.USER,
+            *expand_params.collection_keys,
+        ],
+    )
+    return get_etag(get_normalized_url(request), versions)
+
+
+def _handle(
+    session: Session,
+    etag: str,
+    fields: Optional[FrozenSet[str]],
+    expand_params: ExpandParams,
+    offset: int,
+    limit: int,
+    cursor_params: CursorParams,
     request: Request,
-) -> ReadPostsResponse:
-    with Session(engine) as session:
+) -> Response:
+    pagination: Union[Pagination, CursorPagination]
+    if cursor_params.is_given:
+        posts_to_read, has_more = _get_posts_by_cursor(
+            session, fields, limit, cursor_params
+        )
+        pagination = get_cursor_pagination(
+            cursor_params, [row.id for row in posts_to_read], limit, has_more
+        )
+        links = get_links_for_cursor_pagination(pagination, request)
+    else:
         total = _get_total(session)
-        posts_to_read = _get_posts(session, offset, limit)
-        return ReadPostsResponse(
-            pagination=Pagination(offset=offset, limit=limit, total=total),
-            data=[
-                ReadPostsResponse.Data(
-                    id=post_to_read.id,
-                    title=post_to_read.title,
-                    content=post_to_read.content,
-                    created_at=post_to_read.created_at,
-                    updated_at=post_to_read.updated_at,
-                    user=ReadPostsResponse.Data.User(
-                        id=post_to_read.user.id,
-                        name=post_to_read.user.name,
-                    ),
-                    num_of=ReadPostsResponse.Data.NumOf(
-                        likes=len(
-                            [
-                                feedback
-                                for feedback in post_to_read.feedbacks
-                                if feedback.like
-                            ]
-                        ),
-                        dislikes=len(
-                            [
-                                feedback
-                                for feedback in post_to_read.feedbacks
-                                if not feedback.like
-                            ]
-                        ),
-                        comments=len(post_to_read.comments),
-                    ),
-                    links=[
-                        Link(
-                            rel="self",
-                            href=f"{request.base_url}v1/posts/{post_to_read.id}",
-                        ),
-                        Link(
-                            rel="comments",
-                            href=f"{request.base_url}v1/comments?post_id={post_to_read.id}",
-                        ),
-                        Link(
-                            rel="feedbacks",
-                            href=f"{request.base_url}v1/feedbacks/posts?post_id={post_to_read.id}",
-                        ),
-                    ],
-                )
-                for post_to_read in posts_to_read
-            ],
-            links=get_links_for_pagination(offset, limit, total, request),
+        posts_to_read = _get_posts(session, fields, offset, limit)
+        pagination = Pagination.construct(offset=offset, limit=limit, total=total)
+        links = get_links_for_pagination(offset, limit, total, request)
+    embedded: Dict[Any, Embedded] = {}
+    if expand_params.relations:
+        embedded = get_embedded(
+            session, [row.id for row in posts_to_read], expand_params, request
         )
+    response = ReadPostsResponse.construct(
+        pagination=pagination,
+        data=[
+            construct_fields(
+                ReadPostsResponse.Data,
+                fields,
+                id=lambda: post_to_read.id,
+                title=lambda: post_to_read.title,
+                content=lambda: post_to_read.content,
+                created_at=lambda: post_to_read.created_at,
+                updated_at=lambda: post_to_read.updated_at,
+                user=lambda: ReadPostsResponse.Data.User.construct(
+                    id=post_to_read.user.id,
+                    name=post_to_read.user.name,
+                ),
+                num_of=lambda: ReadPostsResponse.Data.NumOf.construct(
+                    likes=post_to_read.like_count,
+                    dislikes=post_to_read.dislike_count,
+                    comments=post_to_read.comment_count,
+                ),
+                links=lambda: post_links.get_links(
+                    request.base_url, id=post_to_read.id
+                ),
+                embedded=(lambda: embedded[post_to_read.id]) if embedded else None,
+            )
+            for post_to_read in posts_to_read
+        ],
+        links=links,
+    )
+    return respond(response, fields, etag)
+
+
+async def handle(
+    *,
+    offset: int = 0,
+    limit: int = Query(default=100, gt=0, le=100),
+    cursor_params: CursorParams = Depends(),
+    fields: Optional[FrozenSet[str]] = Depends(SparseFields(ReadPostsResponse.Data)),
+    expand_params: ExpandParams = Depends(),
+    request: Request,
+    session: AnySession = Depends(get_session),
+) -> Response:
+    return await read_through_list_cache(
+        session,
+        request,
+        functools.partial(_get_etag, expand_params=expand_params, request=request),
+        functools.partial(
+            _handle,
+            fields=fields,
+            expand_params=expand_params,
+            offset=offset,
+            limit=limit,
+            cursor_params=cursor_params,
+            request=request,
+        ),
+    )
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, status
 
 from src.api.v1.auth.utils import GetAuthorizedUser
 from src.api.v1.users import get_me, read_users
+from src.instrumentation import QueryBudget
 from src.models.user import Role
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -11,7 +12,10 @@ router.add_api_route(
     path="/",
     endpoint=read_users.handle,
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(GetAuthorizedUser(allowed_roles=[Role.ADMIN]))],
+    dependencies=[
+        Depends(GetAuthorizedUser(allowed_roles=[Role.ADMIN])),
+        Depends(QueryBudget(4)),
+    ],
     summary="유저 목록을 조회합니다.",
     response_model=read_users.ReadUsersResponse,
 )
@@ -21,6 +25,7 @@ router.add_api_route(
     path="/me",
     endpoint=get_me.handle,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(QueryBudget(1))],
     summary="현재 로그인된 유저를 조회합니다.",
     response_model=get_me.GetMeResponse,
 )
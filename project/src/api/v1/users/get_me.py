@@ -19,7 +19,7 @@ class GetMeResponse(SchemaModel):
     links: List[Link]
 
 
-def handle(
+async def handle(
     *, current_user: user.User = Depends(get_current_user), request: Request
 ) -> GetMeResponse:
     return GetMeResponse(
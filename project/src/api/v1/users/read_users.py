@@ -1,10 +1,27 @@
-from typing import List
+import functools
+from typing import FrozenSet, List, Optional, Tuple, Union
 
-from fastapi import Query, Request
-from sqlmodel import Session, func, select
+from fastapi import Depends, Query, Request, Response
+from sqlmodel import Session
 
-from src.api.common import Link, Pagination, SchemaModel, get_links_for_pagination
-from src.database import engine
+from src import collection_versions, row_counts, statements
+from src.api.common import (
+    CursorPagination,
+    CursorParams,
+    Link,
+    Pagination,
+    SchemaModel,
+    SparseFields,
+    construct_fields,
+    get_cursor_pagination,
+    get_etag,
+    get_links_for_cursor_pagination,
+    get_links_for_pagination,
+    get_normalized_url,
+    respond,
+)
+from src.api.response_cache import read_through_list_cache
+from src.database import AnySession, get_session
 from src.models import user
 
 
@@ -16,38 +33,106 @@ class ReadUsersResponse(SchemaModel):
         class Config:
             title = "ReadUsersResponse.Data"
 
-    pagination: Pagination
+    pagination: Union[Pagination, CursorPagination]
     data: List[Data]
     links: List[Link]
 
 
 def _get_total(session: Session) -> int:
     """get total count of rows for pagination"""
-    statement = select([func.count(user.User.id)])
-    return session.exec(statement).one()  # type: ignore
+    return row_counts.get_count(session, row_counts.users)
 
 
-def _get_users(session: Session, offset: int, limit: int) -> List[user.User]:
+def _get_users(
+    session: Session, fields: Optional[FrozenSet[str]], offset: int, limit: int
+) -> List[user.User]:
     """get all rows"""
-    statement = select(user.User).order_by(user.User.id).offset(offset).limit(limit)
-    results = session.exec(statement)
+    results = session.scalars(
+        statements.select_users.narrow(fields).by_offset,
+        {"offset": offset, "limit": limit},
+    )
     return results.all()
 
 
-def handle(
-    *, offset: int = 0, limit: int = Query(default=100, lte=100), request: Request
-) -> ReadUsersResponse:
-    with Session(engine) as session:
-        total = _get_total(session)
-        users_to_read = _get_users(session, offset, limit)
-        return ReadUsersResponse(
-            pagination=Pagination(offset=offset, limit=limit, total=total),
-            data=[
-                ReadUsersResponse.Data(
-                    id=user_.id,
-                    name=user_.name,
-                )
-                for user_ in users_to_read
-            ],
-            links=get_links_for_pagination(offset, limit, total, request),
+def _get_users_by_cursor(
+    session: Session,
+    fields: Optional[FrozenSet[str]],
+    limit: int,
+    cursor_params: CursorParams,
+) -> Tuple[List[user.User], bool]:
+    """get rows next to the cursor, and whether more rows are beyond them"""
+    return statements.select_users.narrow(fields).get_rows_by_keyset(
+        session,
+        limit,
+        cursor_params.after_key,
+        cursor_params.before_key,
+        cursor_params.from_last,
+    )
+
+
+def _get_etag(session: Session, request: Request) -> str:
+    versions = collection_versions.get_versions(session, [collection_versions.USER])
+    return get_etag(get_normalized_url(request), versions)
+
+
+def _handle(
+    session: Session,
+    etag: str,
+    fields: Optional[FrozenSet[str]],
+    offset: int,
+    limit: int,
+    cursor_params: CursorParams,
+    request: Request,
+) -> Response:
+    pagination: Union[Pagination, CursorPagination]
+    if cursor_params.is_given:
+        users_to_read, has_more = _get_users_by_cursor(
+            session, fields, limit, cursor_params
         )
+        pagination = get_cursor_pagination(
+            cursor_params, [row.id for row in users_to_read], limit, has_more
+        )
+        links = get_links_for_cursor_pagination(pagination, request)
+    else:
+        total = _get_total(session)
+        users_to_read = _get_users(session, fields, offset, limit)
+        pagination = Pagination.construct(offset=offset, limit=limit, total=total)
+        links = get_links_for_pagination(offset, limit, total, request)
+    response = ReadUsersResponse.construct(
+        pagination=pagination,
+        data=[
+            construct_fields(
+                ReadUsersResponse.Data,
+                fields,
+                id=lambda: user_.id,
+                name=lambda: user_.name,
+            )
+            for user_ in users_to_read
+        ],
+        links=links,
+    )
+    return respond(response, fields, etag)
+
+
+async def handle(
+    *,
+    offset: int = 0,
+    limit: int = Query(default=100, gt=0, le=100),
+    cursor_params: CursorParams = Depends(),
+    fields: Optional[FrozenSet[str]] = Depends(SparseFields(ReadUsersResponse.Data)),
+    request: Request,
+    session: AnySession = Depends(get_session)
+) -> Response:
+    return await read_through_list_cache(
+        session,
+        request,
+        functools.partial(_get_etag, request=request),
+        functools.partial(
+            _handle,
+            fields=fields,
+            offset=offset,
+            limit=limit,
+            cursor_params=cursor_params,
+            request=request,
+        ),
+    )
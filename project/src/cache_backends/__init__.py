@@ -0,0 +1,75 @@
+"""backends of the caches, which keep bytes by keys in namespaces until a TTL
+
+The response and user caches keep their entries in the backend of
+`CACHE__BACKEND`:
+
+- `memory`: an LRU per namespace in the process, for a single worker
+- `sqlite`: a SQLite file at `CACHE__SQLITE_PATH` shared by the workers of a host
+- `redis`: a Redis server at `CACHE__REDIS_URL`, spoken to by its protocol
+
+The shared backends keep no copy in the process, so an invalidation deletes
+the entries of every worker at once.
+"""
+import abc
+from collections import Counter
+from typing import Iterable, Optional
+
+from src import config
+
+
+class CacheBackend(abc.ABC):
+    """store of bytes by string keys in namespaces, each entry expiring after a TTL
+
+    Entries are evicted beyond `maxsize` per namespace where the store can tell,
+    and the evictions and expirations it sees are counted per namespace.
+    """
+
+    name: str
+
+    def __init__(self) -> None:
+        self.evictions: Counter = Counter()
+        self.expirations: Counter = Counter()
+
+    @abc.abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        """get the value of `key`, or None if missing or expired"""
+
+    @abc.abstractmethod
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: bytes,
+        ttl_seconds: float,
+        maxsize: Optional[int] = None,
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        pass
+
+    @abc.abstractmethod
+    def clear(self, namespace: str) -> None:
+        """delete all the entries of `namespace`"""
+
+    @abc.abstractmethod
+    def get_size(self, namespace: str) -> int:
+        pass
+
+
+def create_backend(cache_config: config.Cache) -> CacheBackend:
+    if cache_config.backend == "sqlite":
+        from src.cache_backends.sqlite import SQLiteBackend
+
+        return SQLiteBackend(cache_config.sqlite_path)
+    if cache_config.backend == "redis":
+        from src.cache_backends.redis import RedisBackend
+
+        return RedisBackend(cache_config.redis_url, cache_config.redis_timeout)
+    from src.cache_backends.memory import MemoryBackend
+
+    return MemoryBackend()
+
+
+cache_backend = create_backend(config.cache)
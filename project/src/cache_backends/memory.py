@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import DefaultDict, Iterable, Optional, Tuple
+
+from src.cache_backends import CacheBackend
+
+
+class MemoryBackend(CacheBackend):
+    """LRU per namespace in the process
+
+    Each worker has its own entries, and sees only its own invalidations.
+    """
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._namespaces: DefaultDict[
+            str, "OrderedDict[str, Tuple[float, bytes]]"
+        ] = defaultdict(OrderedDict)
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            entries = self._namespaces[namespace]
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del entries[key]
+                self.expirations[namespace] += 1
+                return None
+            entries.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: bytes,
+        ttl_seconds: float,
+        maxsize: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            entries = self._namespaces[namespace]
+            entries[key] = (time.monotonic() + ttl_seconds, value)
+            entries.move_to_end(key)
+            while maxsize is not None and len(entries) > maxsize:
+                entries.popitem(last=False)
+                self.evictions[namespace] += 1
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            entries = self._namespaces[namespace]
+            for key in keys:
+                entries.pop(key, None)
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._namespaces[namespace].clear()
+
+    def get_size(self, namespace: str) -> int:
+        return len(self._namespaces[namespace])
@@ -0,0 +1,193 @@
+import logging
+import socket
+import threading
+from typing import Any, Iterable, List, Optional, Union
+from urllib.parse import unquote, urlparse
+
+from src.cache_backends import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+RESPValue = Union[None, int, bytes, List[Any]]
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisConnection:
+    """connection speaking the Redis protocol (RESP2), for the few commands used"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int,
+        timeout: float,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+    ) -> None:
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._file = self._socket.makefile("rb")
+        try:
+            if password is not None:
+                credentials = [password] if username is None else [username, password]
+                self.execute(b"AUTH", *[value.encode() for value in credentials])
+            if db:
+                self.execute(b"SELECT", str(db).encode())
+        except (OSError, RedisError):
+            self.close()
+            raise
+
+    def execute(self, *args: bytes) -> RESPValue:
+        command = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            command.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._socket.sendall(b"".join(command))
+        return self._read()
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def _read(self) -> RESPValue:
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionResetError("Connection closed by the server")
+        prefix, rest = line[:1], line[1:-2]
+        if prefix == b"+":
+            return rest
+        if prefix == b"-":
+            raise RedisError(rest.decode())
+        if prefix == b":":
+            return int(rest)
+        if prefix == b"$":
+            length = int(rest)
+            if length == -1:
+                return None
+            return self._file.read(length + 2)[:-2]
+        if prefix == b"*":
+            length = int(rest)
+            if length == -1:
+                return None
+            return [self._read() for _ in range(length)]
+        raise RedisError(f"Unknown reply: {line!r}")
+
+
+class RedisBackend(CacheBackend):
+    """Redis server (or any server of its protocol), e.g. `redis://localhost:6379/0`
+
+    A password of the url, e.g. `redis://:password@localhost:6379/0`, is sent by
+    `AUTH` on each connection, with the username if any (an ACL user of Redis 6).
+    Keys are prefixed by their namespaces, and expire by Redis itself,
+    which also evicts by its `maxmemory-policy` rather than `maxsize`.
+    Each thread has its own connection. A failing server is logged and read
+    as misses, so that it does not fail the requests.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, timeout: float = 1.0) -> None:
+        super().__init__()
+        parsed_url = urlparse(url)
+        self.host = parsed_url.hostname or "localhost"
+        self.port = parsed_url.port or 6379
+        self.db = int(parsed_url.path.lstrip("/") or 0)
+        self.username = unquote(parsed_url.username) if parsed_url.username else None
+        self.password = (
+            unquote(parsed_url.password) if parsed_url.password is not None else None
+        )
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        value = self._execute(b"GET", self._get_key(namespace, key))
+        return value if isinstance(value, bytes) else None
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: bytes,
+        ttl_seconds: float,
+        maxsize: Optional[int] = None,
+    ) -> None:
+        ttl_milliseconds = str(max(int(ttl_seconds * 1000), 1)).encode()
+        self._execute(
+            b"SET", self._get_key(namespace, key), value, b"PX", ttl_milliseconds
+        )
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        redis_keys = [self._get_key(namespace, key) for key in keys]
+        if redis_keys:
+            self._execute(b"DEL", *redis_keys)
+
+    def clear(self, namespace: str) -> None:
+        for redis_keys in self._scan(namespace):
+            if redis_keys:
+                self._execute(b"DEL", *redis_keys)
+
+    def get_size(self, namespace: str) -> int:
+        return sum(len(redis_keys) for redis_keys in self._scan(namespace))
+
+    def _scan(self, namespace: str) -> Iterable[List[bytes]]:
+        pattern = self._get_key(namespace, "*")
+        cursor = b"0"
+        while True:
+            reply = self._execute(b"SCAN", cursor, b"MATCH", pattern, b"COUNT", b"1000")
+            if not isinstance(reply, list):
+                return
+            cursor, redis_keys = reply
+            yield redis_keys
+            if cursor == b"0":
+                return
+
+    @staticmethod
+    def _get_key(namespace: str, key: str) -> bytes:
+        return f"{namespace}:{key}".encode()
+
+    def _execute(self, *args: bytes) -> RESPValue:
+        """execute a command, reconnecting once if the connection was lost
+
+        A timeout is not retried, so a slow server delays a request by one
+        timeout at most, and its connection is closed since a late reply
+        would be read as that of the next command.
+        """
+        for attempt in range(2):
+            try:
+                return self._get_connection().execute(*args)
+            except (ConnectionResetError, ConnectionRefusedError) as error:
+                self._close_connection()
+                if attempt:
+                    logger.warning("Cache backend redis failed: %s", error)
+            except OSError as error:
+                self._close_connection()
+                logger.warning("Cache backend redis failed: %s", error)
+                return None
+            except RedisError as error:
+                logger.warning("Cache backend redis failed: %s", error)
+                return None
+        return None
+
+    def _get_connection(self) -> RedisConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = RedisConnection(
+                self.host,
+                self.port,
+                self.db,
+                self.timeout,
+                self.username,
+                self.password,
+            )
+            self._local.connection = connection
+        return connection
+
+    def _close_connection(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            try:
+                connection.close()
+            except OSError:
+                pass
+            self._local.connection = None
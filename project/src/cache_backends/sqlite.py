@@ -0,0 +1,132 @@
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Iterable, Optional
+
+from src.cache_backends import CacheBackend
+
+# sets of a namespace between the prunes of its expired and excess entries
+PRUNE_INTERVAL = 64
+
+
+class SQLiteBackend(CacheBackend):
+    """SQLite file shared by the workers of a host, without a server
+
+    Each thread has its own connection in autocommit mode, on a WAL journal
+    so that reads are not blocked by writes of other workers.
+    Entries beyond `maxsize` are evicted in order of writes, not of reads,
+    since a read does not write.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, busy_timeout: float = 5.0) -> None:
+        super().__init__()
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._num_of_sets: Counter = Counter()
+        connection = self._get_connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key)"
+            ") WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_expires_at"
+            " ON cache (namespace, expires_at)"
+        )
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at <= time.time():
+            self.expirations[namespace] += 1
+            return None
+        return value
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: bytes,
+        ttl_seconds: float,
+        maxsize: Optional[int] = None,
+    ) -> None:
+        connection = self._get_connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at)"
+            " VALUES (?, ?, ?, ?)",
+            (namespace, key, value, time.time() + ttl_seconds),
+        )
+        self._num_of_sets[namespace] += 1
+        if self._num_of_sets[namespace] % PRUNE_INTERVAL == 0:
+            self._prune(namespace, maxsize)
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        self._get_connection().executemany(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?",
+            [(namespace, key) for key in keys],
+        )
+
+    def clear(self, namespace: str) -> None:
+        self._get_connection().execute(
+            "DELETE FROM cache WHERE namespace = ?", (namespace,)
+        )
+
+    def get_size(self, namespace: str) -> int:
+        (size,) = (
+            self._get_connection()
+            .execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ? AND expires_at > ?",
+                (namespace, time.time()),
+            )
+            .fetchone()
+        )
+        return size
+
+    def _prune(self, namespace: str, maxsize: Optional[int]) -> None:
+        connection = self._get_connection()
+        cursor = connection.execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires_at <= ?",
+            (namespace, time.time()),
+        )
+        self.expirations[namespace] += cursor.rowcount
+        if maxsize is None:
+            return
+        # the entries of a namespace share a TTL, so they expire in order of writes
+        cursor = connection.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache WHERE namespace = ?"
+            " ORDER BY expires_at DESC LIMIT -1 OFFSET ?"
+            ")",
+            (namespace, namespace, maxsize),
+        )
+        self.evictions[namespace] += cursor.rowcount
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
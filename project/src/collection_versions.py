@@ -0,0 +1,91 @@
+"""versions of collections, bumped by writes to their tables
+
+The `collection_version` table keeps a version per table, bumped by a flush event
+of the session in the transaction which inserts, updates or deletes its rows.
+The rows of a parent, e.g. the comments of a post, are also versioned as a
+collection of their own, bumped only by the writes to them.
+A list page is versioned by the versions of the collections it renders, so its ETag
+changes whenever any of them is written.
+"""
+import functools
+from typing import Any, Dict, List, Tuple, Type
+
+from sqlalchemy import bindparam, event
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.sql import Insert
+from sqlmodel import Session, SQLModel
+
+from src import statements
+from src.models import comment, post, user
+from src.models.collection_version import CollectionVersion
+from src.models.feedbacks import comment_feedback, post_feedback
+from src.models.utils import get_table
+
+POST = get_table(post.Post).name
+COMMENT = get_table(comment.Comment).name
+POST_FEEDBACK = get_table(post_feedback.PostFeedback).name
+COMMENT_FEEDBACK = get_table(comment_feedback.CommentFeedback).name
+USER = get_table(user.User).name
+
+# collections changed by a write to a row of each model, including the parents
+# of which it changes the counts
+CHANGED_COLLECTIONS: Dict[Type[SQLModel], List[str]] = {
+    post.Post: [POST],
+    comment.Comment: [COMMENT, POST],
+    post_feedback.PostFeedback: [POST_FEEDBACK, POST],
+    comment_feedback.CommentFeedback: [COMMENT_FEEDBACK, COMMENT],
+    user.User: [USER],
+}
+
+
+# collections of the rows of each parent, by the columns of their parent ids
+PARENT_COLLECTIONS: Dict[Type[SQLModel], List[Tuple[str, str]]] = {
+    comment.Comment: [(COMMENT, "post_id")],
+    post_feedback.PostFeedback: [(POST_FEEDBACK, "post_id")],
+    comment_feedback.CommentFeedback: [(COMMENT_FEEDBACK, "comment_id")],
+}
+
+
+def of_parent(key: str, parent_id: Any) -> str:
+    """get the key of the collection of the rows of `key` of a parent"""
+    return f"{key}:{parent_id}"
+
+
+def get_versions(session: Session, keys: List[str]) -> Tuple[int, ...]:
+    """get the versions of the collections of `keys`, 0 if never written"""
+    if not keys:
+        return ()
+    versions = dict(
+        session.execute(statements.select_collection_versions, {"keys": keys}).all()
+    )
+    return tuple(versions.get(key, 0) for key in keys)
+
+
+@functools.lru_cache()
+def _get_upsert(dialect_name: str) -> Insert:
+    table = get_table(CollectionVersion)
+    values: Dict[str, Any] = {"key": bindparam("key"), "version": 1}
+    if dialect_name == "mysql":
+        statement = mysql.insert(table).values(values)
+        return statement.on_duplicate_key_update(version=table.c.version + 1)
+    insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}[dialect_name]
+    statement = insert(table).values(values)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.key], set_={"version": table.c.version + 1}
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_versions(session: Session, *args: Any) -> None:
+    rows = [*session.new, *session.dirty, *session.deleted]
+    keys = {key for row in rows for key in CHANGED_COLLECTIONS.get(type(row), [])}
+    keys.update(
+        of_parent(key, getattr(row, column))
+        for row in rows
+        for key, column in PARENT_COLLECTIONS.get(type(row), [])
+    )
+    if keys:
+        connection = session.connection()
+        connection.execute(
+            _get_upsert(connection.dialect.name), [{"key": key} for key in sorted(keys)]
+        )
@@ -1,15 +1,94 @@
+from typing import List, Literal, Optional
+
 from pydantic import BaseSettings, Field
 
 
 class DB(BaseSettings):
     url: str = Field(env="DB__SQLALCHEMY_URL")
     echo: bool = Field(env="DB__ECHO")
+    async_mode: bool = Field(default=False, env="DB__ASYNC_MODE")
+    pool_class: Optional[str] = Field(default=None, env="DB__POOL_CLASS")
+    pool_size: int = Field(default=5, env="DB__POOL_SIZE")
+    max_overflow: int = Field(default=10, env="DB__MAX_OVERFLOW")
+    pool_pre_ping: bool = Field(default=False, env="DB__POOL_PRE_PING")
+    pool_recycle: int = Field(default=-1, env="DB__POOL_RECYCLE")
+    pool_timeout: float = Field(default=30, env="DB__POOL_TIMEOUT")
+    replica_urls: List[str] = Field(default=[], env="DB__REPLICA_URLS")
+    replica_pin_seconds: int = Field(default=5, env="DB__REPLICA_PIN_SECONDS")
+    auto_migrate: bool = Field(default=True, env="DB__AUTO_MIGRATE")
+    sqlite_performance_profile: bool = Field(
+        default=True, env="DB__SQLITE_PERFORMANCE_PROFILE"
+    )
+    sqlite_journal_mode: Literal[
+        "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"
+    ] = Field(default="WAL", env="DB__SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = Field(
+        default="NORMAL", env="DB__SQLITE_SYNCHRONOUS"
+    )
+    sqlite_cache_size: int = Field(default=-64000, env="DB__SQLITE_CACHE_SIZE")
+    sqlite_mmap_size: int = Field(default=268435456, env="DB__SQLITE_MMAP_SIZE")
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = Field(
+        default="MEMORY", env="DB__SQLITE_TEMP_STORE"
+    )
+    sqlite_busy_timeout: int = Field(default=5000, env="DB__SQLITE_BUSY_TIMEOUT")
 
 
 class Auth(BaseSettings):
     jwt_secret_key: str = Field(env="AUTH__JWT_SECRET_KEY")
     jwt_algorithm: str = Field(env="AUTH__JWT_ALGORITHM")
+    user_cache_maxsize: int = Field(default=1024, env="AUTH__USER_CACHE_MAXSIZE")
+    user_cache_ttl_seconds: float = Field(
+        default=10, env="AUTH__USER_CACHE_TTL_SECONDS"
+    )
+    token_cache_maxsize: int = Field(default=4096, env="AUTH__TOKEN_CACHE_MAXSIZE")
+    token_cache_ttl_seconds: float = Field(
+        default=300, env="AUTH__TOKEN_CACHE_TTL_SECONDS"
+    )
+
+
+class API(BaseSettings):
+    trusted_output: bool = Field(default=True, env="API__TRUSTED_OUTPUT")
+
+
+class Compression(BaseSettings):
+    minimum_size: int = Field(default=500, env="COMPRESSION__MINIMUM_SIZE")
+    gzip_level: int = Field(default=6, ge=1, le=9, env="COMPRESSION__GZIP_LEVEL")
+    brotli_quality: int = Field(
+        default=4, ge=0, le=11, env="COMPRESSION__BROTLI_QUALITY"
+    )
+    cache_size: int = Field(default=256, env="COMPRESSION__CACHE_SIZE")
+
+
+class Cache(BaseSettings):
+    backend: Literal["memory", "sqlite", "redis"] = Field(
+        default="memory", env="CACHE__BACKEND"
+    )
+    sqlite_path: str = Field(default="cache.db", env="CACHE__SQLITE_PATH")
+    redis_url: str = Field(default="redis://localhost:6379/0", env="CACHE__REDIS_URL")
+    redis_timeout: float = Field(default=1.0, env="CACHE__REDIS_TIMEOUT")
+
+
+class ResponseCache(BaseSettings):
+    enabled: bool = Field(default=True, env="RESPONSE_CACHE__ENABLED")
+    maxsize: int = Field(default=1024, env="RESPONSE_CACHE__MAXSIZE")
+    ttl_seconds: float = Field(default=60, env="RESPONSE_CACHE__TTL_SECONDS")
+    list_maxsize: int = Field(default=1024, env="RESPONSE_CACHE__LIST_MAXSIZE")
+    list_ttl_seconds: float = Field(default=300, env="RESPONSE_CACHE__LIST_TTL_SECONDS")
+
+
+class Instrumentation(BaseSettings):
+    n_plus_one_threshold: int = Field(
+        default=3, env="INSTRUMENTATION__N_PLUS_ONE_THRESHOLD"
+    )
+    strict_query_budget: bool = Field(
+        default=False, env="INSTRUMENTATION__STRICT_QUERY_BUDGET"
+    )
 
 
 db = DB()
 auth = Auth()
+api = API()
+compression = Compression()
+cache = Cache()
+response_cache = ResponseCache()
+instrumentation = Instrumentation()
@@ -1,16 +1,372 @@
-from sqlmodel import SQLModel, create_engine, pool
+import itertools
+import threading
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from fastapi import Request
+from sqlalchemy import event, pool
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from src import config
 
-engine = create_engine(
-    url=config.db.url,
-    echo=config.db.echo,
-    connect_args={
-        "check_same_thread": False,
-    },
-    poolclass=pool.StaticPool,
+T = TypeVar("T")
+E = TypeVar("E", Engine, AsyncEngine)
+
+# key of the session info of the I/O deferred by `run_off_event_loop`
+_DEFERRED_IO = "deferred_io"
+
+ASYNC_DRIVERNAMES = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def get_async_url(url: str) -> URL:
+    """get url which uses the async driver of the dialect"""
+    url_ = make_url(url)
+    return url_.set(drivername=ASYNC_DRIVERNAMES[url_.get_backend_name()])
+
+
+def _is_sqlite_in_memory(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _get_pool_class(url: URL, db_config: config.DB, is_async: bool) -> Type[pool.Pool]:
+    """get pool class from config, or the appropriate one for the dialect"""
+    if db_config.pool_class:
+        pool_class = getattr(pool, db_config.pool_class)
+    elif _is_sqlite_in_memory(url):
+        # every connection to in-memory sqlite is a new database, so share one
+        pool_class = pool.StaticPool
+    else:
+        # `SingletonThreadPool` is not used for file sqlite, since it closes
+        # connections of other threads, still in use, once threads outnumber
+        # its size. Queued connections are never shared between threads either.
+        pool_class = pool.QueuePool
+    if is_async and pool_class in (pool.QueuePool, pool.SingletonThreadPool):
+        pool_class = pool.AsyncAdaptedQueuePool
+    return pool_class
+
+
+def _get_engine_kwargs(
+    url: URL, db_config: config.DB, is_async: bool
+) -> Dict[str, Any]:
+    pool_class = _get_pool_class(url, db_config, is_async)
+    kwargs: Dict[str, Any] = {
+        "echo": db_config.echo,
+        "poolclass": pool_class,
+        "pool_pre_ping": db_config.pool_pre_ping,
+        "pool_recycle": db_config.pool_recycle,
+    }
+    if url.get_backend_name() == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if issubclass(pool_class, (pool.QueuePool, pool.SingletonThreadPool)):
+        kwargs["pool_size"] = db_config.pool_size
+    if issubclass(pool_class, pool.QueuePool):
+        kwargs["max_overflow"] = db_config.max_overflow
+        kwargs["pool_timeout"] = db_config.pool_timeout
+    return kwargs
+
+
+def get_sqlite_pragmas(db_config: config.DB) -> Dict[str, Any]:
+    """get pragmas of the sqlite performance profile"""
+    return {
+        "journal_mode": db_config.sqlite_journal_mode,
+        "synchronous": db_config.sqlite_synchronous,
+        # negative size is in KiB, not in pages
+        "cache_size": db_config.sqlite_cache_size,
+        "mmap_size": db_config.sqlite_mmap_size,
+        "temp_store": db_config.sqlite_temp_store,
+        "busy_timeout": db_config.sqlite_busy_timeout,
+    }
+
+
+def _apply_sqlite_performance_profile(
+    engine_: Engine, url: URL, db_config: config.DB
+) -> None:
+    """set the pragmas on every new connection of a sqlite engine"""
+    if url.get_backend_name() != "sqlite" or not db_config.sqlite_performance_profile:
+        return
+    pragmas = get_sqlite_pragmas(db_config)
+
+    @event.listens_for(engine_, "connect")
+    def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def create_engine_from_config(
+    db_config: config.DB, url: Optional[str] = None
+) -> Engine:
+    """create engine of `url` (defaults to `db_config.url`) configured by `db_config`"""
+    url_ = make_url(url or db_config.url)
+    engine_ = create_engine(url_, **_get_engine_kwargs(url_, db_config, is_async=False))
+    _apply_sqlite_performance_profile(engine_, url_, db_config)
+    return engine_
+
+
+def create_async_engine_from_config(
+    db_config: config.DB, url: Optional[str] = None
+) -> AsyncEngine:
+    """create async engine of `url` (defaults to `db_config.url`) configured by `db_config`"""
+    url_ = get_async_url(url or db_config.url)
+    async_engine_ = create_async_engine(
+        url_, **_get_engine_kwargs(url_, db_config, is_async=True)
+    )
+    _apply_sqlite_performance_profile(async_engine_.sync_engine, url_, db_config)
+    return async_engine_
+
+
+class PoolStatistics:
+    """live statistics of the connection pool of an engine"""
+
+    def __init__(self, engine_: Engine) -> None:
+        self._pool = engine_.pool
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        event.listen(engine_, "connect", self._on_connect)
+        event.listen(engine_, "checkout", self._on_checkout)
+        event.listen(engine_, "checkin", self._on_checkin)
+
+    def _on_connect(self, *args: Any) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, *args: Any) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, *args: Any) -> None:
+        with self._lock:
+            self.checked_out -= 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pool_class": type(self._pool).__name__,
+            "status": self._pool.status(),
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+        }
+
+
+class StatementCacheStatistics:
+    """live statistics of the compiled statement cache of an engine"""
+
+    def __init__(self, engine_: Engine) -> None:
+        # private to Engine, so it is not in the SQLAlchemy stubs
+        self._compiled_cache: Optional[Any] = getattr(engine_, "_compiled_cache")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        event.listen(engine_, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: Any,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        with self._lock:
+            if context.cache_hit is CACHE_HIT:
+                self.hits += 1
+            elif context.cache_hit is CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._compiled_cache or ()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+        }
+
+
+class RoutingState:
+    """whether sessions of the current request should stick to the primary"""
+
+    def __init__(self, pinned: bool = False) -> None:
+        self.pinned = pinned
+        self.has_written = False
+
+
+_routing_state: ContextVar[Optional[RoutingState]] = ContextVar(
+    "routing_state", default=None
 )
 
 
-def create_db_and_tables() -> None:
-    SQLModel.metadata.create_all(engine)
+def set_routing_state(state: RoutingState) -> None:
+    _routing_state.set(state)
+
+
+def is_pinned_to_primary() -> bool:
+    """whether the current request reads its own writes from the primary"""
+    state = _routing_state.get()
+    return state is not None and state.pinned
+
+
+def mark_written() -> None:
+    """pin the current request to the primary so it reads its own writes"""
+    state = _routing_state.get()
+    if state is not None:
+        state.pinned = True
+        state.has_written = True
+
+
+class SessionRouter(Generic[E]):
+    """route writes to the primary engine and reads to the replica engines"""
+
+    def __init__(self, primary: E, replicas: List[E]) -> None:
+        self.primary: E = primary
+        self.replicas: List[E] = replicas
+        self._replica_cycle: Iterator[E] = itertools.cycle(replicas)
+
+    def get_engine(self, read_only: bool = False) -> E:
+        state = _routing_state.get()
+        if not read_only or not self.replicas or (state and state.pinned):
+            return self.primary
+        return next(self._replica_cycle)
+
+
+engine = create_engine_from_config(config.db)
+replica_engines = [
+    create_engine_from_config(config.db, url) for url in config.db.replica_urls
+]
+session_router = SessionRouter(engine, replica_engines)
+
+async_engine: Optional[AsyncEngine] = None
+async_session_router: Optional[SessionRouter[AsyncEngine]] = None
+if config.db.async_mode:
+    async_engine = create_async_engine_from_config(config.db)
+    async_session_router = SessionRouter(
+        async_engine,
+        [
+            create_async_engine_from_config(config.db, url)
+            for url in config.db.replica_urls
+        ],
+    )
+
+engines: Dict[str, Engine] = {"primary": engine}
+for i, replica_engine in enumerate(replica_engines):
+    engines[f"replica_{i}"] = replica_engine
+if async_session_router is not None:
+    engines["primary_async"] = async_session_router.primary.sync_engine
+    for i, async_replica_engine in enumerate(async_session_router.replicas):
+        engines[f"replica_{i}_async"] = async_replica_engine.sync_engine
+
+pool_statistics = {name: PoolStatistics(engine_) for name, engine_ in engines.items()}
+statement_cache_statistics = {
+    name: StatementCacheStatistics(engine_) for name, engine_ in engines.items()
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_written_after_flush(*args: Any) -> None:
+    mark_written()
+
+
+AnySession = Union[Session, AsyncSession]
+
+
+def has_replicas() -> bool:
+    """whether reads are routed to replicas, which may lag behind the primary"""
+    return bool(session_router.replicas)
+
+
+def is_bound_to_replica(session: AnySession) -> bool:
+    """whether `session` reads from a replica, which may lag behind the primary"""
+    if isinstance(session, AsyncSession):
+        return (
+            async_session_router is not None
+            and session.bind in async_session_router.replicas
+        )
+    return session.bind in session_router.replicas
+
+
+async def get_session(request: Request) -> AsyncIterator[AnySession]:
+    """yield one session per request as its unit of work
+
+    The session is bound to a replica on GET requests, otherwise to the primary.
+    It is an `AsyncSession` on async mode, and a sync `Session` otherwise.
+    """
+    read_only = request.method in ("GET", "HEAD")
+    if async_session_router is not None:
+        async with AsyncSession(async_session_router.get_engine(read_only)) as session:
+            yield session
+    else:
+        sync_session = Session(session_router.get_engine(read_only))
+        try:
+            yield sync_session
+        finally:
+            await run_in_threadpool(sync_session.close)
+
+
+async def run_in_session(
+    session: AnySession, fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """run `fn(session, *args, **kwargs)` without blocking the event loop
+
+    On async mode, `fn` runs on the event loop through `AsyncSession.run_sync`
+    and every query is awaited by the async driver.
+    Otherwise, `fn` runs on the threadpool with the sync `Session`.
+    """
+    if isinstance(session, AsyncSession):
+        deferred_io = session.sync_session.info.setdefault(_DEFERRED_IO, [])
+        try:
+            return await session.run_sync(fn, *args, **kwargs)
+        finally:
+            del session.sync_session.info[_DEFERRED_IO]
+            if deferred_io:
+                await run_in_threadpool(_run_all, deferred_io)
+    return await run_in_threadpool(fn, session, *args, **kwargs)
+
+
+def run_off_event_loop(session: Session, fn: Callable[[], None]) -> None:
+    """run the blocking I/O `fn` of an event of `session` off the event loop
+
+    On async mode, the events of a session run on the event loop within
+    `run_in_session`, which then runs `fn` on the threadpool before it returns.
+    Otherwise, `fn` runs right away on the thread of the session.
+    """
+    deferred_io = session.info.get(_DEFERRED_IO)
+    if deferred_io is not None:
+        deferred_io.append(fn)
+    else:
+        fn()
+
+
+def _run_all(fns: List[Callable[[], None]]) -> None:
+    for fn in fns:
+        fn()
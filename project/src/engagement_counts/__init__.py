@@ -0,0 +1,162 @@
+"""denormalized engagement counts
+
+The like, dislike and comment counts of posts and the like and dislike counts of
+comments are kept on their rows, so they are read with zero extra work.
+They are updated in the transaction which inserts, updates or deletes
+the comments and feedbacks, by a flush event of the session,
+and checked or repaired by `python -m src.engagement_counts check [--fix]`.
+"""
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, event, func, inspect, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import attributes
+from sqlmodel import Session, SQLModel
+
+from src.models import comment, post
+from src.models.feedbacks import comment_feedback, post_feedback
+from src.statements import PaginatedStatements
+
+
+class EngagementCounter:
+    """count column of a parent, counting its rows of a child (with `like` if given)"""
+
+    def __init__(
+        self, count_column: Any, parent_id_column: Any, like: Optional[bool] = None
+    ) -> None:
+        self.count_column = count_column
+        self.parent_id_column = parent_id_column
+        self.like = like
+        self.parent_model = count_column.class_
+        self.model = parent_id_column.class_
+        table = self.parent_model.__table__
+        self.add_count = (
+            update(table)
+            .where(table.c.id == bindparam("parent_id"))
+            .values({count_column.key: table.c[count_column.key] + bindparam("delta")})
+        )
+        self.set_count = (
+            update(table)
+            .where(table.c.id == bindparam("parent_id"))
+            .values({count_column.key: bindparam("count")})
+        )
+        actual_count = select(func.count()).where(
+            parent_id_column == self.parent_model.id
+        )
+        if like is not None:
+            actual_count = actual_count.where(self.model.like == like)
+        self.select_counts = PaginatedStatements(
+            select(
+                self.parent_model.id,
+                count_column,
+                actual_count.scalar_subquery().label("actual_count"),
+            ),
+            self.parent_model.id,
+        )
+
+    def is_counted(self, row: SQLModel, before_flush: bool = False) -> bool:
+        if self.like is None:
+            return True
+        history = inspect(row).attrs.like.history
+        if before_flush and history.deleted:
+            return history.deleted[0] == self.like
+        return getattr(row, "like") == self.like
+
+    def get_delta(self, session: Session, row: SQLModel) -> int:
+        """get the delta of the count by the flush of `row`"""
+        was_counted = row not in session.new and self.is_counted(row, True)
+        is_counted = row not in session.deleted and self.is_counted(row)
+        return int(is_counted) - int(was_counted)
+
+
+ENGAGEMENT_COUNTERS = [
+    EngagementCounter(post.Post.like_count, post_feedback.PostFeedback.post_id, True),
+    EngagementCounter(
+        post.Post.dislike_count, post_feedback.PostFeedback.post_id, False
+    ),
+    EngagementCounter(post.Post.comment_count, comment.Comment.post_id),
+    EngagementCounter(
+        comment.Comment.like_count, comment_feedback.CommentFeedback.comment_id, True
+    ),
+    EngagementCounter(
+        comment.Comment.dislike_count,
+        comment_feedback.CommentFeedback.comment_id,
+        False,
+    ),
+]
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_engagements(session: Session, *args: Any) -> None:
+    rows = [*session.new, *session.dirty, *session.deleted]
+    for engagement_counter in ENGAGEMENT_COUNTERS:
+        deltas: Counter = Counter()
+        for row in rows:
+            if isinstance(row, engagement_counter.model):
+                parent_id = getattr(row, engagement_counter.parent_id_column.key)
+                deltas[parent_id] += engagement_counter.get_delta(session, row)
+        deltas = Counter({key: delta for key, delta in deltas.items() if delta})
+        if not deltas:
+            continue
+        session.connection().execute(
+            engagement_counter.add_count,
+            [
+                {"parent_id": parent_id, "delta": delta}
+                for parent_id, delta in deltas.items()
+            ],
+        )
+        # keep the counts of the parents loaded in the session up to date
+        key = engagement_counter.count_column.key
+        for parent_id, delta in deltas.items():
+            parent = session.identity_map.get(
+                inspect(engagement_counter.parent_model).identity_key_from_primary_key(
+                    [parent_id]
+                )
+            )
+            if parent is not None and key in parent.__dict__:
+                attributes.set_committed_value(
+                    parent, key, parent.__dict__[key] + delta
+                )
+
+
+def check(
+    engine: Engine, fix: bool = False, batch_size: int = 1000
+) -> Dict[Tuple[str, Any, str], Tuple[int, int]]:
+    """get the stored and the actual counts drifted from the rows, and fix them if `fix`
+
+    The counts are recomputed in batches of `batch_size` parents,
+    each in its own transaction.
+    """
+    drift = {}
+    for engagement_counter in ENGAGEMENT_COUNTERS:
+        after, has_more = None, True
+        while has_more:
+            with Session(engine) as session:
+                rows, has_more = engagement_counter.select_counts.get_rows_by_keyset(
+                    session, batch_size, after
+                )
+                drifted_rows = [
+                    (parent_id, count, actual_count)
+                    for parent_id, count, actual_count in rows
+                    if count != actual_count
+                ]
+                if fix and drifted_rows:
+                    session.connection().execute(
+                        engagement_counter.set_count,
+                        [
+                            {"parent_id": parent_id, "count": actual_count}
+                            for parent_id, _, actual_count in drifted_rows
+                        ],
+                    )
+                    session.commit()
+            for parent_id, count, actual_count in drifted_rows:
+                key = (
+                    engagement_counter.parent_model.__tablename__,
+                    parent_id,
+                    engagement_counter.count_column.key,
+                )
+                drift[key] = (count, actual_count)
+            if rows:
+                after = rows[-1][0]
+    return drift
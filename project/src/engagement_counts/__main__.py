@@ -0,0 +1,32 @@
+import argparse
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src import engagement_counts
+from src.api import app  # noqa: F401 for registering all models
+from src.database import engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.engagement_counts")
+    parser.add_argument("command", choices=["check"])
+    parser.add_argument("--fix", action="store_true", help="fix the drifted counts")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    drift = engagement_counts.check(engine, args.fix, args.batch_size)
+    for (table_name, id_, column_name), (stored, actual) in sorted(drift.items()):
+        print(f"{table_name}:{id_}:{column_name}: {stored} -> {actual}")
+    if args.fix:
+        print(f"Fixed {len(drift)} counts")
+    elif drift:
+        print(f"Found {len(drift)} drifted counts")
+        sys.exit(1)
+    else:
+        print("No drifted counts")
+
+
+if __name__ == "__main__":
+    main()
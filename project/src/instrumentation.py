@@ -0,0 +1,108 @@
+"""per-request SQL instrumentation
+
+Every statement executed while handling a request is recorded to the
+`QueryStatistics` of the request, which is set by
+`src.api.middlewares.instrument_queries`.
+"""
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper
+
+from src import config
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStatistics:
+    """statements executed while handling a request"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.statements: Counter = Counter()
+        self.budget: Optional[int] = None
+
+    def record(self, statement: str, duration: float, rows: int) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.rows += rows
+            self.statements[statement] += 1
+
+    def add_rows(self, rows: int) -> None:
+        with self._lock:
+            self.rows += rows
+
+    def get_n_plus_one(self) -> Dict[str, int]:
+        """get statements repeated with the same shape, as N+1 query patterns"""
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= config.instrumentation.n_plus_one_threshold
+        }
+
+    def is_over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+
+_query_statistics: ContextVar[Optional[QueryStatistics]] = ContextVar(
+    "query_statistics", default=None
+)
+
+
+def set_query_statistics(statistics: QueryStatistics) -> None:
+    _query_statistics.set(statistics)
+
+
+class QueryBudget:
+    """declare the maximum number of statements a request of an endpoint executes
+
+    Add it to the dependencies of an endpoint, e.g.
+    `dependencies=[Depends(QueryBudget(2))]`.
+    """
+
+    def __init__(self, max_queries: int) -> None:
+        self.max_queries = max_queries
+
+    def __call__(self) -> None:
+        statistics = _query_statistics.get()
+        if statistics is not None:
+            statistics.budget = self.max_queries
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn: Any, *args: Any) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    duration = time.perf_counter() - conn.info["query_started_at"].pop()
+    statistics = _query_statistics.get()
+    if statistics is not None:
+        # rows of SELECT are counted when they are loaded, see `_count_loaded_row`
+        statistics.record(statement, duration, max(cursor.rowcount, 0))
+
+
+@event.listens_for(Mapper, "load")
+def _count_loaded_row(*args: Any) -> None:
+    statistics = _query_statistics.get()
+    if statistics is not None:
+        statistics.add_rows(1)
@@ -0,0 +1,80 @@
+"""versioned schema migrations
+
+Every module of `src.migrations.versions` upgrades the schema by one version
+through its `upgrade(connection)`, and the current version is kept in
+the `schema_version` table.
+"""
+from types import ModuleType
+from typing import List
+
+from sqlalchemy import Column, Integer, MetaData, Table, delete, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from src.migrations.versions import (
+    v0001_create_tables,
+    v0002_add_foreign_key_indexes,
+    v0003_add_row_counts,
+    v0004_add_engagement_counts,
+    v0005_add_collection_versions,
+    v0006_add_row_versions,
+)
+
+MIGRATIONS: List[ModuleType] = [
+    v0001_create_tables,
+    v0002_add_foreign_key_indexes,
+    v0003_add_row_counts,
+    v0004_add_engagement_counts,
+    v0005_add_collection_versions,
+    v0006_add_row_versions,
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+schema_version_table = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, nullable=False),
+)
+
+
+class SchemaVersionError(Exception):
+    pass
+
+
+def get_schema_version(connection: Connection) -> int:
+    inspector = inspect(connection)
+    if inspector.has_table(schema_version_table.name):
+        return connection.execute(select(schema_version_table.c.version)).scalar_one()
+    if inspector.has_table("post"):
+        # created by `SQLModel.metadata.create_all` before migrations existed
+        return v0001_create_tables.version
+    return 0
+
+
+def _set_schema_version(connection: Connection, version: int) -> None:
+    schema_version_table.create(connection, checkfirst=True)
+    connection.execute(delete(schema_version_table))
+    connection.execute(schema_version_table.insert().values(version=version))
+
+
+def upgrade(engine: Engine) -> List[int]:
+    """apply pending migrations one by one, and get applied versions"""
+    with engine.connect() as connection:
+        current_version = get_schema_version(connection)
+    applied_versions = []
+    for migration in MIGRATIONS:
+        if migration.version <= current_version:
+            continue
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            _set_schema_version(connection, migration.version)
+        applied_versions.append(migration.version)
+    return applied_versions
+
+
+def check_schema_version(engine: Engine) -> None:
+    with engine.connect() as connection:
+        current_version = get_schema_version(connection)
+    if current_version != LATEST_VERSION:
+        raise SchemaVersionError(
+            f"Schema version is {current_version}, but {LATEST_VERSION} is required"
+        )
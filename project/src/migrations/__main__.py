@@ -0,0 +1,24 @@
+import argparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src import migrations
+from src.database import engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.migrations")
+    parser.add_argument("command", choices=["upgrade", "current"])
+    args = parser.parse_args()
+    if args.command == "upgrade":
+        applied_versions = migrations.upgrade(engine)
+        print(f"Applied versions: {applied_versions}")
+    with engine.connect() as connection:
+        current_version = migrations.get_schema_version(connection)
+    print(f"Current version: {current_version} (latest: {migrations.LATEST_VERSION})")
+
+
+if __name__ == "__main__":
+    main()
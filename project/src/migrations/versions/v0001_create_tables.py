@@ -0,0 +1,62 @@
+"""create tables of users, posts, comments and feedbacks"""
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+version = 1
+
+metadata = MetaData()
+
+Table(
+    "user",
+    metadata,
+    Column("id", String(50), primary_key=True),
+    Column("name", String(50), nullable=False),
+    Column("password", String, nullable=False),
+    Column("role", String),
+    Column("created_at", Integer),
+    Column("updated_at", Integer),
+)
+Table(
+    "post",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String(100), nullable=False),
+    Column("user_id", String, ForeignKey("user.id"), nullable=False),
+    Column("content", String, nullable=False),
+    Column("created_at", Integer),
+    Column("updated_at", Integer),
+)
+Table(
+    "comment",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("post_id", Integer, ForeignKey("post.id"), nullable=False),
+    Column("user_id", String, ForeignKey("user.id"), nullable=False),
+    Column("content", String(300), nullable=False),
+    Column("created_at", Integer),
+    Column("updated_at", Integer),
+)
+Table(
+    "feedback_post",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("post_id", Integer, ForeignKey("post.id"), nullable=False),
+    Column("user_id", String, ForeignKey("user.id"), nullable=False),
+    Column("like", Boolean, nullable=False),
+    Column("created_at", Integer),
+    Column("updated_at", Integer),
+)
+Table(
+    "feedback_comment",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("comment_id", Integer, ForeignKey("comment.id"), nullable=False),
+    Column("user_id", String, ForeignKey("user.id"), nullable=False),
+    Column("like", Boolean, nullable=False),
+    Column("created_at", Integer),
+    Column("updated_at", Integer),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection)
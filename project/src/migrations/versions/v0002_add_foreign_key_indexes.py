@@ -0,0 +1,24 @@
+"""add indexes on foreign key columns which are filtered on"""
+from sqlalchemy import Column, Index, MetaData, Table
+from sqlalchemy.engine import Connection
+
+version = 2
+
+INDEXED_COLUMNS = [
+    ("post", "user_id"),
+    ("comment", "post_id"),
+    ("feedback_post", "post_id"),
+    ("feedback_post", "user_id"),
+    ("feedback_comment", "comment_id"),
+    ("feedback_comment", "user_id"),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    # creating an index fills it with the existing rows, so no table is rebuilt
+    metadata = MetaData()
+    for table_name, column_name in INDEXED_COLUMNS:
+        table = Table(table_name, metadata, Column(column_name), extend_existing=True)
+        Index(f"ix_{table_name}_{column_name}", table.c[column_name]).create(
+            connection, checkfirst=True
+        )
@@ -0,0 +1,50 @@
+"""add the row_count table of materialized row counts, filled from existing rows"""
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import column, table
+
+version = 3
+
+row_count_table = Table(
+    "row_count",
+    MetaData(),
+    Column("key", String, primary_key=True),
+    Column("count", Integer, nullable=False),
+)
+
+# tables counted in total, and per parent by the column
+COUNTED_TABLES = [
+    ("user", None),
+    ("post", None),
+    ("comment", "post_id"),
+    ("feedback_post", "post_id"),
+    ("feedback_comment", "comment_id"),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    row_count_table.create(connection)
+    counts = []
+    for table_name, parent_column_name in COUNTED_TABLES:
+        counts.append(
+            {
+                "key": table_name,
+                "count": connection.execute(
+                    select(func.count()).select_from(table(table_name))
+                ).scalar_one(),
+            }
+        )
+        if parent_column_name is None:
+            continue
+        parent_column = column(parent_column_name)
+        statement = select(parent_column, func.count()).select_from(
+            table(table_name, parent_column)
+        )
+        for parent_id, count in connection.execute(statement.group_by(parent_column)):
+            counts.append(
+                {
+                    "key": f"{table_name}:{parent_column_name}:{parent_id}",
+                    "count": count,
+                }
+            )
+    connection.execute(row_count_table.insert(), counts)
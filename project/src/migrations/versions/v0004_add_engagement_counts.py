@@ -0,0 +1,47 @@
+"""add like, dislike and comment counts to posts and comments, filled from existing rows"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import column, table
+
+version = 4
+
+# count columns of each parent table, with the counted table, the column of
+# the parent id, and the value of `like` of the counted rows if any
+COUNT_COLUMNS: Dict[str, List[Tuple[str, str, str, Optional[bool]]]] = {
+    "post": [
+        ("like_count", "feedback_post", "post_id", True),
+        ("dislike_count", "feedback_post", "post_id", False),
+        ("comment_count", "comment", "post_id", None),
+    ],
+    "comment": [
+        ("like_count", "feedback_comment", "comment_id", True),
+        ("dislike_count", "feedback_comment", "comment_id", False),
+    ],
+}
+
+
+def upgrade(connection: Connection) -> None:
+    for parent_table_name, count_columns in COUNT_COLUMNS.items():
+        parent_table = table(
+            parent_table_name,
+            column("id"),
+            *[column(count_column[0]) for count_column in count_columns],
+        )
+        values: Dict[str, Any] = {}
+        for count_column_name, table_name, parent_id_column_name, like in count_columns:
+            connection.exec_driver_sql(
+                f"ALTER TABLE {parent_table_name} "
+                f"ADD COLUMN {count_column_name} INTEGER NOT NULL DEFAULT 0"
+            )
+            counted_table = table(
+                table_name, column(parent_id_column_name), column("like")
+            )
+            statement = select(func.count()).where(
+                counted_table.c[parent_id_column_name] == parent_table.c.id
+            )
+            if like is not None:
+                statement = statement.where(counted_table.c.like == like)
+            values[count_column_name] = statement.scalar_subquery()
+        connection.execute(update(parent_table).values(values))
@@ -0,0 +1,16 @@
+"""add the collection_version table of versions bumped by writes to the tables"""
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+version = 5
+
+collection_version_table = Table(
+    "collection_version",
+    MetaData(),
+    Column("key", String, primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    collection_version_table.create(connection)
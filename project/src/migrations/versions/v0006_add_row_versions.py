@@ -0,0 +1,13 @@
+"""add the version column of posts, comments and users, bumped by updates to them"""
+from sqlalchemy.engine import Connection
+
+version = 6
+
+
+def upgrade(connection: Connection) -> None:
+    quote = connection.dialect.identifier_preparer.quote
+    for table_name in ("post", "comment", "user"):
+        connection.exec_driver_sql(
+            f"ALTER TABLE {quote(table_name)} "
+            "ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+        )
@@ -0,0 +1,8 @@
+from sqlmodel import Field, SQLModel
+
+
+class CollectionVersion(SQLModel, table=True):
+    __tablename__ = "collection_version"
+
+    key: str = Field(primary_key=True)
+    version: int = Field(default=0)
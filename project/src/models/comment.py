@@ -12,11 +12,14 @@ updated_at_field = Field(default_factory=get_current_unix_timestamp)
 
 class Comment(SQLModel, table=True):
     id: int = id_field
-    post_id: int = Field(foreign_key="post.id")
+    post_id: int = Field(foreign_key="post.id", index=True)
     user_id: str = Field(foreign_key="user.id")
     content: str = content_field
     created_at: int = created_at_field
     updated_at: int = updated_at_field
+    like_count: int = Field(default=0)
+    dislike_count: int = Field(default=0)
+    version: int = Field(default=1)
 
     post: Post = Relationship(back_populates="comments")
     user: User = Relationship()
@@ -15,8 +15,8 @@ class CommentFeedback(SQLModel, table=True):
     __tablename__ = "feedback_comment"
 
     id: Optional[int] = id_field
-    comment_id: int = Field(foreign_key="comment.id")
-    user_id: str = Field(foreign_key="user.id")
+    comment_id: int = Field(foreign_key="comment.id", index=True)
+    user_id: str = Field(foreign_key="user.id", index=True)
     like: bool
     created_at: int = created_at_field
     updated_at: int = updated_at_field
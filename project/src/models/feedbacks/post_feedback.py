@@ -15,8 +15,8 @@ class PostFeedback(SQLModel, table=True):
     __tablename__ = "feedback_post"
 
     id: Optional[int] = id_field
-    post_id: int = Field(foreign_key="post.id")
-    user_id: str = Field(foreign_key="user.id")
+    post_id: int = Field(foreign_key="post.id", index=True)
+    user_id: str = Field(foreign_key="user.id", index=True)
     like: bool
     created_at: int = created_at_field
     updated_at: int = updated_at_field
@@ -19,10 +19,14 @@ updated_at_field = Field(default_factory=get_current_unix_timestamp)
 class Post(SQLModel, table=True):
     id: Optional[int] = id_field
     title: str = title_field
-    user_id: str = Field(foreign_key="user.id")
+    user_id: str = Field(foreign_key="user.id", index=True)
     content: str = content_field
     created_at: Optional[int] = created_at_field
     updated_at: Optional[int] = updated_at_field
+    like_count: int = Field(default=0)
+    dislike_count: int = Field(default=0)
+    comment_count: int = Field(default=0)
+    version: int = Field(default=1)
 
     user: User = Relationship()
     comments: List["Comment"] = Relationship()
@@ -0,0 +1,8 @@
+from sqlmodel import Field, SQLModel
+
+
+class RowCount(SQLModel, table=True):
+    __tablename__ = "row_count"
+
+    key: str = Field(primary_key=True)
+    count: int = Field(default=0)
@@ -1,5 +1,14 @@
 import time
+from typing import Type
+
+from sqlalchemy import Table, inspect
+from sqlmodel import SQLModel
 
 
 def get_current_unix_timestamp() -> int:
     return int(time.time())
+
+
+def get_table(model: Type[SQLModel]) -> Table:
+    """get the table of a table model, which the SQLModel stubs don't declare"""
+    return inspect(model).local_table
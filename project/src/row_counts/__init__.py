@@ -0,0 +1,145 @@
+"""materialized row counts
+
+The `row_count` table keeps the count of rows of the counted tables, in total
+(e.g. `comment`) and per parent (e.g. `comment:post_id:1`), so pagination doesn't
+count the whole table on every request.
+The counts are updated in the transaction which inserts or deletes the rows,
+by a flush event of the session, and repaired by `python -m src.row_counts rebuild`.
+"""
+import functools
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import bindparam, event, func, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Insert
+from sqlmodel import Session, SQLModel
+
+from src import statements
+from src.models import comment, post, user
+from src.models.feedbacks import comment_feedback, post_feedback
+from src.models.row_count import RowCount
+from src.models.utils import get_table
+
+
+class RowCounter:
+    """count of the rows of a model, in total and per parent"""
+
+    def __init__(
+        self, model: Type[SQLModel], parent_id_column: Optional[Any] = None
+    ) -> None:
+        self.model = model
+        self.table_name: str = get_table(model).name
+        self.parent_id_column = parent_id_column
+
+    def get_key(self, parent_id: Optional[Any] = None) -> str:
+        if parent_id is None or self.parent_id_column is None:
+            return self.table_name
+        return f"{self.table_name}:{self.parent_id_column.key}:{parent_id}"
+
+    def get_keys_of(self, row: SQLModel) -> List[str]:
+        keys = [self.get_key()]
+        if self.parent_id_column is not None:
+            keys.append(self.get_key(getattr(row, self.parent_id_column.key)))
+        return keys
+
+    def count_rows(self, connection: Connection) -> Dict[str, int]:
+        """count the rows by scanning the table"""
+        statement = select(func.count()).select_from(self.model)
+        counts = {self.get_key(): connection.execute(statement).scalar_one()}
+        if self.parent_id_column is not None:
+            statement = select(self.parent_id_column, func.count()).group_by(
+                self.parent_id_column
+            )
+            for parent_id, count in connection.execute(statement):
+                counts[self.get_key(parent_id)] = count
+        return counts
+
+
+users = RowCounter(user.User)
+posts = RowCounter(post.Post)
+comments = RowCounter(comment.Comment, comment.Comment.post_id)
+post_feedbacks = RowCounter(
+    post_feedback.PostFeedback, post_feedback.PostFeedback.post_id
+)
+comment_feedbacks = RowCounter(
+    comment_feedback.CommentFeedback, comment_feedback.CommentFeedback.comment_id
+)
+ROW_COUNTERS = {
+    row_counter.model: row_counter
+    for row_counter in [users, posts, comments, post_feedbacks, comment_feedbacks]
+}
+
+
+def get_count(
+    session: Session, row_counter: RowCounter, parent_id: Optional[Any] = None
+) -> int:
+    key = row_counter.get_key(parent_id)
+    return session.scalar(statements.select_row_count, {"key": key}) or 0
+
+
+@functools.lru_cache()
+def _get_upsert(dialect_name: str) -> Insert:
+    table = get_table(RowCount)
+    values: Dict[str, Any] = {"key": bindparam("key"), "count": bindparam("delta")}
+    if dialect_name == "mysql":
+        statement = mysql.insert(table).values(values)
+        return statement.on_duplicate_key_update(
+            count=table.c.count + statement.inserted.count
+        )
+    insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}[dialect_name]
+    statement = insert(table).values(values)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.key],
+        set_={"count": table.c.count + statement.excluded.count},
+    )
+
+
+def add_counts(connection: Connection, deltas: Dict[str, int]) -> None:
+    """add the deltas to the counts of their keys in one statement"""
+    connection.execute(
+        _get_upsert(connection.dialect.name),
+        [{"key": key, "delta": delta} for key, delta in deltas.items()],
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_rows(session: Session, *args: Any) -> None:
+    deltas: Counter = Counter()
+    for rows, delta in ((session.new, 1), (session.deleted, -1)):
+        for row in rows:
+            row_counter = ROW_COUNTERS.get(type(row))
+            if row_counter is not None:
+                for key in row_counter.get_keys_of(row):
+                    deltas[key] += delta
+    changed_deltas = {key: delta for key, delta in deltas.items() if delta}
+    if changed_deltas:
+        add_counts(session.connection(), changed_deltas)
+
+
+def get_drift(connection: Connection) -> Dict[str, Tuple[int, int]]:
+    """get the stored and the actual counts of the keys drifted from the tables"""
+    actual_counts: Dict[str, int] = {}
+    for row_counter in ROW_COUNTERS.values():
+        actual_counts.update(row_counter.count_rows(connection))
+    stored_counts: Dict[str, int] = {
+        key: count
+        for key, count in connection.execute(select(RowCount.key, RowCount.count))
+    }
+    return {
+        key: (stored_counts.get(key, 0), actual_counts.get(key, 0))
+        for key in stored_counts.keys() | actual_counts.keys()
+        if stored_counts.get(key, 0) != actual_counts.get(key, 0)
+    }
+
+
+def rebuild(connection: Connection) -> Dict[str, Tuple[int, int]]:
+    """repair the drifted counts, and get the drift repaired"""
+    drift = get_drift(connection)
+    if drift:
+        add_counts(
+            connection,
+            {key: actual - stored for key, (stored, actual) in drift.items()},
+        )
+    return drift
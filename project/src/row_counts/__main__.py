@@ -0,0 +1,34 @@
+import argparse
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src import row_counts
+from src.api import app  # noqa: F401 for registering all models
+from src.database import engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.row_counts")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    args = parser.parse_args()
+    with engine.begin() as connection:
+        if args.command == "rebuild":
+            drift = row_counts.rebuild(connection)
+        else:
+            drift = row_counts.get_drift(connection)
+    for key, (stored, actual) in sorted(drift.items()):
+        print(f"{key}: {stored} -> {actual}")
+    if args.command == "rebuild":
+        print(f"Repaired {len(drift)} counts")
+    elif drift:
+        print(f"Found {len(drift)} drifted counts")
+        sys.exit(1)
+    else:
+        print("No drifted counts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""versions of single rows, bumped by updates to them
+
+Posts, comments and users keep a `version`, bumped by a flush event of the session
+in the transaction which updates their columns. A row is versioned by its version,
+the version of its author and its engagement counts, which are updated by statements
+instead, see `src.engagement_counts`, so its ETag is checked by a query of narrow
+columns.
+"""
+from typing import Any
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from src.models import comment, post, user
+
+VERSIONED_MODELS = (post.Post, comment.Comment, user.User)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_updated_versions(session: Session, *args: Any) -> None:
+    for row in session.dirty:
+        if isinstance(row, VERSIONED_MODELS) and session.is_modified(
+            row, include_collections=False
+        ):
+            row.version += 1
@@ -0,0 +1,278 @@
+"""prebuilt statements of the list endpoints
+
+The statements are built once on import, and offset, limit, keysets, filter ids
+and keys are bound on execution, e.g.
+`session.scalars(select_posts.by_offset, {"offset": 0, "limit": 10})`.
+Their SQL is compiled once per engine and then served from the compiled cache
+of the engine, see `src.database.StatementCacheStatistics`.
+
+They are built with `sqlalchemy.select`, since the `select` of SQLModel does not
+support the compiled cache.
+"""
+import functools
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import Integer, bindparam, func, select
+from sqlalchemy.orm import Load, Session, aliased, joinedload, load_only, selectinload
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import BindParameter
+from sqlmodel import col
+
+from src.models import comment, post, user
+from src.models.collection_version import CollectionVersion
+from src.models.feedbacks import comment_feedback, post_feedback
+from src.models.row_count import RowCount
+
+
+class Fieldset:
+    """columns and relationships of a model to load for each field of a response
+
+    Fields not in `columns` need only the primary key, e.g. links.
+    The columns are column attributes of a model, typed as `Any` like the column
+    of `PaginatedStatements`.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, List[Any]],
+        relationships: Optional[Dict[str, Load]] = None,
+    ) -> None:
+        self.columns = columns
+        self.relationships = relationships or {}
+
+    def get_columns(self, fields: FrozenSet[str]) -> List[Any]:
+        return [
+            column for field in sorted(fields) for column in self.columns.get(field, [])
+        ]
+
+    def get_relationships(self, fields: FrozenSet[str]) -> List[Load]:
+        return [
+            self.relationships[field]
+            for field in sorted(fields)
+            if field in self.relationships
+        ]
+
+
+class PaginatedStatements:
+    """statements of a query paginated by offset, or by keyset of its order column
+
+    Keyset pagination seeks to the rows after (or before) a key through the index
+    of the column, so deep pages cost the same as the first one.
+    With a `fieldset`, the statements can be narrowed to some fields of a response.
+    The `column` is a column attribute of a model, e.g. `Post.id`, which SQLModel
+    declares by the type of its values, so it is typed as `Any`.
+    """
+
+    def __init__(
+        self,
+        statement: Select,
+        column: Any,
+        fieldset: Optional[Fieldset] = None,
+    ) -> None:
+        self.statement = statement
+        self.column = column
+        self.fieldset = fieldset
+        self.is_scalar = len(statement.column_descriptions) == 1
+        if fieldset:
+            statement = statement.options(*fieldset.relationships.values())
+        limit: BindParameter[Integer] = bindparam("limit", type_=Integer)
+        ascending = statement.order_by(column)
+        descending = statement.order_by(column.desc())
+        self.by_offset = ascending.offset(bindparam("offset")).limit(limit)
+        self.first = ascending.limit(limit)
+        self.after = ascending.where(column > bindparam("after")).limit(limit)
+        self.last = descending.limit(limit)
+        self.before = descending.where(column < bindparam("before")).limit(limit)
+
+    @functools.lru_cache(maxsize=64)
+    def narrow(self, fields: Optional[FrozenSet[str]]) -> "PaginatedStatements":
+        """get the statements loading only the columns and relationships of `fields`
+
+        The other columns are deferred. They are built once per fields.
+        """
+        if fields is None or self.fieldset is None:
+            return self
+        return PaginatedStatements(
+            self.statement.options(
+                load_only(self.column, *self.fieldset.get_columns(fields)),
+                *self.fieldset.get_relationships(fields),
+            ),
+            self.column,
+        )
+
+    def get_rows_by_keyset(
+        self,
+        session: Session,
+        limit: int,
+        after: Optional[Any] = None,
+        before: Optional[Any] = None,
+        from_last: bool = False,
+        **params: Any,
+    ) -> Tuple[List[Any], bool]:
+        """get rows after `after` (or before `before`) in order of the column
+
+        Returns the rows and whether more rows are beyond them, which is
+        known by fetching one more row than `limit`.
+        The rows are instances of the model, or `Row`s for a statement of columns.
+        """
+        params["limit"] = limit + 1
+        if before is not None:
+            statement, params["before"] = self.before, before
+        elif from_last:
+            statement = self.last
+        elif after is not None:
+            statement, params["after"] = self.after, after
+        else:
+            statement = self.first
+        result = session.execute(statement, params)
+        rows: List[Any] = result.scalars().all() if self.is_scalar else result.all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if statement is self.before or statement is self.last:
+            rows.reverse()
+        return rows, has_more
+
+
+def _select_first_rows_of_parents(parent_id_column: Any, relationship: str) -> Select:
+    """select the first `limit` rows of each parent of `parent_ids` in order of id
+
+    The rows are ranked in each parent by a window function, so the rows of all
+    the parents of a page are selected by one statement, with their `relationship`.
+    """
+    model = parent_id_column.class_
+    ranked = (
+        select(
+            model,
+            func.row_number()
+            .over(partition_by=parent_id_column, order_by=model.id)
+            .label("rank"),
+        )
+        .where(parent_id_column.in_(bindparam("parent_ids", expanding=True)))
+        .subquery()
+    )
+    ranked_model = aliased(model, ranked)
+    return (
+        select(ranked_model)
+        .where(ranked.c.rank <= bindparam("limit"))
+        .order_by(ranked.c[parent_id_column.key], ranked.c.id)
+        .options(joinedload(getattr(ranked_model, relationship)))
+    )
+
+
+_Post = post.Post
+select_posts = PaginatedStatements(
+    select(_Post),
+    _Post.id,
+    Fieldset(
+        {
+            "title": [_Post.title],
+            "content": [_Post.content],
+            "created_at": [_Post.created_at],
+            "updated_at": [_Post.updated_at],
+            "user": [_Post.user_id],
+            "num_of": [_Post.like_count, _Post.dislike_count, _Post.comment_count],
+        },
+        {"user": selectinload(_Post.user)},
+    ),
+)
+
+_Comment = comment.Comment
+_comment_fieldset = Fieldset(
+    {
+        "content": [_Comment.content],
+        "created_at": [_Comment.created_at],
+        "updated_at": [_Comment.updated_at],
+        "post": [_Comment.post_id],
+        "user": [_Comment.user_id],
+        "num_of": [_Comment.like_count, _Comment.dislike_count],
+        "links": [_Comment.post_id],
+    },
+    {"user": selectinload(_Comment.user)},
+)
+select_first_comments_of_posts = _select_first_rows_of_parents(_Comment.post_id, "user")
+select_comments = PaginatedStatements(select(_Comment), _Comment.id, _comment_fieldset)
+select_comments_of_post = PaginatedStatements(
+    select(_Comment).where(_Comment.post_id == bindparam("post_id")),
+    _Comment.id,
+    _comment_fieldset,
+)
+
+_PostFeedback = post_feedback.PostFeedback
+_post_feedback_fieldset = Fieldset(
+    {
+        "like": [_PostFeedback.like],
+        "created_at": [_PostFeedback.created_at],
+        "updated_at": [_PostFeedback.updated_at],
+        "post": [_PostFeedback.post_id],
+        "user": [_PostFeedback.user_id],
+        "links": [_PostFeedback.post_id],
+    },
+    {"user": selectinload(_PostFeedback.user)},
+)
+select_first_post_feedbacks_of_posts = _select_first_rows_of_parents(
+    _PostFeedback.post_id, "user"
+)
+select_post_feedbacks = PaginatedStatements(
+    select(_PostFeedback), _PostFeedback.id, _post_feedback_fieldset
+)
+select_post_feedbacks_of_post = PaginatedStatements(
+    select(_PostFeedback).where(_PostFeedback.post_id == bindparam("post_id")),
+    _PostFeedback.id,
+    _post_feedback_fieldset,
+)
+
+_CommentFeedback = comment_feedback.CommentFeedback
+_comment_feedback_fieldset = Fieldset(
+    {
+        "like": [_CommentFeedback.like],
+        "created_at": [_CommentFeedback.created_at],
+        "updated_at": [_CommentFeedback.updated_at],
+        "comment": [_CommentFeedback.comment_id],
+        "user": [_CommentFeedback.user_id],
+        "links": [_CommentFeedback.comment_id],
+    },
+    {"user": selectinload(_CommentFeedback.user)},
+)
+select_comment_feedbacks = PaginatedStatements(
+    select(_CommentFeedback), _CommentFeedback.id, _comment_feedback_fieldset
+)
+select_comment_feedbacks_of_comment = PaginatedStatements(
+    select(_CommentFeedback).where(
+        _CommentFeedback.comment_id == bindparam("comment_id")
+    ),
+    _CommentFeedback.id,
+    _comment_feedback_fieldset,
+)
+
+select_users = PaginatedStatements(
+    select(user.User), user.User.id, Fieldset({"name": [user.User.name]})
+)
+
+select_row_count = select(RowCount.count).where(RowCount.key == bindparam("key"))
+
+select_collection_versions = select(
+    CollectionVersion.key, CollectionVersion.version
+).where(col(CollectionVersion.key).in_(bindparam("keys", expanding=True)))
+
+# versions of single rows, checked against `If-None-Match` before loading them
+select_post_version = (
+    select(
+        post.Post.version,
+        post.Post.like_count,
+        post.Post.dislike_count,
+        post.Post.comment_count,
+        col(user.User.version).label("user_version"),
+    )
+    .join(user.User)
+    .where(post.Post.id == bindparam("id"))
+)
+select_comment_version = (
+    select(
+        comment.Comment.version,
+        comment.Comment.like_count,
+        comment.Comment.dislike_count,
+        col(user.User.version).label("user_version"),
+    )
+    .join(user.User)
+    .where(comment.Comment.id == bindparam("id"))
+)
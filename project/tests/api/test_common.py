@@ -0,0 +1,21 @@
+from src.api.common import Link, LinkTemplates
+
+
+def test_link_templates_get_links():
+    # given
+    link_templates = LinkTemplates(
+        {"self": "v1/comments/{id}", "post": "v1/posts/{post_id}"}
+    )
+
+    # when
+    links = link_templates.get_links("http://{host}/", id=2, post_id=1)
+
+    # then
+    assert links == [
+        Link(rel="self", href="http://{host}/v1/comments/2").dict(),
+        Link(rel="post", href="http://{host}/v1/posts/1").dict(),
+    ]
+    assert link_templates.get_links("http://{host}/", id=3, post_id=1)[0] == {
+        "rel": "self",
+        "href": "http://{host}/v1/comments/3",
+    }
@@ -0,0 +1,131 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from src import config
+from src.api import app, compression, middlewares
+
+
+@pytest.fixture()
+def client():
+    compression.compressed_body_cache.clear()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture()
+def etag_client():
+    etag_app = FastAPI()
+    etag_app.middleware("http")(middlewares.compress_responses)
+
+    @etag_app.get("/items")
+    def read_items():
+        return JSONResponse(
+            {"items": ["item"] * config.compression.minimum_size},
+            headers={"ETag": '"items"'},
+        )
+
+    compression.compressed_body_cache.clear()
+    with TestClient(etag_app) as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0.5, deflate", "gzip"),
+        ("*", compression.get_encodings()[0]),
+        ("deflate", None),
+        ("gzip;q=0", None),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding, encoding):
+    assert compression.negotiate(accept_encoding) == encoding
+
+
+def test_negotiate_brotli():
+    assert compression.negotiate("gzip, br") == "br"
+    assert compression.negotiate("gzip, br;q=0.5") == "gzip"
+
+
+def test_compress_responses(client):
+    # when
+    response = client.get(
+        "/v1/openapi.json", headers={"Accept-Encoding": "gzip"}, stream=True
+    )
+    body = response.raw.read(decode_content=False)
+
+    # then
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Length"] == str(len(body))
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == client.get("/v1/openapi.json").content
+    assert len(body) < len(gzip.decompress(body))
+
+
+def test_compress_responses_with_cache(client):
+    # when
+    for _ in range(3):
+        client.get("/v1/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    # then
+    assert compression.compressed_body_cache.to_dict() == {
+        "size": 1,
+        "maxsize": config.compression.cache_size,
+        "hits": 2,
+        "misses": 1,
+    }
+
+
+def test_compress_responses_unless_accepted_or_small(client):
+    # when
+    identity_response = client.get(
+        "/v1/openapi.json", headers={"Accept-Encoding": "identity"}
+    )
+    small_response = client.get("/v1/", headers={"Accept-Encoding": "gzip"})
+
+    # then
+    assert "Content-Encoding" not in identity_response.headers
+    assert identity_response.json()["info"]["version"] == "v1"
+    assert "Content-Encoding" not in small_response.headers
+    assert small_response.text == "I'm Alive!"
+
+
+def test_compress_responses_by_brotli(client):
+    # when
+    response = client.get(
+        "/v1/openapi.json", headers={"Accept-Encoding": "gzip, br"}, stream=True
+    )
+    body = response.raw.read(decode_content=False)
+
+    # then
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.headers["Content-Length"] == str(len(body))
+    assert brotli.decompress(body) == client.get("/v1/openapi.json").content
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", "br"])
+def test_compress_responses_with_weak_etag(etag_client, accept_encoding):
+    # when
+    response = etag_client.get("/items", headers={"Accept-Encoding": accept_encoding})
+
+    # then
+    assert response.headers["Content-Encoding"] == accept_encoding
+    assert response.headers["ETag"] == 'W/"items"'
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_compress_responses_unless_accepted_with_vary(etag_client):
+    # when
+    response = etag_client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    # then
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"items"'
+    assert response.headers["Vary"] == "Accept-Encoding"
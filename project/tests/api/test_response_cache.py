@@ -0,0 +1,97 @@
+import time
+
+from src.api.response_cache import MAX_URLS_PER_ROW, ResponseCache
+from src.cache_backends.memory import MemoryBackend
+
+
+def test_evict_least_recently_used():
+    # given
+    cache = ResponseCache("post", MemoryBackend(), maxsize=2, ttl_seconds=60)
+    cache.set(1, "/v1/posts/1", b"1", '"1"', cache.generation)
+    cache.set(2, "/v1/posts/2", b"2", '"2"', cache.generation)
+
+    # when
+    cache.get(1, "/v1/posts/1")
+    cache.set(3, "/v1/posts/3", b"3", '"3"', cache.generation)
+
+    # then
+    assert cache.get(1, "/v1/posts/1") == (b"1", '"1"')
+    assert cache.get(2, "/v1/posts/2") is None
+    assert cache.to_dict()["evictions"] == 1
+
+
+def test_expire_after_ttl():
+    # given
+    cache = ResponseCache("post", MemoryBackend(), maxsize=2, ttl_seconds=0.01)
+    cache.set(1, "/v1/posts/1", b"1", '"1"', cache.generation)
+
+    # when
+    time.sleep(0.02)
+
+    # then
+    assert cache.get(1, "/v1/posts/1") is None
+    assert cache.to_dict()["expirations"] == 1
+
+
+def test_invalidate_all_urls_of_rows():
+    # given
+    cache = ResponseCache("post", MemoryBackend(), maxsize=4, ttl_seconds=60)
+    cache.set(1, "/v1/posts/1", b"1", '"1"', cache.generation)
+    cache.set(1, "/v1/posts/1?x=1", b"1", '"1"', cache.generation)
+    cache.set(2, "/v1/posts/2", b"2", '"2"', cache.generation)
+
+    # when
+    cache.invalidate([1])
+
+    # then
+    assert cache.get(1, "/v1/posts/1") is None
+    assert cache.get(1, "/v1/posts/1?x=1") is None
+    assert cache.get(2, "/v1/posts/2") == (b"2", '"2"')
+    assert cache.to_dict()["invalidations"] == 1
+
+
+def test_drop_least_recently_set_urls_of_rows():
+    # given
+    cache = ResponseCache("post", MemoryBackend(), maxsize=2, ttl_seconds=60)
+    urls = [f"/v1/posts/1?x={i}" for i in range(MAX_URLS_PER_ROW + 1)]
+
+    # when
+    for url in urls:
+        cache.set(1, url, b"1", '"1"', cache.generation)
+
+    # then
+    assert cache.get(1, urls[0]) is None
+    assert all(cache.get(1, url) == (b"1", '"1"') for url in urls[1:])
+
+
+def test_skip_bodies_rendered_before_invalidation():
+    # given
+    cache = ResponseCache("post", MemoryBackend(), maxsize=2, ttl_seconds=60)
+    generation = cache.generation
+
+    # when
+    cache.invalidate([1])
+    cache.set(1, "/v1/posts/1", b"1", '"1"', generation)
+
+    # then
+    assert cache.get(1, "/v1/posts/1") is None
+
+
+def test_skip_bodies_read_from_replica_within_lag_after_invalidation():
+    # given
+    cache = ResponseCache(
+        "post", MemoryBackend(), maxsize=4, ttl_seconds=60, replica_lag_seconds=60
+    )
+    cache.invalidate([1])
+
+    # when
+    cache.set(1, "/v1/posts/1", b"1", '"1"', cache.generation, from_replica=True)
+    cache.set(2, "/v1/posts/2", b"2", '"2"', cache.generation, from_replica=True)
+    cache.set(3, "/v1/posts/3", b"3", '"3"', cache.generation)
+    cache.invalidate([3])
+    cache.set(3, "/v1/posts/3", b"3", '"3"', cache.generation)
+
+    # then
+    assert cache.get(1, "/v1/posts/1") is None
+    assert cache.get(2, "/v1/posts/2") == (b"2", '"2"')
+    assert cache.get(3, "/v1/posts/3") == (b"3", '"3"')
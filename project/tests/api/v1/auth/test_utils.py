@@ -0,0 +1,156 @@
+import time
+
+import orjson
+from fastapi import status
+from jose import jwt
+from sqlalchemy import event
+from sqlmodel import Session
+
+from src.api.v1.auth.utils import TokenCache, TokenPayload, user_cache
+from src.database import engine
+from src.models import post, user
+
+
+def test_get_current_user_shares_session_with_handler(
+    client, common_user, headers_with_authorized_common
+):
+    # given
+    with Session(engine) as session:
+        session.add(post.Post(id=1, title="테스트 제목", user_id="heumsi", content="테스트 내용"))
+        session.commit()
+    sessions = set()
+    statements = []
+
+    def on_after_begin(session, transaction, connection):
+        sessions.add(session)
+
+    def on_before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Session, "after_begin", on_after_begin)
+    event.listen(engine, "before_cursor_execute", on_before_cursor_execute)
+
+    # when
+    try:
+        response = client.patch(
+            "/v1/posts/1",
+            json={"title": "수정된 테스트 제목"},
+            headers=headers_with_authorized_common,
+        )
+    finally:
+        event.remove(Session, "after_begin", on_after_begin)
+        event.remove(engine, "before_cursor_execute", on_before_cursor_execute)
+
+    # then
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert len(sessions) == 1
+    assert len([statement for statement in statements if "FROM user" in statement]) == 1
+
+
+def test_get_current_user_unsuccessfully_with_invalid_token(client):
+    # when
+    response = client.get("/v1/users/me", headers={"Authorization": "Bearer invalid"})
+
+    # then
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_get_current_user_from_cache(client, headers_with_authorized_admin):
+    # given
+    client.get("/v1/users/me", headers=headers_with_authorized_admin)
+    statements = []
+
+    def on_before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_before_cursor_execute)
+
+    # when
+    try:
+        response = client.get("/v1/users/me", headers=headers_with_authorized_admin)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_before_cursor_execute)
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert not [statement for statement in statements if "FROM user" in statement]
+
+
+def test_get_current_user_from_cache_without_password(
+    client, headers_with_authorized_admin
+):
+    # given
+    client.get("/v1/users/me", headers=headers_with_authorized_admin)
+
+    # when
+    value = user_cache.backend.get(user_cache.namespace, "admin")
+
+    # then
+    assert "password" not in orjson.loads(value)
+    assert orjson.loads(value)["role"] == str(user.Role.ADMIN)
+
+
+def test_get_current_user_invalidated_by_role_change_and_delete(
+    client, headers_with_authorized_admin
+):
+    # given
+    client.get("/v1/users", headers=headers_with_authorized_admin)
+
+    # when
+    with Session(engine) as session:
+        session.get(user.User, "admin").role = str(user.Role.COMMON)
+        session.commit()
+    forbidden_response = client.get("/v1/users", headers=headers_with_authorized_admin)
+    with Session(engine) as session:
+        session.delete(session.get(user.User, "admin"))
+        session.commit()
+    unauthorized_response = client.get(
+        "/v1/users/me", headers=headers_with_authorized_admin
+    )
+
+    # then
+    assert forbidden_response.status_code == status.HTTP_403_FORBIDDEN
+    assert unauthorized_response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_get_current_user_from_cache_for_writes(client, headers_with_authorized_common):
+    # given
+    client.get("/v1/users/me", headers=headers_with_authorized_common)
+
+    # when
+    response = client.post(
+        "/v1/posts/",
+        json={"title": "테스트 제목", "content": "테스트 내용"},
+        headers=headers_with_authorized_common,
+    )
+
+    # then
+    assert response.status_code == status.HTTP_201_CREATED
+    post_response = client.get(response.headers["Location"])
+    assert post_response.json()["data"]["user"]["id"] == "heumsi"
+
+
+def test_decode_token_from_cache(client, headers_with_authorized_common, monkeypatch):
+    # given
+    client.get("/v1/users/me", headers=headers_with_authorized_common)
+    monkeypatch.setattr(jwt, "decode", None)  # not called again
+
+    # when
+    response = client.get("/v1/users/me", headers=headers_with_authorized_common)
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_token_cache_expire_at_exp():
+    # given
+    cache = TokenCache(maxsize=2, ttl_seconds=60)
+    token_payload = TokenPayload(user=user.User(id="heumsi", name="heumsi"))
+
+    # when
+    cache.set("expired", token_payload, {"exp": time.time() - 1})
+    cache.set("valid", token_payload, {"exp": time.time() + 60})
+
+    # then
+    assert cache.get("expired") is None
+    assert cache.get("valid") is token_payload
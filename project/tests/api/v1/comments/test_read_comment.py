@@ -1,8 +1,10 @@
 from fastapi import status
 from sqlmodel import Session
 
+from src import config
 from src.database import engine
 from src.models import comment, post
+from src.models.feedbacks import comment_feedback
 
 
 def test_handle_successfully(client, common_user):
@@ -23,6 +25,12 @@ def test_handle_successfully(client, common_user):
         )
         session.add(post_)
         session.add(comment_)
+        session.flush()
+        session.add(
+            comment_feedback.CommentFeedback(
+                comment_id=comment_.id, user_id=common_user.id, like=False
+            )
+        )
         session.commit()
         session.refresh(post_)
         session.refresh(comment_)
@@ -49,6 +57,7 @@ def test_handle_successfully(client, common_user):
             "id": common_user.id,
             "name": common_user.name,
         },
+        "numOf": {"likes": 0, "dislikes": 1},
         "links": [
             {"href": f"{client.base_url}/v1/comments/1", "rel": "self"},
             {"href": f"{client.base_url}/v1/posts/1", "rel": "post"},
@@ -68,3 +77,72 @@ def test_handle_unsuccessfully_with_not_found(client):
 
     # then
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_handle_successfully_with_if_none_match(
+    client, common_user, headers_with_authorized_common, monkeypatch
+):
+    # given
+    monkeypatch.setattr(config.response_cache, "enabled", False)
+    with Session(engine) as session:
+        post_ = post.Post(
+            title="테스트 제목",
+            user_id=common_user.id,
+            content="테스트 내용",
+            user=common_user,
+        )
+        session.add(
+            comment.Comment(id=1, user_id=common_user.id, content="테스트 내용", post=post_)
+        )
+        session.commit()
+    etag = client.get("/v1/comments/1").headers["ETag"]
+
+    # when
+    not_modified_response = client.get(
+        "/v1/comments/1", headers={"If-None-Match": f'W/"other", {etag}'}
+    )
+    client.put(
+        "/v1/comments/1",
+        json={"content": "수정된 내용"},
+        headers=headers_with_authorized_common,
+    )
+    modified_response = client.get("/v1/comments/1", headers={"If-None-Match": etag})
+
+    # then
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.headers["X-Query-Count"] == "1"
+    assert modified_response.status_code == status.HTTP_200_OK
+    assert modified_response.json()["data"]["content"] == "수정된 내용"
+
+
+def test_handle_successfully_from_cache(
+    client, common_user, headers_with_authorized_common
+):
+    # given
+    with Session(engine) as session:
+        post_ = post.Post(
+            title="테스트 제목",
+            user_id=common_user.id,
+            content="테스트 내용",
+            user=common_user,
+        )
+        session.add(
+            comment.Comment(id=1, user_id=common_user.id, content="테스트 내용", post=post_)
+        )
+        session.commit()
+    etag = client.get("/v1/comments/1").headers["ETag"]
+
+    # when
+    not_modified_response = client.get(
+        "/v1/comments/1", headers={"If-None-Match": etag}
+    )
+    client.post("/v1/feedbacks/comments/1/like", headers=headers_with_authorized_common)
+    liked_response = client.get("/v1/comments/1")
+    client.delete("/v1/comments/1", headers=headers_with_authorized_common)
+    deleted_response = client.get("/v1/comments/1")
+
+    # then
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.headers["X-Query-Count"] == "0"
+    assert liked_response.json()["data"]["numOf"] == {"likes": 1, "dislikes": 0}
+    assert deleted_response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,3 +1,4 @@
+import pytest
 from fastapi import status
 from sqlmodel import Session
 
@@ -64,6 +65,7 @@ def test_handle_successfully(client, common_user, common_another_user):
                 "id": common_user.id,
                 "name": common_user.name,
             },
+            "numOf": {"likes": 0, "dislikes": 0},
             "links": [
                 {"href": f"{client.base_url}/v1/comments/1", "rel": "self"},
                 {"href": f"{client.base_url}/v1/posts/{post_.id}", "rel": "post"},
@@ -81,6 +83,7 @@ def test_handle_successfully(client, common_user, common_another_user):
                 "id": common_another_user.id,
                 "name": common_another_user.name,
             },
+            "numOf": {"likes": 0, "dislikes": 0},
             "links": [
                 {"href": f"{client.base_url}/v1/comments/2", "rel": "self"},
                 {"href": f"{client.base_url}/v1/posts/{post_.id}", "rel": "post"},
@@ -155,6 +158,7 @@ def test_handle_successfully_with_params_including_post_id(client, common_user):
                 "id": common_user.id,
                 "name": common_user.name,
             },
+            "numOf": {"likes": 0, "dislikes": 0},
             "links": [
                 {
                     "href": f"{client.base_url}/v1/comments/{comment_1.id}",
@@ -243,6 +247,7 @@ def test_handle_successfully_with_specific_offset_and_limit(client, common_user)
                 "id": common_user.id,
                 "name": common_user.name,
             },
+            "numOf": {"likes": 0, "dislikes": 0},
             "links": [
                 {
                     "href": f"{client.base_url}/v1/comments/{comment_2.id}",
@@ -255,7 +260,7 @@ def test_handle_successfully_with_specific_offset_and_limit(client, common_user)
     links = json_data.get("links")
     assert links == [
         {
-            "href": f"{client.base_url}/v1/comments/?offset=1&limit=1",
+            "href": f"{client.base_url}/v1/comments/?limit=1&offset=1",
             "rel": "self",
         },
         {
@@ -267,3 +272,151 @@ def test_handle_successfully_with_specific_offset_and_limit(client, common_user)
             "rel": "prev",
         },
     ]
+
+
+@pytest.mark.parametrize("limit", [0, 101])
+def test_handle_unsuccessfully_with_out_of_range_limit(client, limit):
+    # when
+    response = client.get("/v1/comments/", params={"limit": limit})
+
+    # then
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_handle_successfully_with_cursor(client, common_user):
+    # given
+    with Session(engine) as session:
+        post_1 = post.Post(
+            title="테스트 제목 1",
+            user_id=common_user.id,
+            content="테스트 내용 1",
+            user=common_user,
+        )
+        post_2 = post.Post(
+            title="테스트 제목 2",
+            user_id=common_user.id,
+            content="테스트 내용 2",
+            user=common_user,
+        )
+        for i in range(3):
+            for post_ in (post_1, post_2):
+                session.add(
+                    comment.Comment(
+                        user_id=common_user.id,
+                        content=f"테스트 내용 {i}",
+                        user=common_user,
+                        post=post_,
+                    )
+                )
+        session.commit()
+        session.refresh(post_1)
+
+    # when
+    first_response = client.get(
+        "/v1/comments/", params={"post_id": post_1.id, "after": "", "limit": 2}
+    )
+    next_response = client.get(first_response.json()["links"][1]["href"])
+    prev_response = client.get(next_response.json()["links"][1]["href"])
+
+    # then
+    assert first_response.status_code == status.HTTP_200_OK
+    first_json_data = first_response.json()
+    first_pagination = first_json_data.get("pagination")
+    assert first_pagination == {
+        "limit": 2,
+        "nextCursor": first_pagination["nextCursor"],
+        "prevCursor": None,
+    }
+    assert [data["id"] for data in first_json_data["data"]] == [1, 3]
+    assert first_json_data["links"][1] == {
+        "href": f"{client.base_url}/v1/comments/?post_id={post_1.id}"
+        f"&after={first_pagination['nextCursor']}&limit=2",
+        "rel": "next",
+    }
+
+    assert next_response.status_code == status.HTTP_200_OK
+    next_json_data = next_response.json()
+    next_pagination = next_json_data.get("pagination")
+    assert next_pagination == {
+        "limit": 2,
+        "nextCursor": None,
+        "prevCursor": next_pagination["prevCursor"],
+    }
+    assert [data["id"] for data in next_json_data["data"]] == [5]
+    assert [link["rel"] for link in next_json_data["links"]] == ["self", "prev"]
+
+    assert prev_response.status_code == status.HTTP_200_OK
+    prev_json_data = prev_response.json()
+    assert [data["id"] for data in prev_json_data["data"]] == [1, 3]
+    assert prev_json_data["pagination"]["prevCursor"] is None
+    assert prev_json_data["pagination"]["nextCursor"] is not None
+
+
+def test_handle_successfully_with_fields(client, common_user):
+    # given
+    with Session(engine) as session:
+        post_ = post.Post(
+            id=1, title="테스트 제목", user_id=common_user.id, content="테스트 내용"
+        )
+        session.add(
+            comment.Comment(id=1, user_id=common_user.id, post=post_, content="테스트 내용")
+        )
+        session.commit()
+
+    # when
+    response = client.get(
+        "/v1/comments/", params={"post_id": 1, "fields": "user,links"}
+    )
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"] == [
+        {
+            "user": {"id": common_user.id, "name": common_user.name},
+            "links": [
+                {"href": f"{client.base_url}/v1/comments/1", "rel": "self"},
+                {"href": f"{client.base_url}/v1/posts/1", "rel": "post"},
+            ],
+        }
+    ]
+    # the total, the comments without their content and their users
+    assert response.headers["X-Query-Count"] == "4"
+
+
+def test_handle_successfully_from_cache_of_post(
+    client, common_user, headers_with_authorized_common
+):
+    # given
+    with Session(engine) as session:
+        for post_id in (1, 2):
+            session.add(
+                post.Post(
+                    id=post_id,
+                    title="테스트 제목",
+                    user_id=common_user.id,
+                    user=common_user,
+                    content="테스트 내용",
+                )
+            )
+        session.commit()
+    client.get("/v1/comments/", params={"post_id": 1})
+
+    # when
+    client.post(
+        "/v1/comments/",
+        json={"post_id": 2, "content": "테스트 내용"},
+        headers=headers_with_authorized_common,
+    )
+    other_post_written_response = client.get("/v1/comments/", params={"post_id": 1})
+    client.post(
+        "/v1/comments/",
+        json={"post_id": 1, "content": "테스트 내용"},
+        headers=headers_with_authorized_common,
+    )
+    written_response = client.get("/v1/comments/", params={"post_id": 1})
+
+    # then
+    # the comments of the other post do not change the comments of the post
+    assert other_post_written_response.headers["X-Query-Count"] == "1"
+    assert other_post_written_response.json()["data"] == []
+    assert len(written_response.json()["data"]) == 1
@@ -50,6 +50,7 @@ def test_handle_successfully(client, common_user, headers_with_authorized_common
             user_id=comments[0].user_id,
             created_at=comments[0].created_at,
             updated_at=comments[0].updated_at,
+            version=2,
         )
         assert comments[0].updated_at > comments[0].created_at
 
@@ -6,7 +6,9 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel
 
 from src.api import app
-from src.api.v1.auth.utils import get_hashed_password
+from src.api.compression import compressed_body_cache
+from src.api.response_cache import response_caches
+from src.api.v1.auth.utils import get_hashed_password, token_cache, user_cache
 from src.database import engine
 from src.models import user
 
@@ -120,7 +122,13 @@ def headers_with_authorized_admin(client) -> Dict[str, str]:
 
 
 @pytest.fixture(autouse=True)
-def setup_and_teardown_db():
+def setup_and_teardown_db(client):
     SQLModel.metadata.create_all(bind=engine)
     yield
     SQLModel.metadata.drop_all(bind=engine)
+    # the versions of the collections start over with the tables, and so their ETags
+    compressed_body_cache.clear()
+    for cache in response_caches.values():
+        cache.reset()
+    user_cache.clear()
+    token_cache.clear()
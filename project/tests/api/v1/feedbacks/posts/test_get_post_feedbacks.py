@@ -240,3 +240,27 @@ def test_handle_successfully_with_specific_post_id(
             "rel": "self",
         }
     ]
+
+
+def test_handle_successfully_with_fields(client, common_user):
+    # given
+    with Session(engine) as session:
+        post_ = post.Post(
+            id=1, title="테스트 제목", user_id=common_user.id, content="테스트 내용"
+        )
+        session.add(
+            post_feedback.PostFeedback(
+                id=1, user_id=common_user.id, post=post_, like=True
+            )
+        )
+        session.commit()
+
+    # when
+    response = client.get(
+        "/v1/feedbacks/posts", params={"after": "", "fields": "id,like"}
+    )
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"] == [{"id": 1, "like": True}]
+    assert response.headers["X-Query-Count"] == "2"
@@ -0,0 +1,27 @@
+from fastapi import status
+
+
+def test_handle_successfully(client, headers_with_authorized_admin):
+    # when
+    response = client.get("/v1/metrics/pool", headers=headers_with_authorized_admin)
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    json_data = response.json()
+    data = json_data.get("data")
+    assert data[0]["name"] == "primary"
+    assert data[0]["poolClass"] == "StaticPool"
+    assert data[0]["checkouts"] > 0
+    assert data[0]["peakCheckedOut"] >= 1
+    links = json_data.get("links")
+    assert links == [{"href": f"{client.base_url}/v1/metrics/pool", "rel": "self"}]
+
+
+def test_handle_unsuccessfully_with_no_authorization(
+    client, headers_with_authorized_common
+):
+    # when
+    response = client.get("/v1/metrics/pool", headers=headers_with_authorized_common)
+
+    # then
+    assert response.status_code == status.HTTP_403_FORBIDDEN
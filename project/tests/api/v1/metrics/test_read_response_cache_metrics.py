@@ -0,0 +1,44 @@
+from fastapi import status
+from sqlmodel import Session
+
+from src.database import engine
+from src.models import post
+
+
+def test_handle_successfully(client, common_user, headers_with_authorized_admin):
+    # given
+    with Session(engine) as session:
+        session.add(post.Post(id=1, title="테스트 제목", content="테스트 내용", user=common_user))
+        session.commit()
+    for _ in range(2):
+        client.get("/v1/posts/1")
+
+    # when
+    response = client.get(
+        "/v1/metrics/response-cache", headers=headers_with_authorized_admin
+    )
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    json_data = response.json()
+    data = json_data.get("data")
+    assert [item["name"] for item in data] == ["post", "comment", "list"]
+    assert data[0]["size"] == 1
+    assert data[0]["hits"] == 1
+    assert data[0]["misses"] == 1
+    links = json_data.get("links")
+    assert links == [
+        {"href": f"{client.base_url}/v1/metrics/response-cache", "rel": "self"}
+    ]
+
+
+def test_handle_unsuccessfully_with_no_authorization(
+    client, headers_with_authorized_common
+):
+    # when
+    response = client.get(
+        "/v1/metrics/response-cache", headers=headers_with_authorized_common
+    )
+
+    # then
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,37 @@
+from fastapi import status
+
+
+def test_handle_successfully(client, headers_with_authorized_admin):
+    # given
+    for _ in range(2):
+        client.get("/v1/posts", headers=headers_with_authorized_admin)
+
+    # when
+    response = client.get(
+        "/v1/metrics/statement-cache", headers=headers_with_authorized_admin
+    )
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    json_data = response.json()
+    data = json_data.get("data")
+    assert data[0]["name"] == "primary"
+    assert data[0]["size"] > 0
+    assert data[0]["hits"] > 0
+    assert data[0]["misses"] > 0
+    links = json_data.get("links")
+    assert links == [
+        {"href": f"{client.base_url}/v1/metrics/statement-cache", "rel": "self"}
+    ]
+
+
+def test_handle_unsuccessfully_with_no_authorization(
+    client, headers_with_authorized_common
+):
+    # when
+    response = client.get(
+        "/v1/metrics/statement-cache", headers=headers_with_authorized_common
+    )
+
+    # then
+    assert response.status_code == status.HTTP_403_FORBIDDEN
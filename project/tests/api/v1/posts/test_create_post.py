@@ -1,6 +1,7 @@
 from fastapi import status
 from sqlmodel import Session, select
 
+from src.api.middlewares import PIN_TO_PRIMARY_COOKIE
 from src.database import engine
 from src.models import post
 
@@ -31,6 +32,21 @@ def test_handle_successfully(client, common_user, headers_with_authorized_common
         )
 
 
+def test_handle_successfully_without_pinning_to_primary_without_replicas(
+    client, common_user, headers_with_authorized_common
+):
+    # when
+    response = client.post(
+        "/v1/posts/",
+        headers=headers_with_authorized_common,
+        json={"title": "테스트 제목", "content": "테스트 내용"},
+    )
+
+    # then
+    assert response.status_code == status.HTTP_201_CREATED
+    assert PIN_TO_PRIMARY_COOKIE not in response.cookies
+
+
 def test_handle_unsuccessfully_with_no_auth(client):
     # when
     response = client.post(
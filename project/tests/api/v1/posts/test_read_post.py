@@ -1,8 +1,16 @@
+import asyncio
+import socket
+
+import orjson
 from fastapi import status
 from sqlmodel import Session
 
+from src import config
+from src.api.response_cache import post_cache
+from src.cache_backends.redis import RedisBackend
 from src.database import engine
-from src.models import post
+from src.models import comment, post, user
+from src.models.feedbacks import post_feedback
 
 
 def test_handle_successfully(client, common_user):
@@ -17,6 +25,13 @@ def test_handle_successfully(client, common_user):
                 content="테스트 내용",
             )
         )
+        session.flush()
+        session.add(
+            post_feedback.PostFeedback(post_id=1, user_id=common_user.id, like=True)
+        )
+        session.add(
+            comment.Comment(post_id=1, user_id=common_user.id, content="테스트 내용")
+        )
         session.commit()
         session.refresh(common_user)
 
@@ -39,6 +54,7 @@ def test_handle_successfully(client, common_user):
             "id": common_user.id,
             "name": common_user.name,
         },
+        "numOf": {"likes": 1, "dislikes": 0, "comments": 1},
     }
     links = json_data.get("links")
     assert links == [
@@ -51,6 +67,31 @@ def test_handle_successfully(client, common_user):
     ]
 
 
+def test_handle_successfully_by_orjson(client, common_user):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+
+    # when
+    response = client.get(
+        "/v1/posts/1",
+    )
+
+    # then
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == orjson.dumps(response.json())
+    assert "테스트 제목".encode() in response.content
+    assert b'"createdAt"' in response.content
+
+
 def test_handle_unsuccessfully_with_not_found(client):
     # when
     response = client.get(
@@ -59,3 +100,221 @@ def test_handle_unsuccessfully_with_not_found(client):
 
     # then
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_handle_successfully_with_expand(client, common_user):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                content="테스트 내용",
+            )
+        )
+        session.flush()
+        session.add(
+            comment.Comment(id=1, post_id=1, user_id=common_user.id, content="테스트 내용")
+        )
+        session.commit()
+
+    # when
+    response = client.get("/v1/posts/1", params={"expand": "comments"})
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    embedded = response.json()["data"]["embedded"]
+    assert embedded == {
+        "comments": {
+            "data": [
+                {
+                    "id": 1,
+                    "content": "테스트 내용",
+                    "createdAt": embedded["comments"]["data"][0]["createdAt"],
+                    "updatedAt": embedded["comments"]["data"][0]["updatedAt"],
+                    "post": {"id": 1},
+                    "user": {"id": common_user.id, "name": common_user.name},
+                    "numOf": {"likes": 0, "dislikes": 0},
+                    "links": [
+                        {"href": f"{client.base_url}/v1/comments/1", "rel": "self"},
+                        {"href": f"{client.base_url}/v1/posts/1", "rel": "post"},
+                    ],
+                }
+            ],
+            "pagination": {"limit": 5, "nextCursor": None, "prevCursor": None},
+            "links": [
+                {
+                    "href": f"{client.base_url}/v1/comments?post_id=1&limit=5",
+                    "rel": "self",
+                }
+            ],
+        }
+    }
+    assert response.headers["X-Query-Count"] == "3"
+
+
+def test_handle_successfully_with_if_none_match(
+    client, common_user, headers_with_authorized_common, monkeypatch
+):
+    # given
+    monkeypatch.setattr(config.response_cache, "enabled", False)
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                user=common_user,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+    etag = client.get("/v1/posts/1").headers["ETag"]
+
+    # when
+    not_modified_response = client.get("/v1/posts/1", headers={"If-None-Match": etag})
+    client.post("/v1/feedbacks/posts/1/like", headers=headers_with_authorized_common)
+    modified_response = client.get("/v1/posts/1", headers={"If-None-Match": etag})
+
+    # then
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.headers["ETag"] == etag
+    # only the version of the post is loaded
+    assert not_modified_response.headers["X-Query-Count"] == "1"
+    assert modified_response.status_code == status.HTTP_200_OK
+    assert modified_response.headers["ETag"] != etag
+    assert modified_response.json()["data"]["numOf"]["likes"] == 1
+
+
+def test_handle_successfully_with_if_none_match_after_renaming_user(
+    client, common_user
+):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                user=common_user,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+    etag = client.get("/v1/posts/1").headers["ETag"]
+
+    # when
+    with Session(engine) as session:
+        session.get(user.User, "heumsi").name = "수정된 이름"
+        session.commit()
+    response = client.get("/v1/posts/1", headers={"If-None-Match": etag})
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["data"]["user"]["name"] == "수정된 이름"
+
+
+def test_handle_successfully_from_cache(
+    client, common_user, headers_with_authorized_common
+):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                user=common_user,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+    response = client.get("/v1/posts/1")
+
+    # when
+    cached_response = client.get("/v1/posts/1")
+    client.put(
+        "/v1/posts/1",
+        json={"title": "수정된 테스트 제목", "content": "수정된 테스트 내용"},
+        headers=headers_with_authorized_common,
+    )
+    updated_response = client.get("/v1/posts/1")
+    with Session(engine) as session:
+        session.get(user.User, "heumsi").name = "수정된 이름"
+        session.commit()
+    renamed_response = client.get("/v1/posts/1")
+
+    # then
+    assert cached_response.headers["X-Query-Count"] == "0"
+    assert cached_response.content == response.content
+    assert cached_response.headers["ETag"] == response.headers["ETag"]
+    assert updated_response.json()["data"]["title"] == "수정된 테스트 제목"
+    assert renamed_response.json()["data"]["user"]["name"] == "수정된 이름"
+
+
+def test_handle_successfully_without_caching_unknown_query_params(client, common_user):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                user=common_user,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+    client.get("/v1/posts/1", params={"junk": 1})
+
+    # when
+    response = client.get("/v1/posts/1", params={"junk": 1})
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Query-Count"] != "0"
+    assert post_cache.backend.get(post_cache.namespace, "1") is None
+
+
+def test_handle_successfully_without_redis_responding(client, common_user, monkeypatch):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                user=common_user,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+    server = socket.create_server(("127.0.0.1", 0))
+    backend = RedisBackend(
+        f"redis://127.0.0.1:{server.getsockname()[1]}/0", timeout=0.1
+    )
+    called_on_event_loop = []
+
+    def get(*args):
+        try:
+            asyncio.get_running_loop()
+            called_on_event_loop.append(True)
+        except RuntimeError:
+            called_on_event_loop.append(False)
+        return RedisBackend.get(backend, *args)
+
+    monkeypatch.setattr(backend, "get", get)
+    monkeypatch.setattr(post_cache, "backend", backend)
+
+    # when
+    try:
+        response = client.get("/v1/posts/1")
+    finally:
+        server.close()
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["title"] == "테스트 제목"
+    assert called_on_event_loop and not any(called_on_event_loop)
@@ -1,8 +1,9 @@
+import pytest
 from fastapi import status
 from sqlmodel import Session
 
 from src.database import engine
-from src.models import comment, post
+from src.models import comment, post, user
 from src.models.feedbacks import post_feedback
 
 
@@ -129,3 +130,342 @@ def test_handle_successfully(client, common_user):
     ]
     links = json_data.get("links")
     assert links == [{"href": f"{client.base_url}/v1/posts/", "rel": "self"}]
+
+
+def test_handle_successfully_with_cursor_from_last(client, common_user):
+    # given
+    with Session(engine) as session:
+        for i in range(3):
+            session.add(
+                post.Post(
+                    id=i + 1,
+                    title=f"테스트 제목 {i}",
+                    user_id=common_user.id,
+                    user=common_user,
+                    content="테스트 내용",
+                )
+            )
+        session.commit()
+        session.refresh(common_user)
+
+    # when
+    last_response = client.get("/v1/posts/", params={"before": "", "limit": 2})
+    prev_response = client.get(last_response.json()["links"][1]["href"])
+
+    # then
+    assert last_response.status_code == status.HTTP_200_OK
+    last_json_data = last_response.json()
+    assert [data["id"] for data in last_json_data["data"]] == [2, 3]
+    assert last_json_data["pagination"]["nextCursor"] is None
+    assert [link["rel"] for link in last_json_data["links"]] == ["self", "prev"]
+
+    assert prev_response.status_code == status.HTTP_200_OK
+    prev_json_data = prev_response.json()
+    assert [data["id"] for data in prev_json_data["data"]] == [1]
+    assert prev_json_data["pagination"]["prevCursor"] is None
+    assert [link["rel"] for link in prev_json_data["links"]] == ["self", "next"]
+
+
+def test_handle_unsuccessfully_with_invalid_cursor(client):
+    # when
+    invalid_cursor_response = client.get("/v1/posts/", params={"after": "invalid"})
+    both_cursors_response = client.get("/v1/posts/", params={"after": "", "before": ""})
+
+    # then
+    assert invalid_cursor_response.status_code == status.HTTP_400_BAD_REQUEST
+    assert both_cursors_response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_handle_successfully_without_loading_comments_and_feedbacks(
+    client, common_user, common_another_user
+):
+    # given
+    with Session(engine) as session:
+        post_ = post.Post(
+            title="테스트 제목",
+            user_id=common_user.id,
+            user=common_user,
+            content="테스트 내용",
+        )
+        for user_, like in ((common_user, True), (common_another_user, False)):
+            session.add(post_feedback.PostFeedback(user=user_, post=post_, like=like))
+            session.add(comment.Comment(user=user_, post=post_, content="테스트 내용"))
+        session.commit()
+
+    # when
+    response = client.get("/v1/posts/")
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"][0]["numOf"] == {
+        "likes": 1,
+        "dislikes": 1,
+        "comments": 2,
+    }
+    # only the post and its user are loaded, not its comments and feedbacks
+    assert response.headers["X-Query-Rows"] == "2"
+
+
+def test_handle_successfully_with_fields(client, common_user):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+
+    # when
+    response = client.get("/v1/posts/", params={"fields": "id,title,numOf"})
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"] == [
+        {
+            "id": 1,
+            "title": "테스트 제목",
+            "numOf": {"likes": 0, "dislikes": 0, "comments": 0},
+        }
+    ]
+    # the total and the posts without their content, but not their users
+    assert response.headers["X-Query-Count"] == "3"
+
+
+def test_handle_successfully_with_fields_and_pagination_links(client, common_user):
+    # given
+    with Session(engine) as session:
+        for post_id in (1, 2, 3):
+            session.add(
+                post.Post(
+                    id=post_id,
+                    title="테스트 제목",
+                    user_id=common_user.id,
+                    content="테스트 내용",
+                )
+            )
+        session.commit()
+
+    # when
+    response = client.get(
+        "/v1/posts/", params={"fields": "title", "offset": 1, "limit": 1}
+    )
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["links"] == [
+        {
+            "rel": "self",
+            "href": "http://testserver/v1/posts/?fields=title&limit=1&offset=1",
+        },
+        {
+            "rel": "next",
+            "href": "http://testserver/v1/posts/?fields=title&offset=2&limit=1",
+        },
+        {
+            "rel": "prev",
+            "href": "http://testserver/v1/posts/?fields=title&offset=0&limit=1",
+        },
+    ]
+
+
+def test_handle_unsuccessfully_with_invalid_fields(client):
+    # when
+    response = client.get("/v1/posts/", params={"fields": "id,password"})
+
+    # then
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid fields: password"}
+
+
+def test_handle_successfully_with_expand(client, common_user, common_another_user):
+    # given
+    with Session(engine) as session:
+        for post_id in (1, 2):
+            session.add(
+                post.Post(
+                    id=post_id,
+                    title=f"테스트 제목 {post_id}",
+                    user_id=common_user.id,
+                    content="테스트 내용",
+                )
+            )
+        for comment_id, post_id in ((1, 1), (2, 2), (3, 1)):
+            session.add(
+                comment.Comment(
+                    id=comment_id,
+                    post_id=post_id,
+                    user_id=common_another_user.id,
+                    content=f"테스트 내용 {comment_id}",
+                )
+            )
+        session.add(
+            post_feedback.PostFeedback(
+                id=1, post_id=1, user_id=common_another_user.id, like=True
+            )
+        )
+        session.commit()
+
+    # when
+    response = client.get(
+        "/v1/posts/",
+        params={"expand": "comments,feedbacks", "expand_limit": 1},
+    )
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    embedded_1, embedded_2 = [data["embedded"] for data in response.json()["data"]]
+    assert [data["id"] for data in embedded_1["comments"]["data"]] == [1]
+    assert embedded_1["comments"]["data"][0]["user"]["id"] == common_another_user.id
+    assert embedded_1["comments"]["pagination"]["nextCursor"] is not None
+    assert [data["id"] for data in embedded_1["feedbacks"]["data"]] == [1]
+    assert embedded_1["feedbacks"]["pagination"]["nextCursor"] is None
+    assert [data["id"] for data in embedded_2["comments"]["data"]] == [2]
+    assert embedded_2["feedbacks"]["data"] == []
+    # the total, the posts, their users, their comments and their feedbacks
+    assert response.headers["X-Query-Count"] == "6"
+
+    next_link = embedded_1["comments"]["links"][1]
+    assert next_link["rel"] == "next"
+    next_response = client.get(next_link["href"])
+    assert [data["id"] for data in next_response.json()["data"]] == [3]
+
+
+def test_handle_unsuccessfully_with_invalid_expand(client):
+    # when
+    response = client.get("/v1/posts/", params={"expand": "comments,users"})
+
+    # then
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid expand: users"}
+
+
+def test_handle_unsuccessfully_with_too_large_expand_limit(client):
+    # when
+    response = client.get(
+        "/v1/posts/", params={"expand": "comments", "expand_limit": 101}
+    )
+
+    # then
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize("limit", [0, 101])
+def test_handle_unsuccessfully_with_out_of_range_limit(client, limit):
+    # when
+    response = client.get("/v1/posts/", params={"limit": limit})
+
+    # then
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_handle_successfully_with_if_none_match(
+    client, common_user, headers_with_authorized_common
+):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                user=common_user,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+    etag = client.get("/v1/posts/").headers["ETag"]
+
+    # when
+    not_modified_response = client.get("/v1/posts/", headers={"If-None-Match": etag})
+    other_page_response = client.get(
+        "/v1/posts/", params={"limit": 1}, headers={"If-None-Match": etag}
+    )
+    client.post(
+        "/v1/comments/",
+        json={"post_id": 1, "content": "테스트 내용"},
+        headers=headers_with_authorized_common,
+    )
+    modified_response = client.get("/v1/posts/", headers={"If-None-Match": etag})
+
+    # then
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    # only the versions of the collections are loaded
+    assert not_modified_response.headers["X-Query-Count"] == "1"
+    assert other_page_response.status_code == status.HTTP_200_OK
+    assert modified_response.status_code == status.HTTP_200_OK
+    assert modified_response.json()["data"][0]["numOf"]["comments"] == 1
+
+
+def test_handle_successfully_with_if_none_match_after_renaming_user(
+    client, common_user
+):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                user=common_user,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+    etag = client.get("/v1/posts/").headers["ETag"]
+
+    # when
+    with Session(engine) as session:
+        session.get(user.User, "heumsi").name = "수정된 이름"
+        session.commit()
+    response = client.get("/v1/posts/", headers={"If-None-Match": etag})
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["data"][0]["user"]["name"] == "수정된 이름"
+
+
+def test_handle_successfully_from_cache(
+    client, common_user, headers_with_authorized_common
+):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post.Post(
+                id=1,
+                title="테스트 제목",
+                user_id=common_user.id,
+                user=common_user,
+                content="테스트 내용",
+            )
+        )
+        session.commit()
+    response = client.get("/v1/posts/", params={"offset": 0, "limit": 10})
+
+    # when
+    cached_response = client.get("/v1/posts/?limit=10&offset=0")
+    other_host_response = client.get("http://example.com/v1/posts/?limit=10&offset=0")
+    client.post(
+        "/v1/posts/",
+        json={"title": "테스트 제목", "content": "테스트 내용"},
+        headers=headers_with_authorized_common,
+    )
+    written_response = client.get("/v1/posts/?limit=10&offset=0")
+
+    # then
+    # only the versions of the collections are loaded
+    assert cached_response.headers["X-Query-Count"] == "1"
+    assert cached_response.content == response.content
+    # the links of both are rendered from the query params in order
+    assert cached_response.json()["links"] == [
+        {"rel": "self", "href": "http://testserver/v1/posts/?limit=10&offset=0"}
+    ]
+    assert other_host_response.headers["X-Query-Count"] != "1"
+    assert other_host_response.json()["links"][0]["href"].startswith(
+        "http://example.com/"
+    )
+    assert written_response.json()["pagination"]["total"] == 2
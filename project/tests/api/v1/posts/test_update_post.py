@@ -38,6 +38,7 @@ def test_handle_successfully(client, headers_with_authorized_common):
             user_id=posts[0].user_id,
             created_at=posts[0].created_at,
             updated_at=posts[0].updated_at,
+            version=2,
         )
         assert posts[0].updated_at > posts[0].created_at
 
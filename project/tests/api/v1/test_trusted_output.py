@@ -0,0 +1,83 @@
+import pytest
+from fastapi import status
+from sqlmodel import Session
+
+from src import config
+from src.database import engine
+from src.models import comment, post
+from src.models.feedbacks import comment_feedback, post_feedback
+
+
+@pytest.fixture()
+def common_rows(common_user, common_another_user):
+    with Session(engine) as session:
+        for post_id in (1, 2):
+            session.add(
+                post.Post(
+                    id=post_id,
+                    title=f"테스트 제목 {post_id}",
+                    user_id=common_user.id,
+                    content="테스트 내용",
+                )
+            )
+            session.add(
+                comment.Comment(
+                    id=post_id,
+                    post_id=post_id,
+                    user_id=common_another_user.id,
+                    content="테스트 내용",
+                )
+            )
+            session.add(
+                post_feedback.PostFeedback(
+                    post_id=post_id, user_id=common_another_user.id, like=True
+                )
+            )
+            session.add(
+                comment_feedback.CommentFeedback(
+                    comment_id=post_id, user_id=common_user.id, like=False
+                )
+            )
+        session.commit()
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/v1/posts",
+        "/v1/posts?offset=1&limit=1",
+        "/v1/posts?after=&limit=1",
+        "/v1/posts/1",
+        "/v1/posts/1?expand=comments,feedbacks",
+        "/v1/posts?expand=comments&expand_limit=1",
+        "/v1/comments",
+        "/v1/comments?post_id=1",
+        "/v1/comments?before=&limit=1",
+        "/v1/comments/2",
+        "/v1/feedbacks/posts?post_id=2",
+        "/v1/feedbacks/posts?after=&limit=1",
+        "/v1/feedbacks/comments",
+        "/v1/feedbacks/comments?comment_id=1&limit=1",
+        "/v1/users",
+    ],
+)
+def test_handle_successfully_with_same_output_as_validated(
+    client, common_rows, headers_with_authorized_admin, monkeypatch, url
+):
+    # given
+    # both are rendered, not served from the cache of the first one
+    monkeypatch.setattr(config.response_cache, "enabled", False)
+    monkeypatch.setattr(config.api, "trusted_output", False)
+    validated_response = client.get(url, headers=headers_with_authorized_admin)
+    monkeypatch.setattr(config.api, "trusted_output", True)
+
+    # when
+    response = client.get(url, headers=headers_with_authorized_admin)
+
+    # then
+    assert response.status_code == validated_response.status_code
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        response.headers["content-type"] == validated_response.headers["content-type"]
+    )
+    assert response.content == validated_response.content
@@ -1,3 +1,4 @@
+import pytest
 from fastapi import status
 
 
@@ -39,3 +40,16 @@ def test_handle_unsuccessfully_with_no_authorization(
 
     # then
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.parametrize("limit", [0, 101])
+def test_handle_unsuccessfully_with_out_of_range_limit(
+    client, headers_with_authorized_admin, limit
+):
+    # when
+    response = client.get(
+        "/v1/users/", params={"limit": limit}, headers=headers_with_authorized_admin
+    )
+
+    # then
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,49 @@
+import pytest
+from sqlmodel import Session, create_engine
+
+from src import collection_versions, migrations
+from src.models import comment, post, user
+from src.models.feedbacks import comment_feedback
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    migrations.upgrade(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_bump_versions_on_flush(engine):
+    # given
+    keys = [
+        collection_versions.POST,
+        collection_versions.COMMENT,
+        collection_versions.COMMENT_FEEDBACK,
+        collection_versions.USER,
+        collection_versions.of_parent(collection_versions.COMMENT, 1),
+        collection_versions.of_parent(collection_versions.COMMENT_FEEDBACK, 1),
+    ]
+    with Session(engine) as session:
+        user_ = user.User(id="heumsi", name="heumsi", password="1234")
+        post_ = post.Post(id=1, title="테스트 제목", content="테스트 내용", user=user_)
+        session.add(comment.Comment(id=1, content="테스트 내용", user=user_, post=post_))
+        session.commit()
+
+    # when
+    with Session(engine) as session:
+        session.add(
+            comment_feedback.CommentFeedback(comment_id=1, user_id="heumsi", like=True)
+        )
+        session.commit()
+
+    # then
+    with Session(engine) as session:
+        # a feedback of a comment changes its counts in the comments
+        assert collection_versions.get_versions(session, keys) == (1, 2, 1, 1, 1, 1)
+
+
+def test_get_versions_of_collections_never_written(engine):
+    with Session(engine) as session:
+        assert collection_versions.get_versions(session, ["post", "comment"]) == (0, 0)
+        assert collection_versions.get_versions(session, []) == ()
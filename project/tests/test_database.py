@@ -0,0 +1,411 @@
+import asyncio
+import contextvars
+import shutil
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import pool
+from sqlmodel import Session, SQLModel, create_engine
+
+from src import config, database, migrations, statements
+from src.api import app
+from src.api.middlewares import PIN_TO_PRIMARY_COOKIE
+from src.api.response_cache import (
+    comment_cache,
+    list_cache,
+    post_cache,
+    response_caches,
+)
+from src.api.v1.auth.utils import get_hashed_password, user_cache
+from src.models import post, user
+
+
+def test_get_async_url():
+    assert (
+        str(database.get_async_url("sqlite:///./database.db"))
+        == "sqlite+aiosqlite:///./database.db"
+    )
+    assert (
+        str(database.get_async_url("postgresql://user:pw@localhost/db"))
+        == "postgresql+asyncpg://user:pw@localhost/db"
+    )
+
+
+@pytest.fixture()
+def async_mode(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'database.db'}"
+    sync_engine = create_engine(url)
+    SQLModel.metadata.create_all(sync_engine)
+    monkeypatch.setattr(
+        database,
+        "async_session_router",
+        database.SessionRouter(
+            database.create_async_engine_from_config(config.db, url), []
+        ),
+    )
+    yield sync_engine
+    sync_engine.dispose()
+
+
+def test_handlers_on_async_mode(async_mode):
+    # given
+    with Session(async_mode) as session:
+        user_ = user.User(id="heumsi", name="heumsi", password="1234")
+        session.add(post.Post(id=1, title="테스트 제목", content="테스트 내용", user=user_))
+        session.commit()
+
+    # when
+    with TestClient(app) as client:
+        read_post_response = client.get("/v1/posts/1")
+        read_posts_response = client.get("/v1/posts/")
+
+    # then
+    assert read_post_response.status_code == status.HTTP_200_OK
+    assert read_post_response.headers["X-Query-Count"] == "1"
+    assert read_post_response.json()["data"]["user"] == {
+        "id": "heumsi",
+        "name": "heumsi",
+    }
+    assert read_posts_response.status_code == status.HTTP_200_OK
+    assert read_posts_response.json()["pagination"]["total"] == 1
+
+
+class LoopRecordingBackend:
+    """cache backend which records its calls and whether they ran on an event loop"""
+
+    def __init__(self, backend):
+        self._backend = backend
+        self.calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._backend, name)
+        if name not in ("get", "set", "delete", "clear"):
+            return attr
+
+        def record(namespace, *args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop = True
+            except RuntimeError:
+                on_loop = False
+            self.calls.append((name, namespace, on_loop))
+            return attr(namespace, *args, **kwargs)
+
+        return record
+
+
+@pytest.fixture()
+def recording_backend(async_mode, monkeypatch):
+    with Session(async_mode) as session:
+        user_ = user.User(
+            id="heumsi", name="heumsi", password=get_hashed_password("1234")
+        )
+        session.add(post.Post(id=1, title="테스트 제목", content="테스트 내용", user=user_))
+        session.commit()
+    user_cache.clear()
+    for cache in response_caches.values():
+        cache.reset()
+    backend = LoopRecordingBackend(post_cache.backend)
+    for cache in [post_cache, comment_cache, list_cache, user_cache]:
+        monkeypatch.setattr(cache, "backend", backend)
+    yield backend
+    user_cache.clear()
+    for cache in response_caches.values():
+        cache.reset()
+
+
+def _sign_in(client):
+    response = client.post(
+        "/v1/auth/signin",
+        headers={"content-type": "application/x-www-form-urlencoded"},
+        data={"username": "heumsi", "password": "1234"},
+    )
+    json_data = response.json()
+    return {"Authorization": f"{json_data['token_type']} {json_data['access_token']}"}
+
+
+def test_list_cache_off_event_loop_on_async_mode(recording_backend):
+    # when
+    with TestClient(app) as client:
+        first_response = client.get("/v1/posts/")
+        second_response = client.get("/v1/posts/")
+
+    # then
+    assert first_response.status_code == status.HTTP_200_OK
+    assert second_response.content == first_response.content
+    assert list_cache.hits == 1
+    assert ("set", "response:list", False) in recording_backend.calls
+    assert ("get", "response:list", False) in recording_backend.calls
+    assert not any(on_loop for *_, on_loop in recording_backend.calls)
+
+
+def test_user_cache_off_event_loop_on_async_mode(recording_backend):
+    # when
+    with TestClient(app) as client:
+        headers = _sign_in(client)
+        first_response = client.get("/v1/users/me", headers=headers)
+        second_response = client.get("/v1/users/me", headers=headers)
+
+    # then
+    assert first_response.status_code == status.HTTP_200_OK
+    assert second_response.json() == first_response.json()
+    assert ("set", "user", False) in recording_backend.calls
+    assert ("get", "user", False) in recording_backend.calls
+    assert not any(on_loop for *_, on_loop in recording_backend.calls)
+
+
+def test_invalidations_off_event_loop_on_async_mode(recording_backend):
+    # when
+    with TestClient(app) as client:
+        headers = _sign_in(client)
+        client.get("/v1/posts/1")
+        patch_response = client.patch(
+            "/v1/posts/1", json={"title": "수정된 제목"}, headers=headers
+        )
+        read_response = client.get("/v1/posts/1")
+
+    # then
+    assert patch_response.status_code == status.HTTP_204_NO_CONTENT
+    assert read_response.json()["data"]["title"] == "수정된 제목"
+    assert post_cache.invalidations == 1
+    assert ("delete", "response:post", False) in recording_backend.calls
+    assert not any(on_loop for *_, on_loop in recording_backend.calls)
+
+
+def test_create_engine_from_config_with_dialect_defaults(tmp_path):
+    db_config = config.DB(url="sqlite:///:memory:", echo=False)
+    assert isinstance(
+        database.create_engine_from_config(db_config).pool, pool.StaticPool
+    )
+    file_engine = database.create_engine_from_config(
+        db_config, f"sqlite:///{tmp_path / 'database.db'}"
+    )
+    assert isinstance(file_engine.pool, pool.QueuePool)
+    assert file_engine.pool.size() == db_config.pool_size
+    file_async_engine = database.create_async_engine_from_config(
+        db_config, f"sqlite:///{tmp_path / 'database.db'}"
+    )
+    assert isinstance(file_async_engine.sync_engine.pool, pool.AsyncAdaptedQueuePool)
+
+
+def test_create_engine_from_config_with_pool_options(tmp_path):
+    db_config = config.DB(
+        url=f"sqlite:///{tmp_path / 'database.db'}",
+        echo=False,
+        pool_class="QueuePool",
+        pool_size=3,
+        max_overflow=1,
+        pool_timeout=5,
+        pool_recycle=60,
+        pool_pre_ping=True,
+    )
+    engine = database.create_engine_from_config(db_config)
+    assert isinstance(engine.pool, pool.QueuePool)
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 1
+    assert engine.pool._timeout == 5
+    assert engine.pool._recycle == 60
+    assert engine.pool._pre_ping
+
+
+def test_pool_statistics(tmp_path):
+    engine = database.create_engine_from_config(
+        config.DB(url=f"sqlite:///{tmp_path / 'database.db'}", echo=False)
+    )
+    statistics = database.PoolStatistics(engine)
+
+    with engine.connect():
+        assert statistics.to_dict()["checked_out"] == 1
+    with engine.connect():
+        pass
+
+    assert statistics.to_dict() == {
+        "pool_class": "QueuePool",
+        "status": engine.pool.status(),
+        "connects": 1,
+        "checkouts": 2,
+        "checked_out": 0,
+        "peak_checked_out": 1,
+    }
+
+
+def test_statement_cache_statistics(tmp_path):
+    engine = database.create_engine_from_config(
+        config.DB(url=f"sqlite:///{tmp_path / 'database.db'}", echo=False)
+    )
+    migrations.upgrade(engine)
+    statistics = database.StatementCacheStatistics(engine)
+
+    with Session(engine) as session:
+        for offset in range(3):
+            session.scalars(
+                statements.select_users.by_offset, {"offset": offset, "limit": 10}
+            )
+
+    assert statistics.to_dict()["hits"] == 2
+    assert statistics.to_dict()["misses"] == 1
+
+
+def test_session_router():
+    primary = create_engine("sqlite://")
+    replicas = [create_engine("sqlite://"), create_engine("sqlite://")]
+    router = database.SessionRouter(primary, replicas)
+
+    assert router.get_engine() is primary
+    assert router.get_engine(read_only=True) is replicas[0]
+    assert router.get_engine(read_only=True) is replicas[1]
+    assert router.get_engine(read_only=True) is replicas[0]
+
+    def read_after_write():
+        database.set_routing_state(database.RoutingState())
+        database.mark_written()
+        return router.get_engine(read_only=True)
+
+    assert contextvars.copy_context().run(read_after_write) is primary
+
+
+@pytest.fixture()
+def replicated(tmp_path, monkeypatch):
+    primary_url = f"sqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    primary = database.create_engine_from_config(config.db, primary_url)
+    SQLModel.metadata.create_all(primary)
+    with Session(primary) as session:
+        user_ = user.User(
+            id="heumsi", name="heumsi", password=get_hashed_password("1234")
+        )
+        session.add(post.Post(id=1, title="테스트 제목", content="테스트 내용", user=user_))
+        session.commit()
+    primary.dispose()  # checkpoint the WAL before copying
+    shutil.copy(tmp_path / "primary.db", tmp_path / "replica.db")
+    replica = database.create_engine_from_config(config.db, replica_url)
+    monkeypatch.setattr(
+        database, "session_router", database.SessionRouter(primary, [replica])
+    )
+    yield primary
+    primary.dispose()
+    replica.dispose()
+    for cache in response_caches.values():
+        cache.reset()
+
+
+def test_reads_from_replica_and_own_writes_from_primary(replicated):
+    # given replica lagging behind the primary
+    with Session(replicated) as session:
+        post_ = session.get(post.Post, 1)
+        post_.title = "복제되지 않은 제목"
+        session.add(post_)
+        session.commit()
+
+    with TestClient(app) as client:
+        # when
+        response = client.get("/v1/posts/1")
+
+        # then
+        assert response.json()["data"]["title"] == "테스트 제목"
+
+        # when
+        response = client.post(
+            "/v1/auth/signin",
+            headers={"content-type": "application/x-www-form-urlencoded"},
+            data={"username": "heumsi", "password": "1234"},
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = client.patch(
+            "/v1/posts/1", json={"content": "수정된 내용"}, headers=headers
+        )
+
+        # then
+        assert response.cookies.get(PIN_TO_PRIMARY_COOKIE)
+        response = client.get("/v1/posts/1")
+        assert response.json()["data"]["title"] == "복제되지 않은 제목"
+        assert response.json()["data"]["content"] == "수정된 내용"
+
+
+def test_reads_own_writes_without_responses_cached_from_replica(replicated):
+    with TestClient(app) as client:
+        # given
+        response = client.post(
+            "/v1/auth/signin",
+            headers={"content-type": "application/x-www-form-urlencoded"},
+            data={"username": "heumsi", "password": "1234"},
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        client.patch("/v1/posts/1", json={"content": "수정된 내용"}, headers=headers)
+
+        # when another client reads the post from the lagging replica
+        another_client = TestClient(app)
+        another_response = another_client.get("/v1/posts/1")
+        another_response_again = another_client.get("/v1/posts/1")
+        response = client.get("/v1/posts/1")
+
+        # then
+        assert another_response.json()["data"]["content"] == "테스트 내용"
+        # the post read from the replica is not cached right after its write
+        assert another_response_again.headers["X-Query-Count"] != "0"
+        assert response.json()["data"]["content"] == "수정된 내용"
+
+
+def test_reads_from_replica_cached(replicated, monkeypatch):
+    # given replica caught up with the writes before
+    monkeypatch.setattr(post_cache, "replica_lag_seconds", 0)
+
+    with TestClient(app) as client:
+        # when
+        response = client.get("/v1/posts/1")
+        cached_response = client.get("/v1/posts/1")
+
+        # then
+        assert cached_response.headers["X-Query-Count"] == "0"
+        assert cached_response.content == response.content
+
+
+def _get_pragmas(connection):
+    return {
+        name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        for name in [
+            "journal_mode",
+            "synchronous",
+            "cache_size",
+            "mmap_size",
+            "temp_store",
+            "busy_timeout",
+        ]
+    }
+
+
+def test_sqlite_performance_profile(tmp_path):
+    url = f"sqlite:///{tmp_path / 'database.db'}"
+    engine = database.create_engine_from_config(config.DB(url=url, echo=False))
+
+    with engine.connect() as connection:
+        assert _get_pragmas(connection) == {
+            "journal_mode": "wal",
+            "synchronous": 1,
+            "cache_size": -64000,
+            "mmap_size": 268435456,
+            "temp_store": 2,
+            "busy_timeout": 5000,
+        }
+
+
+def test_sqlite_performance_profile_on_async_engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'database.db'}"
+    engine = database.create_async_engine_from_config(config.DB(url=url, echo=False))
+
+    async def get_pragmas():
+        async with engine.connect() as connection:
+            return await connection.run_sync(_get_pragmas)
+
+    assert asyncio.run(get_pragmas())["journal_mode"] == "wal"
+
+
+def test_sqlite_performance_profile_turned_off(tmp_path):
+    url = f"sqlite:///{tmp_path / 'database.db'}"
+    engine = database.create_engine_from_config(
+        config.DB(url=url, echo=False, sqlite_performance_profile=False)
+    )
+
+    with engine.connect() as connection:
+        assert _get_pragmas(connection)["journal_mode"] == "delete"
@@ -0,0 +1,76 @@
+import pytest
+from sqlmodel import Session, create_engine
+
+from src import engagement_counts, migrations
+from src.models import comment, post, user
+from src.models.feedbacks import comment_feedback, post_feedback
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    migrations.upgrade(engine)
+    with Session(engine) as session:
+        user_ = user.User(id="heumsi", name="heumsi", password="1234")
+        post_ = post.Post(id=1, title="테스트 제목", content="테스트 내용", user=user_)
+        session.add(comment.Comment(id=1, content="테스트 내용", user=user_, post=post_))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def test_counts_on_flush(engine):
+    # given
+    with Session(engine) as session:
+        session.add(
+            post_feedback.PostFeedback(id=1, post_id=1, user_id="heumsi", like=True)
+        )
+        session.add(
+            post_feedback.PostFeedback(id=2, post_id=1, user_id="heumsi", like=True)
+        )
+        session.add(
+            comment_feedback.CommentFeedback(comment_id=1, user_id="heumsi", like=False)
+        )
+        session.commit()
+
+    # when
+    with Session(engine) as session:
+        post_to_read = session.get(post.Post, 1)
+        session.get(post_feedback.PostFeedback, 1).like = False
+        session.delete(session.get(post_feedback.PostFeedback, 2))
+        session.flush()
+
+        # then
+        assert post_to_read.like_count == 0
+        assert post_to_read.dislike_count == 1
+        assert post_to_read.comment_count == 1
+        session.commit()
+    with Session(engine) as session:
+        post_to_read = session.get(post.Post, 1)
+        comment_to_read = session.get(comment.Comment, 1)
+        assert (post_to_read.like_count, post_to_read.dislike_count) == (0, 1)
+        assert post_to_read.comment_count == 1
+        assert (comment_to_read.like_count, comment_to_read.dislike_count) == (0, 1)
+    assert engagement_counts.check(engine) == {}
+
+
+def test_check(engine):
+    # given
+    with engine.begin() as connection:
+        connection.exec_driver_sql("UPDATE post SET comment_count = 3, like_count = 1")
+        connection.exec_driver_sql(
+            "INSERT INTO post (id, title, user_id, content, like_count, "
+            "dislike_count, comment_count) "
+            "VALUES (2, '테스트 제목', 'heumsi', '테스트 내용', 0, 0, 0)"
+        )
+
+    # when
+    drift = engagement_counts.check(engine, batch_size=1)
+
+    # then
+    assert drift == {
+        ("post", 1, "like_count"): (1, 0),
+        ("post", 1, "comment_count"): (3, 1),
+    }
+    assert engagement_counts.check(engine, fix=True, batch_size=1) == drift
+    assert engagement_counts.check(engine) == {}
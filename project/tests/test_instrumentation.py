@@ -0,0 +1,99 @@
+import contextvars
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI, status
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine, select
+
+from src import config, instrumentation, migrations
+from src.api import middlewares
+from src.models import user
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    migrations.upgrade(engine)
+    with Session(engine) as session:
+        session.add(user.User(id="heumsi", name="heumsi", password="1234"))
+        session.add(user.User(id="hardy", name="hardy", password="1234"))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def app(engine) -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(middlewares.instrument_queries)
+
+    @app.get("/users", dependencies=[Depends(instrumentation.QueryBudget(1))])
+    def read_users_one_by_one():
+        with Session(engine) as session:
+            for user_id in ("heumsi", "hardy"):
+                session.get(user.User, user_id)
+        return {}
+
+    @app.get("/users/heumsi", dependencies=[Depends(instrumentation.QueryBudget(1))])
+    def read_user():
+        with Session(engine) as session:
+            session.get(user.User, "heumsi")
+        return {}
+
+    return app
+
+
+def test_query_statistics_with_n_plus_one(engine):
+    # given
+    statistics = instrumentation.QueryStatistics()
+
+    def read_users_one_by_one():
+        instrumentation.set_query_statistics(statistics)
+        with Session(engine) as session:
+            users = session.exec(select(user.User)).all()
+            session.expunge_all()
+            for user_ in users * 2:
+                session.get(user.User, user_.id)
+                session.expunge_all()
+
+    # when
+    contextvars.copy_context().run(read_users_one_by_one)
+
+    # then
+    assert statistics.count == 5
+    assert statistics.rows == 6
+    assert statistics.duration > 0
+    assert list(statistics.get_n_plus_one().values()) == [4]
+
+
+def test_instrument_queries(app):
+    # when
+    response = TestClient(app).get("/users/heumsi")
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Query-Count"] == "1"
+    assert response.headers["X-Query-Rows"] == "1"
+    assert response.headers["X-Query-N-Plus-One"] == "0"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_instrument_queries_over_budget_on_strict_mode(app):
+    # when, then
+    with pytest.raises(instrumentation.QueryBudgetExceeded):
+        TestClient(app).get("/users")
+
+
+def test_instrument_queries_over_budget(app, monkeypatch, caplog):
+    # given
+    monkeypatch.setattr(config.instrumentation, "strict_query_budget", False)
+
+    # when
+    with caplog.at_level(logging.WARNING):
+        response = TestClient(app).get("/users")
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Query-Count"] == "2"
+    assert "over its budget of 1" in caplog.text
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import SQLModel, create_engine
+
+from src import migrations
+from src.api import app  # noqa: F401 for registering all models to the metadata
+from src.migrations.versions import v0001_create_tables
+
+
+def _get_indexes(engine):
+    inspector = inspect(engine)
+    return {
+        table_name: sorted(
+            (index["name"], tuple(index["column_names"]))
+            for index in inspector.get_indexes(table_name)
+        )
+        for table_name in inspector.get_table_names()
+        if table_name != "schema_version"
+    }
+
+
+def test_upgrade_on_empty_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+
+    applied_versions = migrations.upgrade(engine)
+
+    assert applied_versions == [1, 2, 3, 4, 5, 6]
+    with engine.connect() as connection:
+        assert migrations.get_schema_version(connection) == migrations.LATEST_VERSION
+    assert migrations.upgrade(engine) == []
+
+
+def test_upgrade_matches_models(tmp_path):
+    migrated_engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    created_engine = create_engine(f"sqlite:///{tmp_path / 'created.db'}")
+
+    migrations.upgrade(migrated_engine)
+    SQLModel.metadata.create_all(created_engine)
+
+    assert _get_indexes(migrated_engine) == _get_indexes(created_engine)
+
+
+def test_upgrade_on_database_created_before_migrations(tmp_path):
+    # given
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    with engine.begin() as connection:
+        v0001_create_tables.upgrade(connection)
+        connection.exec_driver_sql(
+            "INSERT INTO user (id, name, password) VALUES ('heumsi', 'heumsi', '1234')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO post (id, title, user_id, content) "
+            "VALUES (1, '테스트 제목', 'heumsi', '테스트 내용')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO feedback_post (post_id, user_id, like) VALUES (1, 'heumsi', 0)"
+        )
+
+    # when
+    applied_versions = migrations.upgrade(engine)
+
+    # then
+    assert applied_versions == [2, 3, 4, 5, 6]
+    assert ("ix_post_user_id", ("user_id",)) in _get_indexes(engine)["post"]
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT id FROM post").all() == [(1,)]
+        plan = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM post WHERE user_id = 'heumsi'"
+        ).all()
+        assert "ix_post_user_id" in str(plan)
+        row_counts = connection.exec_driver_sql(
+            "SELECT key, count FROM row_count ORDER BY key"
+        ).all()
+        assert row_counts == [
+            ("comment", 0),
+            ("feedback_comment", 0),
+            ("feedback_post", 1),
+            ("feedback_post:post_id:1", 1),
+            ("post", 1),
+            ("user", 1),
+        ]
+        engagement_counts = connection.exec_driver_sql(
+            "SELECT like_count, dislike_count, comment_count FROM post"
+        ).all()
+        assert engagement_counts == [(0, 1, 0)]
+
+
+def test_check_schema_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    with pytest.raises(migrations.SchemaVersionError):
+        migrations.check_schema_version(engine)
+
+    migrations.upgrade(engine)
+
+    migrations.check_schema_version(engine)
@@ -0,0 +1,61 @@
+import pytest
+from sqlmodel import Session, create_engine
+
+from src import migrations, row_counts
+from src.models import comment, post, user
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    migrations.upgrade(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_counts_on_flush(engine):
+    # given
+    with Session(engine) as session:
+        user_ = user.User(id="heumsi", name="heumsi", password="1234")
+        post_1 = post.Post(id=1, title="테스트 제목 1", content="테스트 내용", user=user_)
+        post_2 = post.Post(id=2, title="테스트 제목 2", content="테스트 내용", user=user_)
+        for post_ in (post_1, post_1, post_2):
+            session.add(comment.Comment(content="테스트 내용", user=user_, post=post_))
+        session.commit()
+
+    # when
+    with Session(engine) as session:
+        session.delete(session.get(comment.Comment, 3))
+        session.commit()
+
+    # then
+    with Session(engine) as session:
+        assert row_counts.get_count(session, row_counts.users) == 1
+        assert row_counts.get_count(session, row_counts.posts) == 2
+        assert row_counts.get_count(session, row_counts.comments) == 2
+        assert row_counts.get_count(session, row_counts.comments, 1) == 2
+        assert row_counts.get_count(session, row_counts.comments, 2) == 0
+        assert row_counts.get_count(session, row_counts.post_feedbacks) == 0
+    with engine.connect() as connection:
+        assert row_counts.get_drift(connection) == {}
+
+
+def test_rebuild(engine):
+    # given
+    with Session(engine) as session:
+        session.add(user.User(id="heumsi", name="heumsi", password="1234"))
+        session.commit()
+    with engine.begin() as connection:
+        connection.exec_driver_sql("UPDATE row_count SET count = 3 WHERE key = 'user'")
+        connection.exec_driver_sql(
+            "INSERT INTO row_count VALUES ('comment:post_id:1', 1)"
+        )
+
+    # when
+    with engine.begin() as connection:
+        drift = row_counts.rebuild(connection)
+
+    # then
+    assert drift == {"user": (3, 1), "comment:post_id:1": (1, 0)}
+    with engine.connect() as connection:
+        assert row_counts.get_drift(connection) == {}
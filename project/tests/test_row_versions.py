@@ -0,0 +1,44 @@
+import pytest
+from sqlmodel import Session, create_engine
+
+from src import migrations, row_versions  # noqa: F401 for its flush event
+from src.models import comment, post, user
+from src.models.feedbacks import post_feedback
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    migrations.upgrade(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_bump_versions_on_update(engine):
+    # given
+    with Session(engine) as session:
+        user_ = user.User(id="heumsi", name="heumsi", password="1234")
+        post_ = post.Post(id=1, title="테스트 제목", content="테스트 내용", user=user_)
+        session.add(comment.Comment(id=1, content="테스트 내용", user=user_, post=post_))
+        session.commit()
+
+    # when
+    with Session(engine) as session:
+        session.get(post.Post, 1).title = "수정된 테스트 제목"
+        session.get(comment.Comment, 1).content = "수정된 테스트 내용"
+        session.get(user.User, "heumsi").name = "수정된 이름"
+        session.commit()
+    with Session(engine) as session:
+        session.add(post_feedback.PostFeedback(post_id=1, user_id="heumsi", like=True))
+        session.add(
+            comment.Comment(id=2, content="테스트 내용", user_id="heumsi", post_id=1)
+        )
+        session.commit()
+
+    # then
+    with Session(engine) as session:
+        # writes to the children change only the counts of the post
+        assert session.get(post.Post, 1).version == 2
+        assert session.get(comment.Comment, 1).version == 2
+        assert session.get(comment.Comment, 2).version == 1
+        assert session.get(user.User, "heumsi").version == 2